@@ -156,6 +156,8 @@ def make_handler(event: str) -> Callable[[str, Tuple], None]:
 
 _HANDLERS: Dict[str, Callable[[str, Tuple], None]] = {}
 _ENABLED = True
+# The number of opened_auditwall() contexts we are currently inside:
+_OPENED_DEPTH = 0
 
 
 def audithook(event: str, args: Tuple) -> None:
@@ -170,13 +172,17 @@ def audithook(event: str, args: Tuple) -> None:
 
 @contextmanager
 def opened_auditwall() -> Generator:
-    global _ENABLED
-    assert _ENABLED
-    _ENABLED = False
+    global _ENABLED, _OPENED_DEPTH
+    if _OPENED_DEPTH == 0:
+        assert _ENABLED
+        _ENABLED = False
+    _OPENED_DEPTH += 1
     try:
         yield
     finally:
-        _ENABLED = True
+        _OPENED_DEPTH -= 1
+        if _OPENED_DEPTH == 0:
+            _ENABLED = True
 
 
 def engage_auditwall() -> None:
@@ -6,7 +6,8 @@ from subprocess import call
 
 import pytest
 
-from crosshair.auditwall import SideEffectDetected, engage_auditwall
+from crosshair import auditwall
+from crosshair.auditwall import SideEffectDetected, engage_auditwall, opened_auditwall
 
 # audit hooks cannot be uninstalled, and we don't want to wall off the
 # testing process. Spawn subprcoesses instead.
@@ -42,6 +43,14 @@ def test_popen_disallowed():
     assert call([pyexec, __file__, "popen", "withwall"]) == 10
 
 
+def test_opened_auditwall_is_reentrant():
+    with opened_auditwall():
+        with opened_auditwall():
+            assert not auditwall._ENABLED
+        assert not auditwall._ENABLED
+    assert auditwall._ENABLED
+
+
 def test_chdir_allowed():
     assert call([pyexec, __file__, "chdir", "withwall"]) == 0
 
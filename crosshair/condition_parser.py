@@ -1,4 +1,5 @@
 import ast
+import builtins
 import collections
 import contextlib
 import enum
@@ -42,6 +43,7 @@ except ModuleNotFoundError:
     deal = None  # type: ignore
 
 from crosshair.auditwall import opened_auditwall
+from crosshair.disk_cache import source_derived_cache
 from crosshair.fnutil import FunctionInfo, fn_globals, set_first_arg_type
 from crosshair.options import AnalysisKind
 from crosshair.register_contract import get_contract
@@ -158,10 +160,39 @@ class ImpliesTransformer(ast.NodeTransformer):
         return node
 
 
-def compile_expr(src: str) -> types.CodeType:
+def parse_expr(src: str) -> ast.Expression:
     parsed = ast.parse(src, "<string>", "eval")
-    parsed = ImpliesTransformer().visit(parsed)
-    return compile(parsed, "<string>", "eval")
+    return ImpliesTransformer().visit(parsed)
+
+
+def compile_expr(src: str) -> types.CodeType:
+    return compile(parse_expr(src), "<string>", "eval")
+
+
+def compile_expr_fn(
+    parsed: ast.Expression, params: Tuple[str, ...], namespace: Dict[str, object]
+) -> Callable:
+    """
+    Compile an expression into a function of the given parameter names.
+
+    Other names in the expression resolve against ``namespace``, which is bound as the
+    function's globals.
+    """
+    args = ast.arguments(
+        posonlyargs=[],
+        args=[ast.arg(arg=param) for param in params],
+        vararg=None,
+        kwonlyargs=[],
+        kw_defaults=[],
+        kwarg=None,
+        defaults=[],
+    )
+    lambda_expr = ast.fix_missing_locations(
+        ast.copy_location(
+            ast.Expression(ast.Lambda(args=args, body=parsed.body)), parsed
+        )
+    )
+    return eval(compile(lambda_expr, "<string>", "eval"), namespace)
 
 
 def default_counterexample(
@@ -429,6 +460,68 @@ def parse_sections(
     return parse
 
 
+# Parsed docstring sections and assert locations are cached on disk (when enabled;
+# see crosshair.disk_cache). Keys include the file path, because identical files may
+# live in several places, and the docstring, which need not match the source:
+_SECTIONS_CACHE = source_derived_cache("docsections")
+_FIRST_BODY_LINE_CACHE = source_derived_cache("assertlines")
+
+
+def _source_cache_key(thing: object, detail: str) -> Optional[Tuple[str, str]]:
+    doc = getattr(thing, "__doc__", None)
+    while hasattr(thing, "__func__"):
+        thing = thing.__func__  # type: ignore
+    while hasattr(thing, "__wrapped__"):
+        thing = thing.__wrapped__  # type: ignore
+    qualname = getattr(thing, "__qualname__", None)
+    if not isinstance(qualname, str):
+        return None
+    code = getattr(thing, "__code__", None)
+    if isinstance(code, types.CodeType):
+        filename = code.co_filename
+        return (
+            filename,
+            f"{filename}:{qualname}:{code.co_firstlineno}:{detail}:{doc!r}",
+        )
+    if isinstance(thing, type):
+        module_file = getattr(sys.modules.get(thing.__module__), "__file__", None)
+        if isinstance(module_file, str):
+            return (module_file, f"{module_file}:{qualname}:{detail}:{doc!r}")
+    return None
+
+
+def cached_section_parse(
+    thing: object, sections: Tuple[str, ...]
+) -> Tuple[str, int, SectionParse]:
+    """Get the source filename, first line number, and docstring sections of `thing`."""
+    key = _source_cache_key(thing, str(sections))
+    if key is not None:
+        cached = _SECTIONS_CACHE.get(*key)
+        if isinstance(cached, list) and len(cached) == 5:
+            filename, first_line_num, section_lines, messages, mutable_expr = cached
+            parse = SectionParse()
+            for section, lines in section_lines.items():
+                parse.sections[section] = [(num, line) for num, line in lines]
+            parse.syntax_messages = [ConditionSyntaxMessage(*m) for m in messages]
+            parse.mutable_expr = mutable_expr
+            return (filename, first_line_num, parse)
+    filename, first_line_num, _ = sourcelines(thing)
+    parse = parse_sections(list(get_doc_lines(thing)), sections, filename)
+    if key is not None and first_line_num > 0:
+        messages = [[m.filename, m.line_num, m.message] for m in parse.syntax_messages]
+        _SECTIONS_CACHE.put(
+            *key,
+            [
+                filename,
+                first_line_num,
+                parse.sections,
+                messages,
+                parse.mutable_expr,
+            ],
+        )
+    return (filename, first_line_num, parse)
+
+
 class ConditionParser:
     def get_fn_conditions(self, fn: FunctionInfo) -> Optional[Conditions]:
         """
@@ -599,12 +692,26 @@ def condition_from_source_text(
 ) -> ConditionExpr:
     evaluate, compile_err = None, None
     try:
-        compiled = compile_expr(expr_source)
+        parsed = parse_expr(expr_source)
+        compile(parsed, "<string>", "eval")  # (to report syntax errors early)
+        if "__builtins__" not in namespace:
+            namespace = {**namespace, "__builtins__": builtins}
+        names = sorted(
+            {node.id for node in ast.walk(parsed) if isinstance(node, ast.Name)}
+        )
+        # The bindings shadow the namespace, so we compile a function for each set
+        # of names that the bindings provide:
+        fns_by_params: Dict[Tuple[str, ...], Callable] = {}
 
         def evaluatefn(bindings: Mapping[str, object]) -> bool:
-            # TODO: eval() is oddly expensive when tracing is on.
-            # Consider eval()ing this as an entire function.
-            return eval(compiled, {**namespace, **bindings})
+            with NoTracing():
+                params = tuple(name for name in names if name in bindings)
+                fn = fns_by_params.get(params)
+                if fn is None:
+                    fn = compile_expr_fn(parsed, params, namespace)
+                    fns_by_params[params] = fn
+                args = [bindings[name] for name in params]
+            return fn(*args)
 
         evaluate = evaluatefn
     except Exception:
@@ -658,11 +765,9 @@ class Pep316Parser(ConcreteConditionParser):
         if fn_and_sig is None:
             return None
         (fn, sig) = fn_and_sig
-        filename, first_fn_lineno, _lines = sourcelines(fn)
         if isinstance(fn, types.BuiltinFunctionType):
             return Conditions(fn, fn, [], [], frozenset(), sig, frozenset(), [])
-        lines = list(get_doc_lines(fn))
-        parse = parse_sections(lines, ("pre", "post"), filename)
+        filename, first_fn_lineno, parse = cached_section_parse(fn, ("pre", "post"))
         pre: List[ConditionExpr] = []
         post_conditions: List[ConditionExpr] = []
         mutable_args: Optional[FrozenSet[str]] = None
@@ -718,7 +823,7 @@ class Pep316Parser(ConcreteConditionParser):
             return []
         namespace = sys.modules[cls.__module__].__dict__
 
-        parse = parse_sections(list(get_doc_lines(cls)), ("inv",), filename)
+        _, _, parse = cached_section_parse(cls, ("inv",))
         inv = []
         for line_num, line in parse.sections["inv"]:
             inv.append(
@@ -1029,6 +1134,18 @@ class AssertsParser(ConcreteConditionParser):
         :return:
             None if the function does not start with at least one assert statement.
         """
+        key = _source_cache_key(fn, "first_body_line")
+        if key is not None:
+            cached = _FIRST_BODY_LINE_CACHE.get(*key)
+            if isinstance(cached, list) and len(cached) == 1:
+                return cached[0]
+        first_body_line = AssertsParser._parse_first_body_line(fn)
+        if key is not None:
+            _FIRST_BODY_LINE_CACHE.put(*key, [first_body_line])
+        return first_body_line
+
+    @staticmethod
+    def _parse_first_body_line(fn: Callable) -> Optional[int]:
         _filename, first_fn_lineno, lines = sourcelines(fn)
         if not lines:
             return None
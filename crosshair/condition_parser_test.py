@@ -1,19 +1,24 @@
 import inspect
 import json
+import os
 import sys
 from typing import List
 
 import pytest
 
+from crosshair import condition_parser
 from crosshair.condition_parser import (
+    POSTCONDITION,
     AssertsParser,
     CompositeConditionParser,
     DealParser,
     IcontractParser,
     Pep316Parser,
+    condition_from_source_text,
     parse_sections,
     parse_sphinx_raises,
 )
+from crosshair.disk_cache import SourceDerivedCache
 from crosshair.fnutil import FunctionInfo
 from crosshair.tracers import COMPOSITE_TRACER, NoTracing
 from crosshair.util import AttributeHolder, debug
@@ -414,6 +419,16 @@ class TestAssertsParser:
             nums = [3, 1, 1, 2]
             conditions.fn(nums)
 
+    def tests_assert_locations_are_cached_on_disk(self, tmp_path, monkeypatch):
+        first_body_lines = []
+        for _ in range(2):
+            # (each time, as if in a new process)
+            cache = SourceDerivedCache("assertlines", str(tmp_path))
+            monkeypatch.setattr(condition_parser, "_FIRST_BODY_LINE_CACHE", cache)
+            first_body_lines.append(AssertsParser.get_first_body_line(avg_with_asserts))
+            monkeypatch.setattr(AssertsParser, "_parse_first_body_line", None)
+        assert first_body_lines[0] == first_body_lines[1] is not None
+
 
 def test_CompositeConditionParser():
     composite = CompositeConditionParser()
@@ -469,6 +484,101 @@ def test_lines_with_trailing_comment():
     assert conditions.post[0].expr_source == "True"
 
 
+def test_doc_sections_are_cached_on_disk(tmp_path, monkeypatch):
+    cache = SourceDerivedCache("docsections", str(tmp_path))
+    monkeypatch.setattr(condition_parser, "_SECTIONS_CACHE", cache)
+    fresh_conditions = Pep316Parser().get_fn_conditions(
+        FunctionInfo.from_fn(single_line_condition)
+    )
+    assert len(os.listdir(tmp_path)) == 1
+
+    # A new process would start with an empty in-memory cache:
+    cache = SourceDerivedCache("docsections", str(tmp_path))
+    monkeypatch.setattr(condition_parser, "_SECTIONS_CACHE", cache)
+    monkeypatch.setattr(condition_parser, "parse_sections", None)  # (unused)
+    conditions = Pep316Parser().get_fn_conditions(
+        FunctionInfo.from_fn(single_line_condition)
+    )
+    assert fresh_conditions is not None and conditions is not None
+    assert [(c.line, c.expr_source) for c in conditions.pre] == [
+        (c.line, c.expr_source) for c in fresh_conditions.pre
+    ]
+    assert [(c.line, c.expr_source) for c in conditions.post] == [
+        (c.line, c.expr_source) for c in fresh_conditions.post
+    ]
+
+
+def test_cached_doc_sections_keep_brackets_and_messages(tmp_path, monkeypatch):
+    def f(lst: List[int]) -> None:
+        """
+        pre[lst]: len(lst) > 0
+        post[lst]: len(lst) > 1
+        """
+        lst.append(1)
+
+    parsed = []
+    for _ in range(2):
+        # (each time, as if in a new process)
+        cache = SourceDerivedCache("docsections", str(tmp_path))
+        monkeypatch.setattr(condition_parser, "_SECTIONS_CACHE", cache)
+        conditions = Pep316Parser().get_fn_conditions(FunctionInfo.from_fn(f))
+        assert conditions is not None
+        parsed.append((conditions.mutable_args, conditions.fn_syntax_messages))
+        monkeypatch.setattr(condition_parser, "parse_sections", None)  # (unused now)
+    assert parsed[0] == parsed[1]
+    mutable_args, syntax_messages = parsed[1]
+    assert mutable_args == frozenset(["lst"])
+    assert [m.message for m in syntax_messages] == [
+        "brackets not allowed in pre section"
+    ]
+
+
+def test_cached_doc_sections_follow_the_docstring(tmp_path, monkeypatch):
+    def f(x: int) -> int:
+        """post: _ > 0"""
+        return x
+
+    cache = SourceDerivedCache("docsections", str(tmp_path))
+    monkeypatch.setattr(condition_parser, "_SECTIONS_CACHE", cache)
+    Pep316Parser().get_fn_conditions(FunctionInfo.from_fn(f))
+    parsed_docs = []
+    original_parse_sections = condition_parser.parse_sections
+
+    def spy_parse_sections(*a):
+        parsed_docs.append(f.__doc__)
+        return original_parse_sections(*a)
+
+    monkeypatch.setattr(condition_parser, "parse_sections", spy_parse_sections)
+    Pep316Parser().get_fn_conditions(FunctionInfo.from_fn(f))
+    assert parsed_docs == []
+    f.__doc__ = "post: _ > 1"
+    Pep316Parser().get_fn_conditions(FunctionInfo.from_fn(f))
+    assert parsed_docs == ["post: _ > 1"]
+
+
+def test_condition_bindings_shadow_globals():
+    namespace = {"__builtins__": __builtins__, "limit": 10, "x": "global x"}
+    condition = condition_from_source_text(
+        POSTCONDITION, "<test>", 1, "x < limit and all(x for x in [1])", namespace
+    )
+    assert condition.evaluate is not None
+    assert condition.evaluate({"x": 5, "unused": 0})
+    assert not condition.evaluate({"x": 15})
+    assert not condition.evaluate({"x": 5, "limit": 2})
+    with pytest.raises(TypeError):
+        condition.evaluate({})  # "global x" < 10
+    assert namespace == {"__builtins__": __builtins__, "limit": 10, "x": "global x"}
+
+
+def test_condition_without_builtins_in_namespace():
+    namespace = {"nums": [1, 2, 3]}
+    condition = condition_from_source_text(
+        POSTCONDITION, "<test>", 1, "len(nums) == _", namespace
+    )
+    assert condition.evaluate({"_": 3})
+    assert "__builtins__" not in namespace
+
+
 def test_format_counterexample_positional_only():
     if sys.version_info >= (3, 8):
 
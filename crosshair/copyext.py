@@ -127,7 +127,8 @@ def _deepconstruct(obj: object, mode: CopyMode, memo: Dict):
             # TODO: We loose subdeepcopy in this case - won't
             # that make e.g. deep_realize be too shallow?
             return creator(obj, memo)
-    if isinstance(obj, type):
+    # (check the real class; a lazy proxy would be created just to answer isinstance)
+    if issubclass(cls, type):
         return obj
     if mode != CopyMode.REALIZE and hasattr(obj, "__deepcopy__"):
         return obj.__deepcopy__(memo)  # type: ignore
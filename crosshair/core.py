@@ -12,6 +12,7 @@ import enum
 import functools
 import inspect
 import linecache
+import operator
 import os.path
 import sys
 import time
@@ -21,6 +22,7 @@ import typing
 from collections import ChainMap, defaultdict, deque
 from contextlib import ExitStack
 from dataclasses import dataclass, replace
+from importlib import import_module
 from inspect import BoundArguments, Signature, isabstract
 from time import monotonic
 from traceback import StackSummary, extract_stack, extract_tb, format_exc
@@ -71,6 +73,7 @@ from crosshair.fnutil import (
     get_top_level_classes_and_functions,
     resolve_signature,
 )
+from crosshair.objectproxy import ObjectProxy
 from crosshair.options import DEFAULT_OPTIONS, AnalysisOptions, AnalysisOptionSet
 from crosshair.register_contract import clear_contract_registrations, get_contract
 from crosshair.statespace import (
@@ -93,6 +96,7 @@ from crosshair.tracers import (
     PatchingModule,
     ResumedTracing,
     TracingModule,
+    Untracable,
     check_opcode_support,
     is_tracing,
 )
@@ -110,6 +114,7 @@ from crosshair.util import (
     NotDeterministic,
     ReferencedIdentifier,
     UnexploredPath,
+    assert_tracing,
     ch_stack,
     debug,
     eval_friendly_repr,
@@ -142,10 +147,30 @@ _OPCODE_PATCHES: List[TracingModule] = []
 
 _PATCH_REGISTRATIONS: Dict[Callable, Callable] = {}
 
+# Whether the _PATCH_REGISTRATIONS are currently applied (see Patched):
+_PATCHES_APPLIED = False
+
+# Modules whose registrations have stand-ins (see _register_lazy_module):
+_LAZY_MODULES: Set[str] = set()
+# Patched functions and types with stand-in registrations -> their module:
+_LAZY_PATCHES: Dict[Callable, str] = {}
+_LAZY_TYPES: Dict[type, str] = {}
+
+
+def _ensure_registrations() -> None:
+    if not _OPCODE_PATCHES:
+        # (this import is deferred to avoid a circular import)
+        from crosshair.core_and_libs import ensure_registrations
+
+        ensure_registrations()
+
 
 class Patched:
     def __enter__(self):
+        global _PATCHES_APPLIED
+        _ensure_registrations()
         COMPOSITE_TRACER.patching_module.add(_PATCH_REGISTRATIONS)
+        _PATCHES_APPLIED = True
         if len(_OPCODE_PATCHES) == 0:
             raise CrossHairInternal("Opcode patches haven't been loaded yet.")
         for module in _OPCODE_PATCHES:
@@ -154,9 +179,11 @@ class Patched:
         return self
 
     def __exit__(self, exc_type, exc_val, exc_tb):
+        global _PATCHES_APPLIED
         for module in reversed(self.pushed):
             COMPOSITE_TRACER.pop_config(module)
         COMPOSITE_TRACER.patching_module.pop(_PATCH_REGISTRATIONS)
+        _PATCHES_APPLIED = False
         return False
 
 
@@ -419,6 +446,19 @@ def choose_type(space: StateSpace, from_type: Type, varname: str) -> Optional[Ty
     pairs = iter_types(from_type, include_abstract=False)
     if not pairs:
         return None
+    if space.options.model_guided_fanout and len(pairs) > 1:
+        weights = []
+        remaining_weight = 1.0
+        for _typ, probability_true in pairs:
+            weights.append(remaining_weight * probability_true)
+            remaining_weight *= 1.0 - probability_true
+        choice = z3.Int(f"{varname}_type_choice{space.uniq()}")
+        space.add(z3.And(0 <= choice, choice < len(pairs)))
+        return space.smt_fanout(
+            [(choice == idx, typ) for idx, (typ, _) in enumerate(pairs)],
+            desc=f"{varname}_type",
+            weights=weights,
+        )
     for typ, probability_true in pairs:
         # true_probability=1.0 does not guarantee selection
         # (in particular, when the true path is exhausted)
@@ -520,9 +560,17 @@ def proxy_for_class(typ: Type, varname: str) -> object:
 
 
 def register_patch(entity: Callable, patch_value: Callable):
-    if entity in _PATCH_REGISTRATIONS:
+    is_lazy = _LAZY_PATCHES.pop(entity, None) is not None
+    previous = _PATCH_REGISTRATIONS.get(entity)
+    if previous is not None and not is_lazy:
         raise CrossHairInternal(f"Doubly registered patch: {entity}")
     _PATCH_REGISTRATIONS[entity] = patch_value
+    if _PATCHES_APPLIED:
+        # (a module with lazy registrations was loaded in the middle of analysis)
+        if previous is None:
+            COMPOSITE_TRACER.patching_module.add({entity: patch_value})
+        else:
+            COMPOSITE_TRACER.patching_module.replace(entity, previous, patch_value)
 
 
 def _reset_all_registrations():
@@ -532,9 +580,62 @@ def _reset_all_registrations():
     _PATCH_REGISTRATIONS.clear()
     global _OPCODE_PATCHES
     _OPCODE_PATCHES.clear()
+    _LAZY_MODULES.clear()
+    _LAZY_PATCHES.clear()
+    _LAZY_TYPES.clear()
     clear_contract_registrations()
 
 
+def _register_lazy_module(
+    module_name: str, patched: Iterable[Callable], types: Iterable[type]
+) -> None:
+    """
+    Make stand-in registrations for a module, without importing it.
+
+    The module is imported, and its `make_registrations()` is called, the first
+    time that one of the `patched` functions is called under analysis, or a
+    symbolic value is created for one of the `types`.
+    """
+    _LAZY_MODULES.add(module_name)
+    for entity in patched:
+        register_patch(entity, _lazy_patch(module_name, entity))
+        _LAZY_PATCHES[entity] = module_name
+    for typ in types:
+        register_type(typ, _lazy_creator(module_name, typ))
+        _LAZY_TYPES[typ] = module_name
+
+
+def _load_lazy_module(module_name: str) -> None:
+    if module_name not in _LAZY_MODULES:
+        return
+    _LAZY_MODULES.remove(module_name)
+    if is_tracing():
+        with NoTracing():
+            import_module(module_name).make_registrations()  # type: ignore
+    else:
+        import_module(module_name).make_registrations()  # type: ignore
+
+
+def _lazy_patch(module_name: str, entity: Callable) -> Callable:
+    def lazy_patch(*a, **kw):
+        _load_lazy_module(module_name)
+        if entity in _LAZY_PATCHES:
+            raise CrossHairInternal(f"{module_name} did not register {entity}")
+        return _PATCH_REGISTRATIONS[entity](*a, **kw)
+
+    return lazy_patch
+
+
+def _lazy_creator(module_name: str, typ: type) -> Callable:
+    def lazy_creator(*a):
+        _load_lazy_module(module_name)
+        if typ in _LAZY_TYPES:
+            raise CrossHairInternal(f"{module_name} did not register {typ}")
+        return _SIMPLE_PROXIES[typ](*a)
+
+    return lazy_creator
+
+
 def register_opcode_patch(module: TracingModule) -> None:
     if type(module) in map(type, _OPCODE_PATCHES):
         raise CrossHairInternal(
@@ -614,7 +715,8 @@ def register_type(typ: Type, creator: SymbolicCreationCallback) -> None:
     assert typ is origin_of(
         typ
     ), f'Only origin types may be registered, not "{typ}": try "{origin_of(typ)}" instead.'
-    if typ in _SIMPLE_PROXIES:
+    is_lazy = _LAZY_TYPES.pop(typ, None) is not None
+    if typ in _SIMPLE_PROXIES and not is_lazy:
         raise CrossHairInternal(f'Duplicate type "{typ}" registered')
     _SIMPLE_PROXIES[typ] = creator
 
@@ -627,6 +729,9 @@ class LazyCreationRepr:
 
     def deep_realize(self, symbolic_val: object) -> Any:
         assert not is_tracing()
+        space = context_statespace()
+        if space.is_detached:
+            space.check_skipped_assumptions()
         reprs = self.reprs
         arg_memo: dict = {}
         realized_val = deepcopyext(symbolic_val, CopyMode.REALIZE, arg_memo)
@@ -688,10 +793,7 @@ def proxy_for_type(
                 if space.smt_fork(desc="choose_enum_" + str(enum_value)):
                     return enum_value
             return enum_values[-1]
-        if not _SIMPLE_PROXIES:
-            from crosshair.core_and_libs import _make_registrations
-
-            _make_registrations()
+        _ensure_registrations()
         proxy_factory = _SIMPLE_PROXIES.get(origin)
         if proxy_factory:
             recursive_proxy_factory = SymbolicFactory(space, typ, varname)
@@ -705,10 +807,109 @@ def proxy_for_type(
         return proxy_for_class(typ, varname)
 
 
+class LazyArgument(ObjectProxy, CrossHairValue, Untracable):
+    """
+    A function argument whose symbolic value is created on first use.
+
+    Used for the arguments of the function under analysis with the
+    `lazy_arguments` option, so that arguments which a path never touches add no
+    variables or constraints to the solver.
+    """
+
+    def __init__(self, create: Callable[[], object]):
+        object.__setattr__(self, "_create", create)
+
+    @assert_tracing(False)
+    def _realize(self):
+        return object.__getattribute__(self, "_create")()
+
+    def __ch_realize__(self):
+        return realize(self._wrapped())
+
+    def __ch_pytype__(self):
+        return python_type(self._wrapped())
+
+    def __deepcopy__(self, memo):
+        if is_unused_argument(self):
+            # Defer the copy too; it is made from the original when first used.
+            result: object = LazyArgument(
+                lambda: deepcopyext(self._wrapped(), CopyMode.BEST_EFFORT, {})
+            )
+        else:
+            result = deepcopyext(self._wrapped(), CopyMode.BEST_EFFORT, memo)
+        memo[id(self)] = result
+        return result
+
+
+def _inplace_op_without_rebinding(op: Callable) -> Callable:
+    # ObjectProxy rebinds itself to the result of in-place operations on immutable
+    # values. An argument must keep its value for the postcondition instead.
+    def inplace_op(self, *args):
+        original = self._wrapped()
+        result = op(original, *args)
+        return self if result is original else result
+
+    return inplace_op
+
+
+for _opname in (
+    "iadd",
+    "isub",
+    "imul",
+    "itruediv",
+    "ifloordiv",
+    "imod",
+    "ipow",
+    "ilshift",
+    "irshift",
+    "iand",
+    "ixor",
+    "ior",
+):
+    setattr(
+        LazyArgument,
+        f"__{_opname}__",
+        _inplace_op_without_rebinding(getattr(operator, _opname)),
+    )
+
+
+def is_unused_argument(value: object) -> bool:
+    """Determine whether `value` is a `LazyArgument` that has not been created yet."""
+    if type(value) is not LazyArgument:
+        return False
+    try:
+        object.__getattribute__(value, "_inner")
+    except AttributeError:
+        return True
+    return False
+
+
 _ARG_GENERATION_RENAMES: Dict[str, Callable] = {}
 
 
-def gen_args(sig: inspect.Signature) -> inspect.BoundArguments:
+def _may_be_identity_compared(typ: object) -> bool:
+    """
+    Decide whether values of `typ` might be compared by identity.
+
+    A `LazyArgument` is never identical to None, True, an enum member, etc.,
+    so checks like `x is None` would always be false on it.
+    """
+    if typ in (Any, object, type, None, type(None)) or isinstance(typ, TypeVar):
+        return True
+    if typing_inspect.is_union_type(typ):
+        return any(map(_may_be_identity_compared, typing_inspect.get_args(typ)))
+    if typing_inspect.is_literal_type(typ) or typing_inspect.get_origin(typ) is type:
+        return True
+    return isinstance(typ, type) and issubclass(typ, (bool, enum.Enum))
+
+
+def gen_args(sig: inspect.Signature, lazy: bool = False) -> inspect.BoundArguments:
+    """
+    Create symbolic arguments for the given signature.
+
+    With `lazy`, each (non-variadic, non-self) argument is a `LazyArgument`,
+    unless its values might be compared by identity.
+    """
     if is_tracing():
         raise CrossHairInternal
     args = sig.bind_partial()
@@ -751,10 +952,13 @@ def gen_args(sig: inspect.Signature) -> inspect.BoundArguments:
             # Object parameters can be any valid subtype iff they are not the
             # class under test ("self").
             allow_subtypes = not is_self
-            if has_annotation:
-                value = proxy_maker(param.annotation, smt_name, allow_subtypes)
+            typ = param.annotation if has_annotation else cast(type, Any)
+            if lazy and not is_self and not _may_be_identity_compared(typ):
+                value = LazyArgument(
+                    functools.partial(proxy_maker, typ, smt_name, allow_subtypes)
+                )
             else:
-                value = proxy_maker(cast(type, Any), smt_name, allow_subtypes)
+                value = proxy_maker(typ, smt_name, allow_subtypes)
         if in_debug():
             debug(
                 "created proxy for",
@@ -802,45 +1006,64 @@ class ConditionCheckable(Checkable):
     conditions: Conditions
 
     def analyze(self) -> Iterable[AnalysisMessage]:
+        # Usually, we check a single postcondition. With the
+        # `combined_postconditions` option, we check several postconditions in one
+        # exploration, and re-explore without the postconditions that fail.
         options = self.options
-        conditions = self.conditions
-        debug('Analyzing postcondition: "', conditions.post[0].expr_source, '"')
-        debug(
-            "assuming preconditions: ",
-            ",".join([p.expr_source for p in conditions.pre]),
-        )
-        options.deadline = monotonic() + options.per_condition_timeout
-
-        with condition_parser(options.analysis_kind):
-            analysis = analyze_calltree(options, conditions)
-
-        (condition,) = conditions.post
-        if analysis.verification_status is VerificationStatus.UNKNOWN:
-            message = "Not confirmed."
-            analysis.messages = [
-                AnalysisMessage(
-                    MessageType.CANNOT_CONFIRM,
-                    message,
-                    condition.filename,
-                    condition.line,
-                    0,
-                    "",
+        remaining = list(self.conditions.post)
+        messages: List[AnalysisMessage] = []
+        while remaining:
+            conditions = replace(self.conditions, post=remaining)
+            debug(
+                "Analyzing postcondition(s): ",
+                ",".join([p.expr_source for p in remaining]),
+            )
+            debug(
+                "assuming preconditions: ",
+                ",".join([p.expr_source for p in conditions.pre]),
+            )
+            options.deadline = monotonic() + options.per_condition_timeout
+
+            with condition_parser(options.analysis_kind):
+                analysis = analyze_calltree(options, conditions)
+
+            status = analysis.verification_status
+            if status is VerificationStatus.REFUTED:
+                messages.extend(analysis.messages)
+                # (by position; several postconditions may have the same text)
+                failed_positions = {
+                    (m.filename, m.line)
+                    for m in analysis.messages
+                    if m.state in (MessageType.POST_FAIL, MessageType.POST_ERR)
+                }
+                still_remaining = [
+                    p for p in remaining if (p.filename, p.line) not in failed_positions
+                ]
+                if len(still_remaining) == len(remaining):
+                    # This failure isn't specific to a postcondition.
+                    break
+                remaining = still_remaining
+                continue
+            if status is VerificationStatus.UNKNOWN:
+                message_type, message = MessageType.CANNOT_CONFIRM, "Not confirmed."
+            else:
+                message_type, message = (
+                    MessageType.CONFIRMED,
+                    "Confirmed over all paths.",
                 )
-            ]
-        elif analysis.verification_status is VerificationStatus.CONFIRMED:
-            message = "Confirmed over all paths."
-            analysis.messages = [
+            messages.extend(
                 AnalysisMessage(
-                    MessageType.CONFIRMED,
+                    message_type,
                     message,
                     condition.filename,
                     condition.line,
                     0,
                     "",
                 )
-            ]
-
-        return analysis.messages
+                for condition in remaining
+            )
+            break
+        return messages
 
 
 class ClampedCheckable(Checkable):
@@ -955,6 +1178,7 @@ def analyze_function(
         debug("Skipping", ctxfn.name, " because CrossHair is not enabled")
         return []
 
+    _ensure_registrations()  # (plugins may register contracts)
     with condition_parser(full_options.analysis_kind) as parser:
         if not isinstance(ctxfn.context, type):
             conditions = parser.get_fn_conditions(ctxfn)
@@ -980,12 +1204,20 @@ def analyze_function(
             for syntax_message in syntax_messages
         ]
         return [SyntaxErrorCheckable(messages)]
+    post_conditions = [p for p in conditions.post if p.evaluate is not None]
+    if full_options.combined_postconditions:
+        if not post_conditions:
+            return []
+        return [
+            ConditionCheckable(
+                ctxfn, full_options, replace(conditions, post=post_conditions)
+            )
+        ]
     return [
         ConditionCheckable(
             ctxfn, full_options, replace(conditions, post=[post_condition])
         )
-        for post_condition in conditions.post
-        if post_condition.evaluate is not None
+        for post_condition in post_conditions
     ]
 
 
@@ -1188,7 +1420,7 @@ def analyze_calltree(
     debug("Begin analyze calltree ", fn.__name__)
 
     all_messages = MessageCollector()
-    search_root = RootNode()
+    search_root = RootNode(options)
     space_exhausted = False
     failing_precondition: Optional[ConditionExpr] = (
         conditions.pre[0] if conditions.pre else None
@@ -1288,7 +1520,9 @@ def analyze_calltree(
     if top_analysis.messages:
         all_messages.extend(
             replace(
-                m, test_fn=fn.__qualname__, condition_src=conditions.post[0].expr_source
+                m,
+                test_fn=fn.__qualname__,
+                condition_src=m.condition_src or conditions.post[0].expr_source,
             )
             for m in top_analysis.messages
         )
@@ -1455,7 +1689,7 @@ def attempt_call(
     space = context_statespace()
     msg_gen = MessageGenerator(conditions.src_fn)
     with enforced_conditions.enabled_enforcement():
-        original_args = gen_args(conditions.sig)
+        original_args = gen_args(conditions.sig, lazy=space.options.lazy_arguments)
         space.checkpoint()
         bound_args = deepcopyext(original_args, CopyMode.BEST_EFFORT, {})
 
@@ -1538,6 +1772,7 @@ def attempt_call(
         if (
             conditions.mutable_args is not None
             and argname not in conditions.mutable_args
+            and not is_unused_argument(argval)
         ):
             old_val, new_val = original_args.arguments[argname], argval
             with ResumedTracing():
@@ -1552,59 +1787,64 @@ def attempt_call(
                         [msg_gen.make(MessageType.POST_ERR, detail, None, 0, "")],
                     )
 
-    (post_condition,) = conditions.post
-    assert post_condition.evaluate is not None
-    with ExceptionFilter(expected_exceptions) as efilter:
-        # TODO: re-enable post-condition short circuiting. This will require refactoring how
-        # enforced conditions and short curcuiting interact, so that post-conditions are
-        # selectively run when, and only when, performing a short circuit.
-        # with enforced_conditions.enabled_enforcement(), short_circuit:
-        debug("Starting postcondition")
-        with ResumedTracing():
-            isok = bool(post_condition.evaluate(lcls))
-    if efilter.ignore:
-        debug("Ignored exception in postcondition.", efilter.analysis)
-        return efilter.analysis
-    elif efilter.user_exc is not None:
-        (e, tb) = efilter.user_exc
-        detail = name_of_type(type(e)) + ": " + str(e)
-        with ResumedTracing():
-            space.detach_path(e)
-        detail += " " + make_counterexample_message(
-            conditions, original_args, __return__
-        )
-        debug("exception while calling postcondition:", detail)
-        debug("exception traceback:", ch_stack(tb))
-        failures = [
-            msg_gen.make(
-                MessageType.POST_ERR,
-                detail,
-                post_condition.filename,
-                post_condition.line,
-                "".join(tb.format()),
+    for post_condition in conditions.post:
+        assert post_condition.evaluate is not None
+        with ExceptionFilter(expected_exceptions) as efilter:
+            # TODO: re-enable post-condition short circuiting. This will require refactoring how
+            # enforced conditions and short curcuiting interact, so that post-conditions are
+            # selectively run when, and only when, performing a short circuit.
+            # with enforced_conditions.enabled_enforcement(), short_circuit:
+            debug("Starting postcondition")
+            with ResumedTracing():
+                isok = bool(post_condition.evaluate(lcls))
+        if efilter.ignore:
+            debug("Ignored exception in postcondition.", efilter.analysis)
+            return efilter.analysis
+        elif efilter.user_exc is not None:
+            (e, tb) = efilter.user_exc
+            detail = name_of_type(type(e)) + ": " + str(e)
+            with ResumedTracing():
+                space.detach_path(e)
+            detail += " " + make_counterexample_message(
+                conditions, original_args, __return__
             )
-        ]
-        return CallAnalysis(VerificationStatus.REFUTED, failures)
-    if isok:
-        debug("Postcondition confirmed.")
-        return CallAnalysis(VerificationStatus.CONFIRMED)
-    else:
-        with ResumedTracing():
-            space.detach_path()
-        detail = "false " + make_counterexample_message(
-            conditions, original_args, __return__
-        )
-        debug(detail)
-        failures = [
-            msg_gen.make(
-                MessageType.POST_FAIL,
-                detail,
-                post_condition.filename,
-                post_condition.line,
-                "",
+            debug("exception while calling postcondition:", detail)
+            debug("exception traceback:", ch_stack(tb))
+            failures = [
+                replace(
+                    msg_gen.make(
+                        MessageType.POST_ERR,
+                        detail,
+                        post_condition.filename,
+                        post_condition.line,
+                        "".join(tb.format()),
+                    ),
+                    condition_src=post_condition.expr_source,
+                )
+            ]
+            return CallAnalysis(VerificationStatus.REFUTED, failures)
+        if not isok:
+            with ResumedTracing():
+                space.detach_path()
+            detail = "false " + make_counterexample_message(
+                conditions, original_args, __return__
             )
-        ]
-        return CallAnalysis(VerificationStatus.REFUTED, failures)
+            debug(detail)
+            failures = [
+                replace(
+                    msg_gen.make(
+                        MessageType.POST_FAIL,
+                        detail,
+                        post_condition.filename,
+                        post_condition.line,
+                        "",
+                    ),
+                    condition_src=post_condition.expr_source,
+                )
+            ]
+            return CallAnalysis(VerificationStatus.REFUTED, failures)
+    debug("Postcondition confirmed.")
+    return CallAnalysis(VerificationStatus.CONFIRMED)
 
 
 def _mutability_testing_hash(o: object) -> int:
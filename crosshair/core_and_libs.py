@@ -1,16 +1,17 @@
 """Register all type handlers and exports core functionality."""
 
+import inspect
 import sys
-from typing import List
+from importlib import import_module
+from typing import Callable, Dict, List, Tuple
 
 from packaging import version
 
-from crosshair import opcode_intercept
-
 # These imports are just for exporting functionality:
 from crosshair.core import (
     AnalysisMessage,
     MessageType,
+    _register_lazy_module,
     _reset_all_registrations,
     analyze_any,
     analyze_class,
@@ -20,37 +21,6 @@ from crosshair.core import (
     run_checkables,
     standalone_statespace,
 )
-
-# Modules with registrations:
-from crosshair.libimpl import (
-    arraylib,
-    binasciilib,
-    builtinslib,
-    codecslib,
-    collectionslib,
-    copylib,
-    datetimelib,
-    decimallib,
-    fractionlib,
-    functoolslib,
-    hashliblib,
-    heapqlib,
-    importliblib,
-    iolib,
-    ipaddresslib,
-    itertoolslib,
-    jsonlib,
-    mathlib,
-    oslib,
-    randomlib,
-    relib,
-    timelib,
-    typeslib,
-    unicodedatalib,
-    urlliblib,
-    weakreflib,
-    zliblib,
-)
 from crosshair.options import AnalysisKind, AnalysisOptions
 from crosshair.tracers import NoTracing, ResumedTracing
 from crosshair.util import debug
@@ -80,42 +50,178 @@ __all__ = [
 ]
 
 
+# Modules with registrations (these are imported when registrations are made):
+_REGISTRATION_MODULES = (
+    "crosshair.libimpl.arraylib",
+    "crosshair.libimpl.builtinslib",
+    "crosshair.libimpl.codecslib",
+    "crosshair.libimpl.collectionslib",
+    "crosshair.libimpl.copylib",
+    "crosshair.libimpl.functoolslib",
+    "crosshair.libimpl.hashliblib",
+    "crosshair.libimpl.heapqlib",
+    "crosshair.libimpl.importliblib",
+    "crosshair.libimpl.iolib",
+    "crosshair.libimpl.ipaddresslib",
+    "crosshair.libimpl.itertoolslib",
+    "crosshair.libimpl.mathlib",
+    "crosshair.libimpl.oslib",
+    "crosshair.libimpl.randomlib",
+    "crosshair.libimpl.timelib",
+    "crosshair.libimpl.typeslib",
+    "crosshair.libimpl.urlliblib",
+    "crosshair.opcode_intercept",
+    "crosshair.libimpl.weakreflib",
+    "crosshair.libimpl.zliblib",
+)
+
+
+def _binascii_registrations() -> Tuple[List[Callable], List[type]]:
+    import binascii
+
+    return [binascii.b2a_base64, binascii.a2b_base64], []
+
+
+def _datetime_registrations() -> Tuple[List[Callable], List[type]]:
+    import datetime
+
+    classes = [
+        datetime.timezone,
+        datetime.date,
+        datetime.time,
+        datetime.datetime,
+        datetime.timedelta,
+    ]
+    return classes, [datetime.tzinfo, *classes]
+
+
+def _decimal_registrations() -> Tuple[List[Callable], List[type]]:
+    import decimal
+
+    context_methods = [
+        method
+        for name, method in sorted(decimal.Context.__dict__.items())
+        if inspect.ismethoddescriptor(method) and not name.startswith("_")
+    ]
+    return [decimal.Decimal, *context_methods], [decimal.Decimal]
+
+
+def _fraction_registrations() -> Tuple[List[Callable], List[type]]:
+    import fractions
+
+    return [], [fractions.Fraction]
+
+
+def _json_registrations() -> Tuple[List[Callable], List[type]]:
+    import json
+    import json.encoder
+
+    return [
+        json.dump,
+        json.dumps,
+        json.load,
+        json.loads,
+        json.JSONEncoder.default,
+        json.JSONEncoder.encode,
+        json.JSONEncoder.iterencode,
+        json.JSONDecoder.decode,
+        json.JSONDecoder.raw_decode,
+        json.encoder._make_iterencode,  # type: ignore
+        json.encoder.encode_basestring_ascii,  # type: ignore
+    ], []
+
+
+def _re_registrations() -> Tuple[List[Callable], List[type]]:
+    import re
+
+    return [
+        re._compile,  # type: ignore
+        re.Pattern.search,
+        re.Pattern.match,
+        re.Pattern.fullmatch,
+        re.Pattern.split,
+        re.Pattern.findall,
+        re.Pattern.finditer,
+        re.Pattern.sub,
+        re.Pattern.subn,
+    ], []
+
+
+def _unicodedata_registrations() -> Tuple[List[Callable], List[type]]:
+    import unicodedata
+
+    patched = [
+        unicodedata.lookup,
+        unicodedata.name,
+        unicodedata.decimal,
+        unicodedata.digit,
+        unicodedata.numeric,
+        unicodedata.category,
+        unicodedata.bidirectional,
+        unicodedata.combining,
+        unicodedata.east_asian_width,
+        unicodedata.mirrored,
+        unicodedata.decomposition,
+        unicodedata.normalize,
+    ]
+    if sys.version_info >= (3, 8):
+        patched.append(unicodedata.is_normalized)
+    return patched, []
+
+
+# Modules whose registrations are made on first use: module name -> a function
+# that gives the functions it patches and the types it registers.
+# (these only need standard library imports, not the modules themselves)
+_LAZY_REGISTRATION_MODULES: Dict[
+    str, Callable[[], Tuple[List[Callable], List[type]]]
+] = {
+    "crosshair.libimpl.binasciilib": _binascii_registrations,
+    "crosshair.libimpl.datetimelib": _datetime_registrations,
+    "crosshair.libimpl.decimallib": _decimal_registrations,
+    "crosshair.libimpl.fractionlib": _fraction_registrations,
+    "crosshair.libimpl.jsonlib": _json_registrations,
+    "crosshair.libimpl.relib": _re_registrations,
+    "crosshair.libimpl.unicodedatalib": _unicodedata_registrations,
+}
+
+_REGISTRATIONS_MADE = False
+
+
+def plugin_entries():
+    return entry_points(group="crosshair.plugin")
+
+
+def ensure_registrations() -> None:
+    """
+    Make the registrations for the standard library and plugins, if not done yet.
+
+    Registrations are made on first use (rather than at import time), so that
+    processes which never analyze anything do not pay for them.
+    Unlike `_make_registrations`, this keeps any registrations made beforehand.
+    """
+    if not _REGISTRATIONS_MADE:
+        _add_registrations()
+
+
 def _make_registrations():
     _reset_all_registrations()
-    arraylib.make_registrations()
-    binasciilib.make_registrations()
-    builtinslib.make_registrations()
-    codecslib.make_registrations()
-    collectionslib.make_registrations()
-    copylib.make_registrations()
-    datetimelib.make_registrations()
-    decimallib.make_registrations()
-    functoolslib.make_registrations()
-    fractionlib.make_registrations()
-    hashliblib.make_registrations()
-    heapqlib.make_registrations()
-    jsonlib.make_registrations()
-    importliblib.make_registrations()
-    iolib.make_registrations()
-    ipaddresslib.make_registrations()
-    itertoolslib.make_registrations()
-    mathlib.make_registrations()
-    oslib.make_registrations()
-    randomlib.make_registrations()
-    relib.make_registrations()
-    timelib.make_registrations()
-    typeslib.make_registrations()
-    unicodedatalib.make_registrations()
-    urlliblib.make_registrations()
-    opcode_intercept.make_registrations()
-    weakreflib.make_registrations()
-    zliblib.make_registrations()
-
-    plugin_entries = entry_points(group="crosshair.plugin")
-    for plugin_entry in plugin_entries:
+    _add_registrations()
+
+
+def _add_registrations():
+    global _REGISTRATIONS_MADE
+    _REGISTRATIONS_MADE = True
+    for module_name in _REGISTRATION_MODULES:
+        import_module(module_name).make_registrations()  # type: ignore
+    for module_name, get_registrations in _LAZY_REGISTRATION_MODULES.items():
+        _register_lazy_module(module_name, *get_registrations())
+
+    for plugin_entry in plugin_entries():
         installed_plugins.append(plugin_entry.name)
         plugin_entry.load()
 
+
+def _disable_contract_enforcement():
     # We monkey patch icontract below to prevent it from enforcing contracts.
     # (we want to control how and when they run)
     # TODO: consider a better home for this code
@@ -146,4 +252,4 @@ def _make_registrations():
         pass
 
 
-_make_registrations()
+_disable_contract_enforcement()
@@ -18,6 +18,7 @@ import pytest  # type: ignore
 import typing_inspect  # type: ignore
 
 from crosshair.core import _SIMPLE_PROXIES, proxy_for_type
+from crosshair.core_and_libs import ensure_registrations
 from crosshair.dynamic_typing import origin_of
 from crosshair.tracers import ResumedTracing
 from crosshair.util import CrosshairUnsupported, debug, name_of_type
@@ -50,6 +51,7 @@ untested_types = {
 }
 
 
+ensure_registrations()  # (registrations are otherwise made on first use)
 comparisons: List = []
 for typ, creator in _SIMPLE_PROXIES.items():
     if typ in untested_types:
@@ -2,6 +2,7 @@ import dataclasses
 import importlib
 import inspect
 import re
+import subprocess
 import sys
 import time
 from typing import *
@@ -9,7 +10,7 @@ from typing import *
 import pytest  # type: ignore
 
 import crosshair
-from crosshair import core_and_libs, type_repo
+from crosshair import core, core_and_libs, type_repo
 from crosshair.core import (
     deep_realize,
     get_constructor_signature,
@@ -640,6 +641,82 @@ def test_inherited_preconditions_overridable():
     assert actual == expected
 
 
+def _run_script(*lines: str) -> None:
+    # (run in a new process, because registrations are global)
+    completion = subprocess.run(
+        [sys.executable, "-c", "\n".join(lines)],
+        stdin=subprocess.DEVNULL,
+        capture_output=True,
+        text=True,
+    )
+    assert completion.returncode == 0, completion.stderr
+
+
+def test_registrations_are_made_on_first_use():
+    _run_script(
+        "import sys",
+        "from crosshair import register_type",
+        "from crosshair.core_and_libs import proxy_for_type, standalone_statespace",
+        "assert 'crosshair.libimpl.builtinslib' not in sys.modules",
+        "class Custom: pass",
+        "register_type(Custom, lambda p: 42)",
+        "with standalone_statespace:",
+        "    assert proxy_for_type(Custom, 'x') == 42",
+        "assert 'crosshair.libimpl.builtinslib' in sys.modules",
+        "assert 'crosshair.libimpl.decimallib' not in sys.modules",
+    )
+
+
+LAZY_EXAMPLE_MODULE = """
+import datetime, json
+
+def unrelated(x: int) -> int:
+    '''post: _ != 42'''
+    return x
+
+def with_json(x: int) -> str:
+    '''post: _ != '42' '''
+    return json.dumps(x)
+
+def with_date(d: datetime.date) -> int:
+    '''post: _ != 2000'''
+    return d.year
+"""
+
+
+def test_library_modules_are_imported_when_used(tmp_path):
+    (tmp_path / "lazy_example.py").write_text(LAZY_EXAMPLE_MODULE)
+    _run_script(
+        "import sys",
+        f"sys.path.append({str(tmp_path)!r})",
+        "from crosshair.core_and_libs import analyze_function, run_checkables",
+        "from lazy_example import unrelated, with_date, with_json",
+        "def check(fn, module_name):",
+        "    assert module_name not in sys.modules",
+        "    messages = run_checkables(analyze_function(fn))",
+        "    assert [m.state.name for m in messages] == ['POST_FAIL'], fn",
+        "check(unrelated, 'crosshair.libimpl.datetimelib')",
+        "check(with_json, 'crosshair.libimpl.jsonlib')",
+        "assert 'crosshair.libimpl.jsonlib' in sys.modules",
+        "check(with_date, 'crosshair.libimpl.datetimelib')",
+        "assert 'crosshair.libimpl.datetimelib' in sys.modules",
+    )
+
+
+@pytest.mark.parametrize("module_name", core_and_libs._LAZY_REGISTRATION_MODULES)
+def test_lazy_registrations_match_the_module(module_name, monkeypatch):
+    patches: dict = {}
+    types: dict = {}
+    monkeypatch.setattr(core, "_PATCH_REGISTRATIONS", patches)
+    monkeypatch.setattr(core, "_SIMPLE_PROXIES", types)
+    monkeypatch.setattr(core, "_LAZY_PATCHES", {})
+    monkeypatch.setattr(core, "_LAZY_TYPES", {})
+    monkeypatch.setattr(core, "_PATCHES_APPLIED", False)
+    importlib.import_module(module_name).make_registrations()  # type: ignore
+    get_registrations = core_and_libs._LAZY_REGISTRATION_MODULES[module_name]
+    assert (list(patches), list(types)) == get_registrations()
+
+
 def test_use_subclasses_of_arguments():
     # Even though the argument below is typed as the base class, the fact
     # that a faulty implementation exists is enough to produce a
@@ -994,6 +1071,106 @@ def test_error_message_in_unrelated_method() -> None:
     assert actual == expected
 
 
+def test_lazy_arguments_are_not_created_when_unused() -> None:
+    constructed = []
+
+    class Tracked:
+        def __init__(self, x: int):
+            constructed.append(x)
+
+    def f(used: int, unused: Tracked, also_unused: Dict[str, int]) -> int:
+        """post: _ == used"""
+        return used
+
+    check_states(f, CONFIRMED, AnalysisOptionSet(lazy_arguments=True))
+    assert constructed == []
+
+
+def test_lazy_arguments_keep_their_values_for_postconditions() -> None:
+    def f(x: int, items: List[int]) -> int:
+        """post: _ == x + len(items)"""
+        x += len(items)
+        return x
+
+    check_states(f, CONFIRMED, AnalysisOptionSet(lazy_arguments=True))
+
+
+def test_lazy_arguments_report_mutations() -> None:
+    def f(items: List[int]) -> None:
+        """post[]: True"""
+        items.append(1)
+
+    check_states(f, POST_ERR, AnalysisOptionSet(lazy_arguments=True))
+
+
+def test_lazy_arguments_can_be_none() -> None:
+    def f(x: Optional[int]) -> int:
+        """post: _ != 1"""
+        if x is None:
+            return 1
+        return 0
+
+    check_states(f, POST_FAIL, AnalysisOptionSet(lazy_arguments=True))
+
+
+def test_combined_postconditions_report_each_condition() -> None:
+    def f(x: int) -> int:
+        """
+        pre: 0 <= x < 100
+        post: _ >= x
+        post: _ != 50
+        post: _ < 1000
+        """
+        return x * 2
+
+    checkables = analyze_function(
+        f, AnalysisOptionSet(combined_postconditions=True, max_iterations=100)
+    )
+    assert len(checkables) == 1
+    states = [m.state for m in run_checkables(checkables)]
+    assert states == [
+        MessageType.CONFIRMED,
+        MessageType.POST_FAIL,
+        MessageType.CONFIRMED,
+    ]
+
+
+def test_combined_postconditions_with_the_same_text() -> None:
+    def f(x: int) -> int:
+        """
+        pre: 0 <= x < 100
+        post: _ != 50
+        post: _ >= x
+        post: _ != 50
+        """
+        return x * 2
+
+    checkables = analyze_function(
+        f, AnalysisOptionSet(combined_postconditions=True, max_iterations=100)
+    )
+    messages = sorted(run_checkables(checkables), key=lambda m: m.line)
+    assert [m.state for m in messages] == [
+        MessageType.POST_FAIL,
+        MessageType.CONFIRMED,
+        MessageType.POST_FAIL,
+    ]
+
+
+def test_combined_postconditions_stop_at_errors_in_the_body() -> None:
+    def f(x: int) -> int:
+        """
+        pre: x >= 0
+        post: _ >= 0
+        post: _ <= 10
+        """
+        return 10 // x
+
+    messages = run_checkables(
+        analyze_function(f, AnalysisOptionSet(combined_postconditions=True))
+    )
+    assert [m.state for m in messages] == [MessageType.EXEC_ERR]
+
+
 def test_error_message_has_unmodified_args() -> None:
     def f(foo: List[Pokeable]) -> None:
         """
@@ -181,7 +181,7 @@ def diff_behavior_with_signature(
     options: AnalysisOptions,
     exception_equivalence: ExceptionEquivalenceType,
 ) -> Iterable[BehaviorDiff]:
-    search_root = RootNode()
+    search_root = RootNode(options)
     condition_start = time.monotonic()
     max_uninteresting_iterations = options.get_max_uninteresting_iterations()
     for i in range(1, options.max_iterations):
@@ -0,0 +1,122 @@
+"""Caching, across processes, of information that is derived from source files."""
+
+import hashlib
+import json
+import os
+import tempfile
+from typing import Dict, List, Optional, Tuple
+
+from crosshair.auditwall import opened_auditwall
+from crosshair.util import debug
+
+# Set this environment variable to a directory to enable caching on disk.
+CACHE_DIR_ENV_VAR = "CROSSHAIR_CACHE_DIR"
+
+_MISSING = object()
+
+
+class SourceDerivedCache:
+    """
+    Store JSON-compatible values that are computed from a source file.
+
+    Entries are grouped by source file and keyed by a hash of its contents, so that
+    editing a file invalidates everything derived from it.
+    Each entry is written to its own file, so that processes sharing the cache never
+    overwrite each other's entries.
+    When ``directory`` is None, nothing is cached.
+    """
+
+    def __init__(self, name: str, directory: Optional[str]):
+        self.name = name
+        self.directory = directory
+        # filename -> (modification time, size, content hash)
+        self._digests: Dict[str, Tuple[int, int, str]] = {}
+        # (content hash, key) -> value (or _MISSING)
+        self._entries: Dict[Tuple[str, str], object] = {}
+
+    def _digest(self, filename: str) -> Optional[str]:
+        try:
+            stat = os.stat(filename)
+        except OSError:
+            return None
+        known = self._digests.get(filename)
+        if known is not None and known[:2] == (stat.st_mtime_ns, stat.st_size):
+            return known[2]
+        try:
+            with open(filename, "rb") as fh:
+                digest = hashlib.sha256(fh.read()).hexdigest()
+        except OSError:
+            return None
+        self._digests[filename] = (stat.st_mtime_ns, stat.st_size, digest)
+        return digest
+
+    def _path(self, digest: str, key: str) -> str:
+        assert self.directory is not None
+        key_digest = hashlib.sha256(key.encode()).hexdigest()
+        return os.path.join(self.directory, self.name, digest, f"{key_digest}.json")
+
+    def get(self, filename: str, key: str) -> Optional[object]:
+        if self.directory is None:
+            return None
+        digest = self._digest(filename)
+        if digest is None:
+            return None
+        if (digest, key) not in self._entries:
+            self._entries[(digest, key)] = self._read(digest, key)
+        value = self._entries[(digest, key)]
+        return None if value is _MISSING else value
+
+    def _read(self, digest: str, key: str) -> object:
+        try:
+            with open(self._path(digest, key), "r") as fh:
+                stored_key, value = json.load(fh)
+        except (OSError, ValueError, TypeError):
+            return _MISSING
+        return value if stored_key == key else _MISSING
+
+    def put(self, filename: str, key: str, value: object) -> None:
+        if self.directory is None:
+            return
+        digest = self._digest(filename)
+        if digest is None:
+            return
+        self._entries[(digest, key)] = value
+        path = self._path(digest, key)
+        # (we may be writing in the middle of an analysis)
+        with opened_auditwall():
+            try:
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                fd, tmp_path = tempfile.mkstemp(
+                    dir=os.path.dirname(path), suffix=".tmp"
+                )
+                with os.fdopen(fd, "w") as fh:
+                    json.dump([key, value], fh)
+                # Atomically replace, in case other processes are reading:
+                os.replace(tmp_path, path)
+            except OSError as exc:
+                debug("Unable to write to the CrossHair cache:", exc)
+
+
+_NAMED_CACHES: List[SourceDerivedCache] = []
+
+
+def source_derived_cache(name: str) -> SourceDerivedCache:
+    cache = SourceDerivedCache(name, os.environ.get(CACHE_DIR_ENV_VAR) or None)
+    _NAMED_CACHES.append(cache)
+    return cache
+
+
+def set_cache_dir(directory: Optional[str]) -> None:
+    """
+    Cache in `directory` (or nowhere, when None) from now on.
+
+    This applies to the caches made with `source_derived_cache`, and (through the
+    environment) to processes that are started later, like the watcher's workers.
+    """
+    if directory is None:
+        os.environ.pop(CACHE_DIR_ENV_VAR, None)
+    else:
+        os.environ[CACHE_DIR_ENV_VAR] = directory
+    for cache in _NAMED_CACHES:
+        cache.directory = directory
+        cache._entries.clear()
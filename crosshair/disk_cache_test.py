@@ -0,0 +1,93 @@
+import os
+import subprocess
+import sys
+
+from crosshair import disk_cache
+from crosshair.disk_cache import (
+    CACHE_DIR_ENV_VAR,
+    SourceDerivedCache,
+    set_cache_dir,
+    source_derived_cache,
+)
+
+
+def test_values_persist_across_instances(tmp_path) -> None:
+    source = tmp_path / "mod.py"
+    source.write_text("x = 1\n")
+    cache_dir = str(tmp_path / "cache")
+    SourceDerivedCache("test", cache_dir).put(str(source), "x", [1, "one"])
+    assert SourceDerivedCache("test", cache_dir).get(str(source), "x") == [1, "one"]
+    assert SourceDerivedCache("other", cache_dir).get(str(source), "x") is None
+
+
+def test_instances_do_not_overwrite_each_other(tmp_path) -> None:
+    source = tmp_path / "mod.py"
+    source.write_text("x = 1\n")
+    cache_dir = str(tmp_path / "cache")
+    # As if in two processes that each loaded the cache before writing:
+    cache1, cache2 = (SourceDerivedCache("test", cache_dir) for _ in range(2))
+    assert cache1.get(str(source), "x") is None
+    assert cache2.get(str(source), "y") is None
+    cache1.put(str(source), "x", 1)
+    cache2.put(str(source), "y", 2)
+    cache = SourceDerivedCache("test", cache_dir)
+    assert (cache.get(str(source), "x"), cache.get(str(source), "y")) == (1, 2)
+
+
+def test_editing_the_source_invalidates(tmp_path) -> None:
+    source = tmp_path / "mod.py"
+    source.write_text("x = 1\n")
+    cache = SourceDerivedCache("test", str(tmp_path / "cache"))
+    cache.put(str(source), "x", 1)
+    source.write_text("x = 22\n")
+    assert cache.get(str(source), "x") is None
+    assert (
+        SourceDerivedCache("test", str(tmp_path / "cache")).get(str(source), "x")
+        is None
+    )
+
+
+def test_disabled_without_a_directory(tmp_path) -> None:
+    source = tmp_path / "mod.py"
+    source.write_text("x = 1\n")
+    cache = SourceDerivedCache("test", None)
+    cache.put(str(source), "x", 1)
+    assert cache.get(str(source), "x") is None
+    assert os.listdir(tmp_path) == ["mod.py"]
+
+
+def test_missing_source_files_are_not_cached(tmp_path) -> None:
+    cache = SourceDerivedCache("test", str(tmp_path))
+    cache.put(str(tmp_path / "nonexistent.py"), "x", 1)
+    assert cache.get(str(tmp_path / "nonexistent.py"), "x") is None
+    assert os.listdir(tmp_path) == []
+
+
+def test_set_cache_dir(tmp_path, monkeypatch) -> None:
+    monkeypatch.delenv(CACHE_DIR_ENV_VAR, raising=False)
+    monkeypatch.setattr(disk_cache, "_NAMED_CACHES", [])
+    source = tmp_path / "mod.py"
+    source.write_text("x = 1\n")
+    cache = source_derived_cache("test")
+    assert cache.directory is None
+    cache_dir = str(tmp_path / "cache")
+    try:
+        set_cache_dir(cache_dir)
+        cache.put(str(source), "x", 1)
+        assert SourceDerivedCache("test", cache_dir).get(str(source), "x") == 1
+        # Processes started later (like the watcher's workers) use it too:
+        completion = subprocess.run(
+            [
+                sys.executable,
+                "-c",
+                "from crosshair.disk_cache import source_derived_cache;"
+                "print(source_derived_cache('test').directory)",
+            ],
+            capture_output=True,
+            text=True,
+        )
+        assert completion.stdout.strip() == cache_dir
+    finally:
+        set_cache_dir(None)
+    assert cache.directory is None
+    assert cache.get(str(source), "x") is None
@@ -1,6 +1,8 @@
+import abc
 import collections.abc
 import sys
 import typing
+from abc import ABCMeta
 from inspect import Parameter, Signature
 from itertools import zip_longest
 from typing import Any, Callable, Dict, List, Mapping, Optional, Sequence, Tuple, Type
@@ -87,15 +89,71 @@ def unify_dicts(
     return True
 
 
+# (value type, receiving type, prior bindings) -> (result, new bindings)
+_UNIFY_CACHE: Dict[Tuple[object, ...], Tuple[bool, Dict[object, Type]]] = {}
+_UNIFY_CACHE_MAX_SIZE = 10_000
+# Registering a virtual subclass (ABC.register) changes the token and
+# invalidates the cached results:
+_UNIFY_CACHE_TOKEN = abc.get_cache_token()
+_PLAIN_METACLASSES = (type, ABCMeta)
+
+
 def unify(
     value_type: Type,
     recv_type: Type,
     bindings: Optional[typing.ChainMap[object, Type]] = None,
 ) -> bool:
+    """
+    Determine whether values of `value_type` may be used as a `recv_type`.
+
+    On success, type variable bindings are added to `bindings`.
+    """
     if bindings is None:
         bindings = collections.ChainMap()
     value_type = bindings.get(value_type, value_type)
     recv_type = bindings.get(recv_type, recv_type)
+    # Fast path for plain classes (`tuple` is special; it unifies with sequences):
+    if (
+        type(value_type) in _PLAIN_METACLASSES
+        and type(recv_type) in _PLAIN_METACLASSES
+        and value_type is not tuple
+        and recv_type is not tuple
+    ):
+        return issubclass(value_type, recv_type)
+    global _UNIFY_CACHE_TOKEN
+    cache_token = abc.get_cache_token()
+    if cache_token != _UNIFY_CACHE_TOKEN:
+        _UNIFY_CACHE.clear()
+        _UNIFY_CACHE_TOKEN = cache_token
+    try:
+        key = (value_type, recv_type, *bindings.items())
+        cached = _UNIFY_CACHE.get(key)
+    except TypeError:  # (some type has an unhashable argument)
+        return _unify(value_type, recv_type, bindings)
+    if cached is None:
+        sub_bindings = bindings.new_child()
+        result = _unify(value_type, recv_type, sub_bindings)
+        new_bindings: Dict[object, Type] = {}
+        if result:
+            # (unify_dicts may have inserted additional maps)
+            new_maps = sub_bindings.maps[: len(sub_bindings.maps) - len(bindings.maps)]
+            for new_map in reversed(new_maps):
+                new_bindings.update(new_map)
+        if len(_UNIFY_CACHE) >= _UNIFY_CACHE_MAX_SIZE:
+            _UNIFY_CACHE.clear()
+        cached = (result, new_bindings)
+        _UNIFY_CACHE[key] = cached
+    result, new_bindings = cached
+    if new_bindings:
+        bindings.update(new_bindings)
+    return result
+
+
+def _unify(
+    value_type: Type,
+    recv_type: Type,
+    bindings: typing.ChainMap[object, Type],
+) -> bool:
     if value_type == Any or recv_type == Any:
         return True
 
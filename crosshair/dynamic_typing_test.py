@@ -18,6 +18,7 @@ from typing import (
 import pytest
 from typing_extensions import TypedDict
 
+from crosshair import dynamic_typing
 from crosshair.dynamic_typing import (
     get_bindings_from_type_arguments,
     intersect_signatures,
@@ -74,6 +75,29 @@ def test_bound_vtypears():
     assert not (unify(Dict[str, int], Dict[_T, _T]))
 
 
+def test_unify_reuses_results_and_bindings(monkeypatch):
+    first: collections.ChainMap = collections.ChainMap()
+    assert unify(Dict[str, List[int]], Mapping[_T, Sequence[_U]], first)
+
+    def fail(*a):
+        raise AssertionError("unify was not memoized")
+
+    monkeypatch.setattr(dynamic_typing, "_unify", fail)
+    second: collections.ChainMap = collections.ChainMap()
+    assert unify(Dict[str, List[int]], Mapping[_T, Sequence[_U]], second)
+    assert dict(second) == dict(first) == {_T: str, _U: int}
+    assert unify(bool, int)  # (plain classes are not memoized at all)
+
+
+def test_unify_follows_abc_registration():
+    class NotYetIterable:
+        pass
+
+    assert not unify(NotYetIterable, Iterable[_T])
+    Iterable.register(NotYetIterable)
+    assert unify(NotYetIterable, Iterable[_T])
+
+
 def test_zero_type_args_ok():
     assert unify(map, Iterable[_T])
     assert not (unify(map, Iterable[int]))
@@ -2,7 +2,7 @@ import contextlib
 import copy
 import functools
 import os
-from types import FrameType
+from types import BuiltinFunctionType, FrameType, FunctionType
 from typing import Callable, Dict, Mapping, Optional, Set, Tuple
 
 from crosshair.condition_parser import (
@@ -191,6 +191,10 @@ class EnforcedConditions(TracingModule):
         self.interceptor = interceptor
         self.fns_enforcing: Optional[Set[Callable]] = None
         self.codeobj_cache: Dict[object, bool] = {}
+        # Maps functions to their (code object, conditions):
+        self.fn_conditions_cache: Dict[
+            Callable, Tuple[object, Optional[Conditions]]
+        ] = {}
 
     @contextlib.contextmanager
     def currently_enforcing(self, fn: Callable):
@@ -236,6 +240,21 @@ class EnforcedConditions(TracingModule):
             cache[codeobj] = cachedval
         return cachedval
 
+    def cached_fn_conditions(self, fn: Callable) -> Optional[Conditions]:
+        if type(fn) not in (FunctionType, BuiltinFunctionType):
+            # Other callables may not be safely hashable.
+            return self.condition_parser.get_fn_conditions(FunctionInfo(None, "", fn))  # type: ignore
+        # Reloading a module creates new function objects, and reassigning
+        # __code__ changes the function's source; either way, we'll miss the cache.
+        codeobj = getattr(fn, "__code__", None)
+        cache = self.fn_conditions_cache
+        cached = cache.get(fn)
+        if cached is not None and cached[0] is codeobj:
+            return cached[1]
+        conditions = self.condition_parser.get_fn_conditions(FunctionInfo(None, "", fn))  # type: ignore
+        cache[fn] = (codeobj, conditions)
+        return conditions
+
     def trace_call(
         self,
         frame: FrameType,
@@ -259,7 +278,7 @@ class EnforcedConditions(TracingModule):
         parser = self.condition_parser
         conditions = None
         if binding_target is None:
-            conditions = parser.get_fn_conditions(FunctionInfo(None, "", fn))  # type: ignore
+            conditions = self.cached_fn_conditions(fn)
         else:
             # Method call.
             # We normally expect to look up contracts on `type(binding_target)`, but
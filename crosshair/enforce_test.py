@@ -180,3 +180,23 @@ def test_enforcement_init_on_abcmeta() -> None:
         with pytest.raises(PostconditionFailed):
             WithMetaclass(55)
         WithMetaclass(99)
+
+
+def test_function_conditions_are_parsed_once() -> None:
+    parsed = []
+
+    class CountingParser(Pep316Parser):
+        def get_fn_conditions(self, ctxfn):
+            parsed.append(ctxfn.descriptor)
+            return super().get_fn_conditions(ctxfn)
+
+    with ExitStack() as stack:
+        enforced_conditions = EnforcedConditions(CountingParser())
+        stack.enter_context(COMPOSITE_TRACER)
+        stack.enter_context(enforced_conditions.enabled_enforcement())
+        COMPOSITE_TRACER.trace_caller()
+        for _ in range(3):
+            foo(50)
+        with pytest.raises(PreconditionFailed):
+            foo(-1)
+    assert parsed.count(foo) == 1
@@ -51,6 +51,7 @@ from typing import (
 
 import typing_inspect  # type: ignore
 import z3  # type: ignore
+from z3.z3consts import Z3_FLOATING_POINT_SORT, Z3_INT_SORT, Z3_REAL_SORT
 
 try:
     # For reasons unknown, different distributions of z3 4.13.0 use differnt names.
@@ -126,7 +127,40 @@ from crosshair.util import (
     smtlib_typename,
     type_arg_of,
 )
-from crosshair.z3util import z3And, z3Eq, z3Ge, z3Gt, z3IntVal, z3Not, z3Or
+from crosshair.z3util import (
+    z3Add,
+    z3And,
+    z3Div,
+    z3Eq,
+    z3FpAdd,
+    z3FpDiv,
+    z3FpEq,
+    z3FpGe,
+    z3FpGt,
+    z3FpLe,
+    z3FpLt,
+    z3FpMul,
+    z3FpSub,
+    z3Ge,
+    z3Gt,
+    z3If,
+    z3IntVal,
+    z3Le,
+    z3Lt,
+    z3Mod,
+    z3Mul,
+    z3Ne,
+    z3Neg,
+    z3Not,
+    z3Or,
+    z3Pow,
+    z3Select,
+    z3Store,
+    z3StringVal,
+    z3Sub,
+    z3ToInt,
+    z3ToReal,
+)
 
 if sys.version_info >= (3, 12):
     from collections.abc import Buffer
@@ -647,17 +681,107 @@ _VALID_OPS_ON_COMPLEX_TYPES: Set[BinFn] = {
 }
 
 
-def apply_smt(op: BinFn, x: z3.ExprRef, y: z3.ExprRef) -> z3.ExprRef:
+_Z3_INT_ZERO = z3IntVal(0)
+_Z3_INT_ONE = z3IntVal(1)
+_Z3_REAL_ZERO = z3.RealVal(0)
+
+# Operations that map directly onto one SMT term when both sides share a sort.
+# (division-like operations are only here for sorts that need no extra handling
+# after the zero check in apply_smt)
+_DIRECT_SMT_OPS: Dict[Optional[int], Dict[BinFn, Callable]] = {
+    Z3_INT_SORT: {
+        ops.add: z3Add,
+        ops.sub: z3Sub,
+        ops.mul: z3Mul,
+        ops.eq: z3Eq,
+        ops.ne: z3Ne,
+        ops.lt: z3Lt,
+        ops.le: z3Le,
+        ops.gt: z3Gt,
+        ops.ge: z3Ge,
+    },
+    Z3_REAL_SORT: {
+        ops.add: z3Add,
+        ops.sub: z3Sub,
+        ops.mul: z3Mul,
+        ops.truediv: z3Div,
+        ops.eq: z3Eq,
+        ops.ne: z3Ne,
+        ops.lt: z3Lt,
+        ops.le: z3Le,
+        ops.gt: z3Gt,
+        ops.ge: z3Ge,
+    },
+    Z3_FLOATING_POINT_SORT: {
+        ops.add: z3FpAdd,
+        ops.sub: z3FpSub,
+        ops.mul: z3FpMul,
+        ops.truediv: z3FpDiv,
+        # Like z3's own operators, == and != are structural here, not fpEQ.
+        ops.eq: z3Eq,
+        ops.ne: z3Ne,
+        ops.lt: z3FpLt,
+        ops.le: z3FpLe,
+        ops.gt: z3FpGt,
+        ops.ge: z3FpGe,
+    },
+}
+
+
+def _float_sort_kind(symbolic_type: type, *operands: object) -> Optional[int]:
+    # Float operands only share a sort when they all use the chosen float type:
+    if not all(type(operand) is symbolic_type for operand in operands):
+        return None
+    if symbolic_type is RealBasedSymbolicFloat:
+        return Z3_REAL_SORT
+    if symbolic_type is PreciseIeeeSymbolicFloat:
+        return Z3_FLOATING_POINT_SORT
+    return None
+
+
+def _int_floordiv(space: StateSpace, x: z3.ArithRef, y: z3.ArithRef) -> z3.ExprRef:
+    zero, one = _Z3_INT_ZERO, _Z3_INT_ONE
+    if space.smt_fork(z3Ge(y, zero)):
+        if space.smt_fork(z3Ge(x, zero)):
+            return z3Div(x, y)
+        else:
+            return z3Neg(z3Div(z3Sub(z3Sub(y, x), one), y))
+    else:
+        if space.smt_fork(z3Ge(x, zero)):
+            return z3Neg(z3Div(z3Sub(z3Sub(x, y), one), z3Neg(y)))
+        else:
+            return z3Div(z3Neg(x), z3Neg(y))
+
+
+def apply_smt(
+    op: BinFn, x: z3.ExprRef, y: z3.ExprRef, sort_kind: Optional[int] = None
+) -> z3.ExprRef:
     # Mostly, z3 overloads operators and things just work.
     # But some special cases need to be checked first.
-    # TODO: we should investigate using the op override mechanism to
-    # dispatch to the right SMT operations.
+    # Callers that know both sides share a sort pass its kind (e.g. Z3_INT_SORT);
+    # then we build terms through z3util's direct API wrappers, skipping the
+    # sort coercion that z3's python operators perform.
     space = context_statespace()
     if op in _ARITHMETIC_OPS:
         if op in (ops.truediv, ops.floordiv, ops.mod):
-            iszero = (fpEQ(y, 0.0)) if isinstance(y, z3.FPRef) else (y == 0)
+            if sort_kind == Z3_INT_SORT:
+                iszero = z3Eq(y, _Z3_INT_ZERO)
+            elif sort_kind == Z3_FLOATING_POINT_SORT:
+                iszero = z3FpEq(y, _Z3_FLOAT_ZERO)
+            else:
+                iszero = (fpEQ(y, 0.0)) if isinstance(y, z3.FPRef) else (y == 0)
             if space.smt_fork(iszero):
                 raise ZeroDivisionError
+            if op == ops.floordiv and sort_kind == Z3_INT_SORT:
+                return _int_floordiv(space, x, y)
+            if op == ops.mod and sort_kind == Z3_INT_SORT:
+                remainder = z3Mod(x, y)
+                if space.smt_fork(
+                    z3Or(z3Ge(y, _Z3_INT_ZERO), z3Eq(remainder, _Z3_INT_ZERO))
+                ):
+                    return remainder
+                else:
+                    return z3Add(remainder, y)
             if op == ops.floordiv:
                 if space.smt_fork(y >= 0):
                     if space.smt_fork(x >= 0):
@@ -675,6 +799,10 @@ def apply_smt(op: BinFn, x: z3.ExprRef, y: z3.ExprRef) -> z3.ExprRef:
                 else:
                     return (x % y) + y
         elif op == ops.pow:
+            if sort_kind == Z3_INT_SORT:
+                if space.smt_fork(z3And(z3Eq(x, _Z3_INT_ZERO), z3Lt(y, _Z3_INT_ZERO))):
+                    raise ZeroDivisionError("zero cannot be raised to a negative power")
+                return z3ToInt(z3Pow(x, y))
             if space.smt_fork(z3.And(x == 0, y < 0)):
                 raise ZeroDivisionError("zero cannot be raised to a negative power")
             if z3.is_fp(x) or z3.is_fp(y):
@@ -682,6 +810,11 @@ def apply_smt(op: BinFn, x: z3.ExprRef, y: z3.ExprRef) -> z3.ExprRef:
                 raise UnknownSatisfiability("pow on floats is not supported by smtlib")
             if x.is_int() and y.is_int():
                 return z3.ToInt(op(x, y))
+    direct_ops = _DIRECT_SMT_OPS.get(sort_kind)
+    if direct_ops is not None:
+        direct_op = direct_ops.get(op)
+        if direct_op is not None:
+            return direct_op(x, y)
     return op(x, y)
 
 
@@ -740,7 +873,8 @@ def setup_binops():
         with NoTracing():
             symbolic_type = context_statespace().extra(ModelingDirector).choose(float)
             bval = symbolic_type._smt_promote_literal(b.val)
-            return SymbolicBool(apply_smt(op, a.var, bval))
+            sort_kind = _float_sort_kind(symbolic_type, a)
+            return SymbolicBool(apply_smt(op, a.var, bval, sort_kind))
 
     setup_binop(_, _COMPARISON_OPS)
 
@@ -748,7 +882,8 @@ def setup_binops():
         with NoTracing():
             symbolic_type = context_statespace().extra(ModelingDirector).choose(float)
             bval = symbolic_type._smt_promote_literal(b.val)
-            return symbolic_type(apply_smt(op, a.var, bval), float)
+            sort_kind = _float_sort_kind(symbolic_type, a)
+            return symbolic_type(apply_smt(op, a.var, bval, sort_kind), float)
 
     setup_binop(_, _ARITHMETIC_OPS)
 
@@ -756,20 +891,23 @@ def setup_binops():
         with NoTracing():
             symbolic_type = context_statespace().extra(ModelingDirector).choose(float)
             aval = symbolic_type._smt_promote_literal(a.val)
-            return symbolic_type(apply_smt(op, aval, b.var), float)
+            sort_kind = _float_sort_kind(symbolic_type, b)
+            return symbolic_type(apply_smt(op, aval, b.var, sort_kind), float)
 
     setup_binop(_, _ARITHMETIC_OPS)
 
     def _(op: BinFn, a: SymbolicFloat, b: SymbolicFloat):
         with NoTracing():
             symbolic_type = context_statespace().extra(ModelingDirector).choose(float)
-            return symbolic_type(apply_smt(op, a.var, b.var), float)
+            sort_kind = _float_sort_kind(symbolic_type, a, b)
+            return symbolic_type(apply_smt(op, a.var, b.var, sort_kind), float)
 
     setup_binop(_, _ARITHMETIC_OPS)
 
     def _(op: BinFn, a: SymbolicFloat, b: SymbolicFloat):
         with NoTracing():
-            return SymbolicBool(apply_smt(op, a.var, b.var))
+            sort_kind = _float_sort_kind(type(a), a, b)
+            return SymbolicBool(apply_smt(op, a.var, b.var, sort_kind))
 
     setup_binop(_, _COMPARISON_OPS)
 
@@ -793,41 +931,39 @@ def setup_binops():
     # int
     def _(op: BinFn, a: SymbolicInt, b: SymbolicInt):
         with NoTracing():
-            return SymbolicInt(apply_smt(op, a.var, b.var))
+            return SymbolicInt(apply_smt(op, a.var, b.var, Z3_INT_SORT))
 
     setup_binop(_, _ARITHMETIC_OPS)
 
     def _(op: BinFn, a: SymbolicInt, b: SymbolicInt):
         with NoTracing():
-            return SymbolicBool(apply_smt(op, a.var, b.var))
+            return SymbolicBool(apply_smt(op, a.var, b.var, Z3_INT_SORT))
 
     setup_binop(_, _COMPARISON_OPS)
 
     def _(op: BinFn, a: SymbolicInt, b: int):
         with NoTracing():
-            return SymbolicInt(apply_smt(op, a.var, z3IntVal(b)))
+            return SymbolicInt(apply_smt(op, a.var, z3IntVal(b), Z3_INT_SORT))
 
     setup_binop(_, _ARITHMETIC_OPS)
 
     def _(op: BinFn, a: int, b: SymbolicInt):
         with NoTracing():
-            return SymbolicInt(apply_smt(op, z3IntVal(a), b.var))
+            return SymbolicInt(apply_smt(op, z3IntVal(a), b.var, Z3_INT_SORT))
 
     setup_binop(_, _ARITHMETIC_OPS)
 
     def _(op: BinFn, a: SymbolicInt, b: int):
         with NoTracing():
-            return SymbolicBool(apply_smt(op, a.var, z3IntVal(b)))
+            return SymbolicBool(apply_smt(op, a.var, z3IntVal(b), Z3_INT_SORT))
 
     setup_binop(_, _COMPARISON_OPS)
 
-    def _(op: BinFn, a: Integral, b: Integral):
+    def _realizing_bitwise_op(op: BinFn, a: Integral, b: Integral):
         # Some bitwise operators require realization presently.
         # TODO: when one side is already realized, we could do something smarter.
         return op(a.__index__(), b.__index__())  # type: ignore
 
-    setup_binop(_, {ops.or_, ops.xor})
-
     def _(op: BinFn, a: Integral, b: Integral):
         if b < 0:
             raise ValueError("negative shift count")
@@ -839,7 +975,7 @@ def setup_binops():
 
     setup_binop(_, {ops.lshift, ops.rshift})
 
-    def _(op: BinFn, a: Integral, b: Integral):
+    def _masking_and(op: BinFn, a: Integral, b: Integral):
         with NoTracing():
             if isinstance(b, SymbolicInt):
                 # Have `a` be symbolic, if possible
@@ -862,7 +998,17 @@ def setup_binops():
             # Fall back to full realization
             return op(realize(a), b)
 
-    setup_binop(_, {ops.and_})
+    def _(op: BinFn, a: Integral, b: Integral):
+        if context_statespace().options.bounded_int_bitvectors:
+            with NoTracing():
+                ret = bitvector_bitwise_op(op, a, b)
+            if ret is not None:
+                return ret
+        if op == ops.and_:
+            return _masking_and(op, a, b)
+        return _realizing_bitwise_op(op, a, b)
+
+    setup_binop(_, {ops.and_, ops.or_, ops.xor})
 
     # TODO: is this necessary still?
     # Floor division over ints requires realization, at present:
@@ -1244,16 +1390,19 @@ class SymbolicInt(SymbolicIntable, AtomicSymbolicValue):
     def __hash__(self):
         return self.__index__().__hash__()
 
+    def __abs__(self):
+        return self._unary_op(lambda v: z3If(z3Lt(v, _Z3_INT_ZERO), z3Neg(v), v))
+
     def __float__(self):
         with NoTracing():
             symbolic_type = context_statespace().extra(ModelingDirector).choose(float)
             if symbolic_type is RealBasedSymbolicFloat:
-                return RealBasedSymbolicFloat(z3.ToReal(self.var))
+                return RealBasedSymbolicFloat(z3ToReal(self.var))
             elif symbolic_type is PreciseIeeeSymbolicFloat:
                 # TODO: We can likely do better with: int -> bit vector -> float
                 return PreciseIeeeSymbolicFloat(
                     z3.fpRealToFP(
-                        z3.RNE(), z3.ToReal(self.var), _PRECISE_IEEE_FLOAT_SORT
+                        z3.RNE(), z3ToReal(self.var), _PRECISE_IEEE_FLOAT_SORT
                     )
                 )
             else:
@@ -1466,6 +1615,56 @@ def make_bounded_int(
     return SymbolicBoundedInt(varname, int, minimum, maximum)
 
 
+# Wider bit-vectors are unlikely to beat integer reasoning:
+_MAX_BITVECTOR_WIDTH = 128
+
+
+def _known_int_bounds(value: object) -> Optional[Tuple[int, int]]:
+    if isinstance(value, SymbolicBoundedInt):
+        minimum, maximum = value._ch_minimum, value._ch_maximum
+        if minimum is None or maximum is None:
+            return None
+        return (minimum, maximum)
+    if isinstance(value, int) and not isinstance(value, SymbolicInt):
+        return (value, value)
+    return None
+
+
+def bitvector_bitwise_op(op: BinFn, a: object, b: object) -> Optional[SymbolicInt]:
+    """
+    Apply `&`, `|`, or `^` over fixed-width bit-vectors.
+
+    This only works when the ranges of both operands are known; otherwise, we
+    return None. Negative values are represented in two's complement, which
+    agrees with Python's semantics when the width covers both operands.
+    """
+    a_bounds, b_bounds = _known_int_bounds(a), _known_int_bounds(b)
+    if a_bounds is None or b_bounds is None:
+        return None
+    low = min(a_bounds[0], b_bounds[0])
+    high = max(a_bounds[1], b_bounds[1])
+    if low >= 0:
+        signed = False
+        width = max(high.bit_length(), 1)
+        result_min, result_max = 0, (1 << width) - 1
+    else:
+        signed = True
+        width = max(high.bit_length(), (-low - 1).bit_length()) + 1
+        result_min, result_max = -(1 << (width - 1)), (1 << (width - 1)) - 1
+    if width > _MAX_BITVECTOR_WIDTH:
+        return None
+
+    def to_bitvector(value: object) -> z3.BitVecRef:
+        if isinstance(value, SymbolicInt):
+            return z3.Int2BV(value.var, width)
+        return z3.BitVecVal(value, width)
+
+    result = z3.BV2Int(op(to_bitvector(a), to_bitvector(b)), is_signed=signed)
+    if op == ops.and_ and not signed:
+        result_max = min(a_bounds[1], b_bounds[1])
+    return SymbolicBoundedInt(result, int, result_min, result_max)
+
+
 class SymbolicFloat(SymbolicNumberAble, AtomicSymbolicValue):
     @classmethod
     def _pytype(cls) -> Type:
@@ -1501,6 +1700,7 @@ _PRECISE_IEEE_FLOAT_SORT = {
     24: z3.Float32(),
     53: z3.Float64(),
 }[sys.float_info.mant_dig]
+_Z3_FLOAT_ZERO = z3.FPVal(0.0, _PRECISE_IEEE_FLOAT_SORT)
 
 
 class PreciseIeeeSymbolicFloat(SymbolicFloat):
@@ -1526,7 +1726,7 @@ class PreciseIeeeSymbolicFloat(SymbolicFloat):
             coerced = type(self)._coerce_to_smt_sort(other)
             if coerced is None:
                 return False
-            return SymbolicBool(fpEQ(self.var, coerced))
+            return SymbolicBool(z3FpEq(self.var, coerced))
 
     # __hash__ has to be explicitly reassigned because we define __eq__
     __hash__ = SymbolicFloat.__hash__
@@ -1540,7 +1740,7 @@ class PreciseIeeeSymbolicFloat(SymbolicFloat):
             coerced = type(self)._coerce_to_smt_sort(other)
             if coerced is None:
                 return True
-            return SymbolicBool(z3.Not(fpEQ(self.var, coerced)))
+            return SymbolicBool(z3Not(z3FpEq(self.var, coerced)))
 
     def __int__(self):
         with NoTracing():
@@ -1647,7 +1847,9 @@ class RealBasedSymbolicFloat(SymbolicFloat):
     def __int__(self):
         with NoTracing():
             var = self.var
-            return SymbolicInt(z3.If(var >= 0, z3.ToInt(var), -z3.ToInt(-var)))
+            return SymbolicInt(
+                z3If(z3Ge(var, _Z3_REAL_ZERO), z3ToInt(var), z3Neg(z3ToInt(z3Neg(var))))
+            )
 
     def __round__(self, ndigits=None):
         if ndigits is not None:
@@ -1678,17 +1880,21 @@ class RealBasedSymbolicFloat(SymbolicFloat):
 
     def __floor__(self):
         with NoTracing():
-            return SymbolicInt(z3.ToInt(self.var))
+            return SymbolicInt(z3ToInt(self.var))
 
     def __ceil__(self):
         with NoTracing():
-            var, floor = self.var, z3.ToInt(self.var)
-            return SymbolicInt(z3.If(var == floor, floor, floor + 1))
+            var, floor = self.var, z3ToInt(self.var)
+            return SymbolicInt(
+                z3If(z3Eq(var, z3ToReal(floor)), floor, z3Add(floor, _Z3_INT_ONE))
+            )
 
     def __trunc__(self):
         with NoTracing():
             var = self.var
-            return SymbolicInt(z3.If(var >= 0, z3.ToInt(var), -z3.ToInt(-var)))
+            return SymbolicInt(
+                z3If(z3Ge(var, _Z3_REAL_ZERO), z3ToInt(var), z3Neg(z3ToInt(z3Neg(var))))
+            )
 
     def as_integer_ratio(self) -> Tuple[Integral, Integral]:
         with NoTracing():
@@ -1730,8 +1936,23 @@ class SymbolicDictOrSet(SymbolicValue):
         else:
             self.ch_key_type = None
             self.smt_key_sort = HeapRef
+        # Whether our SMT variables have been read since construction.
+        # (a list, so that it is shared with our shallow copies)
+        self._observed = [False]
         SymbolicValue.__init__(self, smtvar, typ)
-        space.add(self._len() >= 0)
+        space.add(self._var[1] >= 0)
+
+    @property
+    def var(self):
+        self._observed[0] = True
+        return self._var
+
+    @var.setter
+    def var(self, value):
+        self._var = value
+
+    def _is_observed(self) -> bool:
+        return self._observed[0]
 
     def __ch_realize__(self):
         return origin_of(self.python_type)(self)
@@ -1766,22 +1987,41 @@ class SymbolicDict(SymbolicDictOrSet, collections.abc.Mapping):
             self.ch_val_type = None
             self.smt_val_sort = HeapRef
         SymbolicDictOrSet.__init__(self, smtvar, typ)
-        arr_var = self._arr()
-        len_var = self._len()
-        self.val_missing_checker = arr_var.sort().range().recognizer(0)
-        self.val_missing_constructor = arr_var.sort().range().constructor(0)
-        self.val_constructor = arr_var.sort().range().constructor(1)
-        self.val_accessor = arr_var.sort().range().accessor(1, 0)
-        self.empty = z3.K(arr_var.sort().domain(), self.val_missing_constructor())
-        self._iter_cache: List[z3.Const] = []  # TODO: is this used?
-        space.add((arr_var == self.empty) == (len_var == 0))
+        arr_var, len_var = self._var
+        arr_sort = arr_var.sort()
+
+        def build_sort_parts():
+            val_sort = arr_sort.range()
+            missing_constructor = val_sort.constructor(0)
+            return (
+                val_sort.recognizer(0),
+                missing_constructor,
+                val_sort.constructor(1),
+                val_sort.accessor(1, 0),
+                z3.K(arr_sort.domain(), missing_constructor()),
+            )
+
+        (
+            self.val_missing_checker,
+            self.val_missing_constructor,
+            self.val_constructor,
+            self.val_accessor,
+            self.empty,
+        ) = space.smt_memo(("SymbolicDict", arr_sort.get_id()), build_sort_parts)
+        # The keys of a complete iteration, and whether they have been determined.
+        # (lists, so that they are shared with our shallow copies)
+        self._iter_cache: List[z3.ExprRef] = []
+        self._iterated = [False]
+        space.add(z3Eq(z3Eq(arr_var, self.empty), z3Eq(len_var, _Z3_INT_ZERO)))
 
         def dict_can_be_iterated():
             list(self.__iter__())
             return True
 
         space.defer_assumption(
-            "dict iteration is consistent with items", dict_can_be_iterated
+            "dict iteration is consistent with items",
+            dict_can_be_iterated,
+            self._is_observed,
         )
 
     def __init_var__(self, typ, varname):
@@ -1804,7 +2044,7 @@ class SymbolicDict(SymbolicDictOrSet, collections.abc.Mapping):
             if isinstance(other, SymbolicDict):
                 (other_arr, other_len) = other.var
                 return SymbolicBool(
-                    z3.And(self_len == other_len, self_arr == other_arr)
+                    z3And(z3Eq(self_len, other_len), z3Eq(self_arr, other_arr))
                 )
         # Manually check equality. Drive the loop from the (likely) concrete value 'other':
         if not isinstance(other, collections.abc.Mapping):
@@ -1840,11 +2080,11 @@ class SymbolicDict(SymbolicDictOrSet, collections.abc.Mapping):
                     if self_k == k:
                         return self[self_k]
                 raise KeyError
-            possibly_missing = self._arr()[smt_key]
+            possibly_missing = z3Select(self._arr(), smt_key)
             is_missing = self.val_missing_checker(possibly_missing)
             if SymbolicBool(is_missing).__bool__():
                 raise KeyError
-            if SymbolicBool(self._len() == 0).__bool__():
+            if SymbolicBool(z3Eq(self._len(), _Z3_INT_ZERO)).__bool__():
                 raise IgnoreAttempt("SymbolicDict in inconsistent state")
             return smt_to_ch_value(
                 context_statespace(),
@@ -1858,38 +2098,48 @@ class SymbolicDict(SymbolicDictOrSet, collections.abc.Mapping):
 
     def __iter__(self):
         with NoTracing():
-            arr_var, len_var = self.var
-            iter_cache = self._iter_cache
             space = context_statespace()
-            idx = 0
-            arr_sort = self._arr().sort()
-            is_missing = self.val_missing_checker
-            while SymbolicBool(idx < len_var).__bool__():
-                if space.choose_possible(arr_var == self.empty, probability_true=0.0):
-                    raise IgnoreAttempt("SymbolicDict in inconsistent state")
-                k = z3.Const("k" + str(idx) + space.uniq(), arr_sort.domain())
-                v = z3.Const(
-                    "v" + str(idx) + space.uniq(), self.val_constructor.domain(0)
-                )
-                remaining = z3.Const("remaining" + str(idx) + space.uniq(), arr_sort)
-                space.add(arr_var == z3.Store(remaining, k, self.val_constructor(v)))
-                space.add(is_missing(z3.Select(remaining, k)))
-
-                if idx > len(iter_cache):
-                    raise CrossHairInternal()
-                if idx == len(iter_cache):
-                    iter_cache.append(k)
-                else:
-                    space.add(k == iter_cache[idx])
-                idx += 1
+            iter_cache = self._iter_cache
+            if not self._iterated[0]:
+                iter_cache.extend(self._smt_keys(space))
+                self._iterated[0] = True
+            for k in list(iter_cache):
                 yieldval = smt_to_ch_value(space, self.snapshot, k, self.key_pytype)
                 with ResumedTracing():
                     yield yieldval
-                arr_var = remaining
-            # In this conditional, we reconcile the parallel symbolic variables for
-            # length and contents:
-            if space.choose_possible(arr_var != self.empty, probability_true=0.0):
-                raise IgnoreAttempt("SymbolicDict in inconsistent state")
+
+    def _smt_keys(self, space: StateSpace) -> List[z3.ExprRef]:
+        """
+        Constrain our contents to a list of distinct (symbolic) keys.
+
+        The length comes from a solver model (and, sometimes, from later models
+        that exclude it), and all of the keys are then constrained at once, so
+        that iteration takes O(1) decisions rather than a few per key. The keys
+        themselves remain symbolic.
+        """
+        arr_var, len_var = self.var
+        length = space.find_model_value(len_var, probability_true=0.5)
+        arr_sort = arr_var.sort()
+        is_missing = self.val_missing_checker
+        keys = []
+        constraints = []
+        for idx in range(length):
+            k = z3.Const("k" + str(idx) + space.uniq(), arr_sort.domain())
+            v = z3.Const("v" + str(idx) + space.uniq(), self.val_constructor.domain(0))
+            remaining = z3.Const("remaining" + str(idx) + space.uniq(), arr_sort)
+            constraints.append(
+                z3Eq(arr_var, z3Store(remaining, k, self.val_constructor(v)))
+            )
+            constraints.append(is_missing(z3Select(remaining, k)))
+            keys.append(k)
+            arr_var = remaining
+        # Reconcile the parallel symbolic variables for length and contents:
+        constraints.append(z3Eq(arr_var, self.empty))
+        all_constraints = z3And(*constraints)
+        if not space.is_possible(all_constraints):
+            raise IgnoreAttempt("SymbolicDict in inconsistent state")
+        space.add(all_constraints)
+        return keys
 
     def copy(self):
         with NoTracing():
@@ -1902,10 +2152,13 @@ class SymbolicFrozenSet(SymbolicDictOrSet, FrozenSetBase):
             raise CrossHairInternal
         SymbolicDictOrSet.__init__(self, smtvar, typ)
         self._iter_cache: List[z3.Const] = []
-        self.empty = z3.K(self._arr().sort().domain(), False)
+        arr_var, len_var = self._var
+        self.empty = z3.K(arr_var.sort().domain(), False)
         space = context_statespace()
-        space.add((self._arr() == self.empty) == (self._len() == 0))
-        space.defer_assumption("symbolic set is consistent", self._is_consistent)
+        space.add((arr_var == self.empty) == (len_var == 0))
+        space.defer_assumption(
+            "symbolic set is consistent", self._is_consistent, self._is_observed
+        )
 
     @assert_tracing(True)
     def _is_consistent(self) -> SymbolicBool:
@@ -2190,6 +2443,58 @@ class SymbolicSequence(SymbolicValue, collections.abc.Sequence):
         return self.__mul__(other)
 
 
+def realize_ints(values: Sequence[Union[int, SymbolicInt]]) -> List[int]:
+    """Realize a sequence of integers, taking all symbolic values from one model."""
+    symbolic_idxs = [idx for idx, v in enumerate(values) if isinstance(v, SymbolicInt)]
+    realized = list(values)
+    model_values = context_statespace().find_model_values(
+        [values[idx].var for idx in symbolic_idxs]  # type: ignore
+    )
+    for idx, model_value in zip(symbolic_idxs, model_values):
+        realized[idx] = model_value
+    return realized  # type: ignore
+
+
+def _mergeable_smt_value(
+    ch_item_type: Optional[Type[AtomicSymbolicValue]], value: object
+) -> Optional[z3.ExprRef]:
+    """
+    Get an SMT value for comparing against items of the given type, if we can.
+
+    We only merge comparisons when Python's equality and SMT equality agree; this
+    rules out floats (NaN, signed zeros) and values that would need casting.
+    """
+    if ch_item_type is None or not issubclass(
+        ch_item_type, (SymbolicInt, SymbolicBool)
+    ):
+        return None
+    value = typeable_value(value)
+    if isinstance(value, ch_item_type):
+        return value.var
+    if type(value) is ch_item_type._pytype():
+        return ch_item_type._smt_promote_literal(value)
+    return None
+
+
+def merged_count(matches: List[z3.ExprRef]) -> Union[int, SymbolicInt]:
+    if not matches:
+        return 0
+    with NoTracing():
+        return SymbolicInt(z3.Sum(*[z3.If(match, 1, 0) for match in matches]))
+
+
+def merged_index(matches: List[z3.ExprRef]) -> Union[int, SymbolicInt]:
+    """Find the first matching index, forking once rather than once per item."""
+    with NoTracing():
+        result: z3.ExprRef = z3IntVal(-1)
+        for idx in reversed(range(len(matches))):
+            result = z3.If(matches[idx], z3IntVal(idx), result)
+        ret = SymbolicInt(result)
+    if ret < 0:
+        raise ValueError
+    return ret
+
+
 class SymbolicArrayBasedUniformTuple(SymbolicSequence):
     def __init__(self, smtvar: Union[str, z3.ExprRef], typ: Any):
         if type(smtvar) == str:
@@ -2240,12 +2545,28 @@ class SymbolicArrayBasedUniformTuple(SymbolicSequence):
             if isinstance(other, SymbolicArrayBasedUniformTuple):
                 # TODO: Can these be HeapRefs? If so, we're only doing identity checks:
                 return SymbolicBool(
-                    z3.And(self_len == other._len(), self_arr == other._arr())
+                    z3And(z3Eq(self_len, other._len()), z3Eq(self_arr, other._arr()))
                 )
             if not is_iterable(other):
                 return False
         if len(self) != len(other):
             return False
+        with NoTracing():
+            if (
+                type(other) in (list, tuple)
+                and context_statespace().options.state_merging
+            ):
+                smt_others = [_mergeable_smt_value(self.ch_item_type, v) for v in other]
+                if all(v is not None for v in smt_others):
+                    arr = self._arr()
+                    return SymbolicBool(
+                        z3And(
+                            *[
+                                z3Eq(z3Select(arr, z3IntVal(idx)), v)
+                                for idx, v in enumerate(smt_others)
+                            ]
+                        )
+                    )
         for idx, otherval in enumerate(other):
             myval = self[idx]
             if myval is otherval:
@@ -2257,6 +2578,36 @@ class SymbolicArrayBasedUniformTuple(SymbolicSequence):
     def __repr__(self):
         return str(list(self))
 
+    def _merged_matches(self, value: object) -> Optional[List[z3.ExprRef]]:
+        """
+        Compare `value` against each item without forking on the comparisons.
+
+        Returns None unless state merging is enabled and the comparison can be
+        expressed directly in SMT.
+        (we still fork on the length, once per item)
+        """
+        with NoTracing():
+            space = context_statespace()
+            if not space.options.state_merging:
+                return None
+            smt_value = _mergeable_smt_value(self.ch_item_type, value)
+            if smt_value is None:
+                return None
+            arr_var = self._arr()
+            len_int = self._len_int
+            matches = []
+            idx = 0
+            while idx < len_int:
+                matches.append(z3Eq(z3Select(arr_var, z3IntVal(idx)), smt_value))
+                idx += 1
+            return matches
+
+    def count(self, value: object) -> int:
+        matches = self._merged_matches(value)
+        if matches is None:
+            return super().count(value)
+        return merged_count(matches)
+
     def __iter__(self):
         with NoTracing():
             space = context_statespace()
@@ -2265,7 +2616,10 @@ class SymbolicArrayBasedUniformTuple(SymbolicSequence):
             idx = 0
             while idx < len_int:
                 val = smt_to_ch_value(
-                    space, self.snapshot, z3.Select(arr_var, idx), self.val_pytype
+                    space,
+                    self.snapshot,
+                    z3Select(arr_var, z3IntVal(idx)),
+                    self.val_pytype,
                 )
                 with ResumedTracing():
                     yield val
@@ -2291,10 +2645,10 @@ class SymbolicArrayBasedUniformTuple(SymbolicSequence):
                     idx = z3.Const("possible_idx" + space.uniq(), _SMT_INT_SORT)
                     idx_in_range = z3.Exists(
                         idx,
-                        z3.And(
-                            0 <= idx,
-                            idx < self._len(),
-                            z3.Select(self._arr(), idx) == smt_other,
+                        z3And(
+                            z3Le(_Z3_INT_ZERO, idx),
+                            z3Lt(idx, self._len()),
+                            z3Eq(z3Select(self._arr(), idx), smt_other),
                         ),
                     )
                     return SymbolicBool(idx_in_range)
@@ -2321,7 +2675,10 @@ class SymbolicArrayBasedUniformTuple(SymbolicSequence):
                 with ResumedTracing():
                     return SliceView.slice(self, start, stop)
             else:
-                smt_result = z3.Select(self._arr(), smt_coerce(idx_or_pair))
+                smt_idx = smt_coerce(idx_or_pair)
+                if not isinstance(smt_idx, z3.ExprRef):
+                    smt_idx = z3IntVal(smt_idx)
+                smt_result = z3Select(self._arr(), smt_idx)
                 return smt_to_ch_value(
                     space, self.snapshot, smt_result, self.val_pytype
                 )
@@ -2332,6 +2689,10 @@ class SymbolicArrayBasedUniformTuple(SymbolicSequence):
         start: int = _LIST_INDEX_START_DEFAULT,
         stop: int = _LIST_INDEX_STOP_DEFAULT,
     ) -> int:
+        if start is _LIST_INDEX_START_DEFAULT and stop is _LIST_INDEX_STOP_DEFAULT:
+            matches = self._merged_matches(value)
+            if matches is not None:
+                return merged_index(matches)
         try:
             start, stop = start.__index__(), stop.__index__()
         except AttributeError:
@@ -2829,6 +3190,8 @@ class SymbolicBoundedIntTuple(collections.abc.Sequence):
         assert not is_tracing()
         assert ranges
         self._ranges = ranges
+        # A hashable (structural) description of the ranges, for memoizing constraints:
+        self._ranges_key = tuple(map(tuple, ranges))
         self._varname = varname
         self._len = SymbolicBoundedInt(varname + "len", int, 0, None)
         self._created_vars: List[SymbolicInt] = []
@@ -2838,12 +3201,15 @@ class SymbolicBoundedIntTuple(collections.abc.Sequence):
         # but it happens to be handy to have it realize like one would.
         concrete_size = realize(self._len)
         self._create_up_to(concrete_size)
-        return tuple(realize(v) for v in self._created_vars[:concrete_size])
+        return tuple(realize_ints(self._created_vars[:concrete_size]))
 
     def _create_up_to(self, size: int) -> None:
         space = context_statespace()
         created_vars = self._created_vars
         ranges = self._ranges
+        if len(created_vars) < size and len(ranges) > 1:
+            global_min = min(start for start, _ in ranges)
+            global_max = max(end for _, end in ranges)
         for idx in range(len(created_vars), size):
             assert idx == len(created_vars)
             varname = self._varname + "@" + str(idx)
@@ -2851,13 +3217,21 @@ class SymbolicBoundedIntTuple(collections.abc.Sequence):
                 created_vars.append(SymbolicBoundedInt(varname, int, *ranges[0]))
             else:
                 smtval = z3.Int(varname)
-                constraints = [
-                    z3And(minval <= smtval, smtval <= maxval)
-                    for minval, maxval in ranges
-                ]
-                space.add(z3Or(*constraints))
-                global_min = min(start for start, _ in ranges)
-                global_max = max(end for _, end in ranges)
+
+                def build_range_constraint(smtval=smtval):
+                    return z3Or(
+                        *[
+                            z3And(minval <= smtval, smtval <= maxval)
+                            for minval, maxval in ranges
+                        ]
+                    )
+
+                space.add(
+                    space.smt_memo(
+                        ("int_ranges", varname, self._ranges_key),
+                        build_range_constraint,
+                    )
+                )
                 created_vars.append(
                     SymbolicBoundedInt(smtval, int, global_min, global_max)
                 )
@@ -2889,6 +3263,46 @@ class SymbolicBoundedIntTuple(collections.abc.Sequence):
     def __repr__(self):
         return str(tuple(self))
 
+    def _merged_matches(self, value: object) -> Optional[List[z3.ExprRef]]:
+        """
+        Compare `value` against each item without forking on the comparisons.
+
+        Returns None unless state merging is enabled and `value` is an integer.
+        (we still fork on the length, once per item)
+        """
+        with NoTracing():
+            space = context_statespace()
+            if not space.options.state_merging:
+                return None
+            smt_value = _mergeable_smt_value(SymbolicInt, value)
+            if smt_value is None:
+                return None
+            my_len = self._len
+            created_vars = self._created_vars
+            matches = []
+            idx = 0
+            while True:
+                with ResumedTracing():
+                    if not (idx < my_len):
+                        break
+                self._create_up_to(idx + 1)
+                matches.append(created_vars[idx].var == smt_value)
+                idx += 1
+            return matches
+
+    def __contains__(self, value: object) -> bool:
+        matches = self._merged_matches(value)
+        if matches is None:
+            return super().__contains__(value)
+        with NoTracing():
+            return SymbolicBool(z3Or(*matches)) if matches else False
+
+    def count(self, value: object) -> int:
+        matches = self._merged_matches(value)
+        if matches is None:
+            return super().count(value)
+        return merged_count(matches)
+
     def __iter__(self):
         with NoTracing():
             my_len = self._len
@@ -2963,6 +3377,10 @@ class SymbolicBoundedIntTuple(collections.abc.Sequence):
         start: int = _LIST_INDEX_START_DEFAULT,
         stop: int = _LIST_INDEX_STOP_DEFAULT,
     ) -> int:
+        if start is _LIST_INDEX_START_DEFAULT and stop is _LIST_INDEX_STOP_DEFAULT:
+            matches = self._merged_matches(value)
+            if matches is not None:
+                return merged_index(matches)
         try:
             start, stop = start.__index__(), stop.__index__()
         except AttributeError:
@@ -3575,7 +3993,11 @@ class LazyIntSymbolicStr(AnySymbolicStr, CrossHairValue):
             )
 
     def __ch_realize__(self) -> object:
-        codepoints = deep_realize(self._codepoints)
+        codepoints = self._codepoints
+        if isinstance(codepoints, (list, tuple)):
+            codepoints = realize_ints(codepoints)
+        else:
+            codepoints = deep_realize(codepoints)
         return "".join(map(chr, codepoints))
 
     @classmethod
@@ -3786,6 +4208,316 @@ class LazyIntSymbolicStr(AnySymbolicStr, CrossHairValue):
         return self._find(substr, start, end, from_right=True)
 
 
+class SeqBasedSymbolicStr(AnySymbolicStr, SymbolicValue):
+    """
+    A symbolic string backed by the SMT solver's native string theory.
+
+    Operations with direct counterparts in the theory (length, indexing and
+    slicing, equality and ordering, concatenation, containment, prefix/suffix
+    tests, find, partition, single replacement) produce single SMT terms.
+    Everything else falls back to an equivalent `LazyIntSymbolicStr`.
+    """
+
+    def __init__(self, smtvar: Union[str, z3.ExprRef], typ: Type = str):
+        assert typ == str
+        SymbolicValue.__init__(self, smtvar, typ)
+        self._codepoint_str: Optional[LazyIntSymbolicStr] = None
+
+    def __init_var__(self, typ, varname):
+        return z3.String(varname)
+
+    def __ch_realize__(self) -> object:
+        return context_statespace().find_model_value(self.var)
+
+    @classmethod
+    def _smt_str(cls, value: object) -> Optional[z3.SeqRef]:
+        value = typeable_value(value)
+        if isinstance(value, SeqBasedSymbolicStr):
+            return value.var
+        if isinstance(value, str) and not isinstance(value, AnySymbolicStr):
+            return z3StringVal(value)
+        return None
+
+    def _as_codepoints(self) -> LazyIntSymbolicStr:
+        # Build (and remember) a codepoint-based equivalent; this realizes our length.
+        codepoint_str = self._codepoint_str
+        if codepoint_str is None:
+            var = self.var
+            length = realize(SymbolicInt(z3.Length(var)))
+            codepoints = [
+                SymbolicInt(z3.StrToCode(z3.SubString(var, idx, 1)))
+                for idx in range(length)
+            ]
+            codepoint_str = LazyIntSymbolicStr(codepoints)
+            self._codepoint_str = codepoint_str
+        return codepoint_str
+
+    def __hash__(self):
+        return hash(self.__str__())
+
+    def __len__(self):
+        with NoTracing():
+            return SymbolicInt(z3.Length(self.var))
+
+    def __eq__(self, other):
+        with NoTracing():
+            smt_other = SeqBasedSymbolicStr._smt_str(other)
+            if smt_other is not None:
+                return SymbolicBool(self.var == smt_other)
+            if not isinstance(typeable_value(other), AnySymbolicStr):
+                return NotImplemented
+            codepoint_str = self._as_codepoints()
+        return codepoint_str == other
+
+    @staticmethod
+    def _smt_index(value: object) -> Optional[z3.ExprRef]:
+        if isinstance(value, SymbolicInt):
+            return value.var
+        if type(value) is int:
+            return z3.IntVal(value)
+        return None
+
+    def _smt_slice(self, idx: slice) -> Optional["SeqBasedSymbolicStr"]:
+        if idx.step not in (None, 1):
+            return None
+        length = z3.Length(self.var)
+        bounds = []
+        for bound, default in ((idx.start, z3.IntVal(0)), (idx.stop, length)):
+            if bound is None:
+                bounds.append(default)
+                continue
+            smt_bound = SeqBasedSymbolicStr._smt_index(bound)
+            if smt_bound is None:
+                return None
+            # Python clamps out-of-range slice bounds instead of raising:
+            bounds.append(
+                z3.If(
+                    smt_bound < 0,
+                    z3.If(smt_bound + length < 0, 0, smt_bound + length),
+                    smt_min(smt_bound, length),
+                )
+            )
+        start, stop = bounds
+        return SeqBasedSymbolicStr(
+            z3.SubString(self.var, start, z3.If(stop > start, stop - start, 0))
+        )
+
+    def __getitem__(self, i):
+        with NoTracing():
+            if isinstance(i, slice):
+                sliced = self._smt_slice(i)
+                if sliced is not None:
+                    return sliced
+                smt_idx = None
+            else:
+                smt_idx = SeqBasedSymbolicStr._smt_index(i)
+            if smt_idx is None:
+                codepoint_str = self._as_codepoints()
+            else:
+                length = z3.Length(self.var)
+                in_bounds = SymbolicBool(z3.And(-length <= smt_idx, smt_idx < length))
+        if smt_idx is None:
+            return codepoint_str[i]
+        if not in_bounds:
+            raise IndexError("string index out of range")
+        with NoTracing():
+            start = z3.If(smt_idx < 0, smt_idx + length, smt_idx)
+            return SeqBasedSymbolicStr(z3.SubString(self.var, start, 1))
+
+    def __iter__(self):
+        with NoTracing():
+            codepoint_str = self._as_codepoints()
+        return codepoint_str.__iter__()
+
+    def _cmp_op(self, other, op):
+        with NoTracing():
+            smt_other = SeqBasedSymbolicStr._smt_str(other)
+            if smt_other is not None:
+                # The theory orders strings lexicographically by codepoint, as Python does.
+                return SymbolicBool(op(self.var, smt_other))
+            if not isinstance(typeable_value(other), AnySymbolicStr):
+                raise TypeError
+            codepoint_str = self._as_codepoints()
+        return codepoint_str._cmp_op(other, op)
+
+    def __add__(self, other):
+        with NoTracing():
+            smt_other = SeqBasedSymbolicStr._smt_str(other)
+            if smt_other is not None:
+                return SeqBasedSymbolicStr(z3.Concat(self.var, smt_other))
+            if not isinstance(typeable_value(other), AnySymbolicStr):
+                return NotImplemented
+            codepoint_str = self._as_codepoints()
+        return codepoint_str + other
+
+    def __radd__(self, other):
+        with NoTracing():
+            smt_other = SeqBasedSymbolicStr._smt_str(other)
+            if smt_other is not None:
+                return SeqBasedSymbolicStr(z3.Concat(smt_other, self.var))
+            if not isinstance(typeable_value(other), AnySymbolicStr):
+                return NotImplemented
+            codepoint_str = self._as_codepoints()
+        return other + codepoint_str
+
+    def __mul__(self, other):
+        with NoTracing():
+            codepoint_str = self._as_codepoints()
+        return codepoint_str * other
+
+    __rmul__ = __mul__
+
+    def __contains__(self, other):
+        with NoTracing():
+            smt_other = SeqBasedSymbolicStr._smt_str(other)
+            if smt_other is not None:
+                return SymbolicBool(z3.Contains(self.var, smt_other))
+            codepoint_str = self._as_codepoints()
+        return codepoint_str.__contains__(other)
+
+    def startswith(self, substr, start=None, end=None):
+        with NoTracing():
+            smt_substr = SeqBasedSymbolicStr._smt_str(substr)
+            if smt_substr is not None and start is None and end is None:
+                return SymbolicBool(z3.PrefixOf(smt_substr, self.var))
+            codepoint_str = self._as_codepoints()
+        return codepoint_str.startswith(substr, start, end)
+
+    def endswith(self, substr, start=None, end=None):
+        with NoTracing():
+            smt_substr = SeqBasedSymbolicStr._smt_str(substr)
+            if smt_substr is not None and start is None and end is None:
+                return SymbolicBool(z3.SuffixOf(smt_substr, self.var))
+            codepoint_str = self._as_codepoints()
+        return codepoint_str.endswith(substr, start, end)
+
+    @staticmethod
+    def _smt_last_index_of(haystack: z3.SeqRef, needle: z3.SeqRef) -> z3.ArithRef:
+        # z3's own str.last_indexof is unsound in some versions (it can declare
+        # a correct answer to be unsat), so we describe the last match directly:
+        space = context_statespace()
+        idx = z3.Int(f"rfind{space.uniq()}")
+        needle_len = z3.Length(needle)
+        haystack_len = z3.Length(haystack)
+        last_match = z3.And(
+            idx >= 0,
+            idx + needle_len <= haystack_len,
+            z3.SubString(haystack, idx, needle_len) == needle,
+            z3.Implies(
+                idx + 1 + needle_len <= haystack_len,
+                z3.Not(
+                    z3.Contains(z3.SubString(haystack, idx + 1, haystack_len), needle)
+                ),
+            ),
+        )
+        space.add(z3.If(z3.Contains(haystack, needle), last_match, idx == -1))
+        return idx
+
+    def _smt_find(self, substr, start, end, from_right: bool) -> Optional[SymbolicInt]:
+        smt_substr = SeqBasedSymbolicStr._smt_str(substr)
+        if smt_substr is None:
+            return None
+        var = self.var
+        if start is None and end is None:
+            if from_right:
+                return SymbolicInt(self._smt_last_index_of(var, smt_substr))
+            return SymbolicInt(z3.IndexOf(var, smt_substr, 0))
+        length = z3.Length(var)
+        smt_start = z3.IntVal(0) if start is None else self._smt_index(start)
+        smt_end = length if end is None else self._smt_index(end)
+        if smt_start is None or smt_end is None:
+            return None
+        # Adjust the bounds like CPython does; note that `start` is not capped at
+        # the length (the empty string cannot be found past the end).
+        smt_start = z3.If(
+            smt_start < 0,
+            z3.If(smt_start + length < 0, 0, smt_start + length),
+            smt_start,
+        )
+        smt_end = z3.If(
+            smt_end < 0,
+            z3.If(smt_end + length < 0, 0, smt_end + length),
+            smt_min(smt_end, length),
+        )
+        window = z3.SubString(var, smt_start, smt_end - smt_start)
+        if from_right:
+            found = self._smt_last_index_of(window, smt_substr)
+        else:
+            found = z3.IndexOf(window, smt_substr, 0)
+        return SymbolicInt(
+            z3.If(
+                z3.Or(smt_end - smt_start < z3.Length(smt_substr), found < 0),
+                -1,
+                found + smt_start,
+            )
+        )
+
+    def find(self, substr, start=None, end=None):
+        with NoTracing():
+            found = self._smt_find(substr, start, end, from_right=False)
+            if found is not None:
+                return found
+            codepoint_str = self._as_codepoints()
+        return codepoint_str.find(substr, start, end)
+
+    def rfind(self, substr, start=None, end=None):
+        with NoTracing():
+            found = self._smt_find(substr, start, end, from_right=True)
+            if found is not None:
+                return found
+            codepoint_str = self._as_codepoints()
+        return codepoint_str.rfind(substr, start, end)
+
+    def _partition_at(self, idx: "SymbolicInt", sep: str):
+        var = self.var
+        suffix_start = idx.var + z3.Length(SeqBasedSymbolicStr._smt_str(sep))
+        return (
+            SeqBasedSymbolicStr(z3.SubString(var, 0, idx.var)),
+            sep,
+            SeqBasedSymbolicStr(z3.SubString(var, suffix_start, z3.Length(var))),
+        )
+
+    def partition(self, substr):
+        with NoTracing():
+            smt_substr = SeqBasedSymbolicStr._smt_str(substr)
+            if smt_substr is None:
+                codepoint_str = self._as_codepoints()
+        if smt_substr is None:
+            return codepoint_str.partition(substr)
+        if len(substr) == 0:
+            raise ValueError("empty separator")
+        idx = self.find(substr)
+        if idx == -1:
+            return (self, "", "")
+        with NoTracing():
+            return self._partition_at(idx, substr)
+
+    def rpartition(self, substr):
+        with NoTracing():
+            smt_substr = SeqBasedSymbolicStr._smt_str(substr)
+            if smt_substr is None:
+                codepoint_str = self._as_codepoints()
+        if smt_substr is None:
+            return codepoint_str.rpartition(substr)
+        if len(substr) == 0:
+            raise ValueError("empty separator")
+        idx = self.rfind(substr)
+        if idx == -1:
+            return ("", "", self)
+        with NoTracing():
+            return self._partition_at(idx, substr)
+
+    def replace(self, old, new, count=-1):
+        with NoTracing():
+            smt_old = SeqBasedSymbolicStr._smt_str(old)
+            smt_new = SeqBasedSymbolicStr._smt_str(new)
+            # The theory only replaces the first occurrence:
+            if smt_old is not None and smt_new is not None and count == 1:
+                return SeqBasedSymbolicStr(z3.Replace(self.var, smt_old, smt_new))
+            codepoint_str = self._as_codepoints()
+        return codepoint_str.replace(old, new, count)
+
+
 def buffer_to_byte_seq(obj: object) -> Optional[Sequence[int]]:
     if isinstance(obj, (bytes, bytearray)):
         return list(obj)
@@ -4005,7 +4737,7 @@ class SymbolicBytes(BytesLike):
                 return self.__ch_realize__().__add__(realize(other))
         retseq = self.inner + byte_seq
         with NoTracing():
-            return SymbolicBytes(self.inner + byte_seq)
+            return SymbolicBytes(retseq)
 
     def decode(self, encoding="utf-8", errors="strict"):
         return codecs.decode(self, encoding, errors=errors)
@@ -4240,7 +4972,13 @@ def make_union_choice(creator: SymbolicFactory, *pytypes):
     return creator(pytypes[-1])
 
 
-def make_concrete_or_symbolic(typ: type):
+def make_symbolic_str(varname: str, pytype: type) -> AnySymbolicStr:
+    if context_statespace().options.seq_based_strings:
+        return SeqBasedSymbolicStr(varname, pytype)
+    return LazyIntSymbolicStr(varname, pytype)
+
+
+def make_concrete_or_symbolic(typ: Callable[[str, type], object]):
     def make(creator: SymbolicFactory, *type_args):
         nonlocal typ
         space = context_statespace()
@@ -4698,6 +5436,8 @@ def _ord(c: str) -> int:
     with NoTracing():
         if isinstance(c, LazyIntSymbolicStr):
             return c._codepoints[0]
+        if isinstance(c, SeqBasedSymbolicStr):
+            return SymbolicInt(z3.StrToCode(c.var))
     return ord(realize(c))
 
 
@@ -4935,7 +5675,7 @@ def _str_format_map(self, map) -> Union[AnySymbolicStr, str]:
 
 def _str_startswith(self, substr, start=None, end=None) -> bool:
     with NoTracing():
-        if isinstance(self, LazyIntSymbolicStr):
+        if isinstance(self, AnySymbolicStr):
             with ResumedTracing():
                 return self.startswith(substr, start, end)
         elif not isinstance(self, str):
@@ -4958,6 +5698,8 @@ def _str_contains(
             raise TypeError
         if not isinstance(other, AnySymbolicStr):
             return self.__contains__(other)
+        if isinstance(other, SeqBasedSymbolicStr):
+            return SymbolicBool(z3.Contains(z3StringVal(self), other.var))
         len_to_find = realize(other.__len__())
         my_codepoints = [ord(c) for c in self]
         num_options = len(self) + 1 - len_to_find
@@ -5002,7 +5744,7 @@ def make_registrations():
     # register_type(int, make_concrete_or_symbolic(SymbolicInt))
     register_type(int, make_concrete_or_symbolic(SymbolicBoundedInt))
     register_type(float, make_concrete_or_symbolic(make_float))
-    register_type(str, make_concrete_or_symbolic(LazyIntSymbolicStr))
+    register_type(str, make_concrete_or_symbolic(make_symbolic_str))
     register_type(list, make_concrete_or_symbolic(SymbolicList))
     register_type(dict, make_dictionary)
     register_type(range, make_range)
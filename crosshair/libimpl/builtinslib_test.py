@@ -41,6 +41,7 @@ import z3  # type: ignore
 
 from crosshair import type_repo
 from crosshair.core import (
+    LazyCreationRepr,
     analyze_function,
     deep_realize,
     proxy_for_type,
@@ -54,8 +55,11 @@ from crosshair.libimpl.builtinslib import (
     ModelingDirector,
     PreciseIeeeSymbolicFloat,
     RealBasedSymbolicFloat,
+    SeqBasedSymbolicStr,
     SymbolicArrayBasedUniformTuple,
     SymbolicBool,
+    SymbolicBoundedInt,
+    SymbolicBoundedIntTuple,
     SymbolicByteArray,
     SymbolicBytes,
     SymbolicInt,
@@ -65,7 +69,7 @@ from crosshair.libimpl.builtinslib import (
     SymbolicType,
     crosshair_types_for_python_type,
 )
-from crosshair.options import AnalysisOptionSet
+from crosshair.options import DEFAULT_OPTIONS, AnalysisOptionSet
 from crosshair.statespace import (
     CANNOT_CONFIRM,
     CONFIRMED,
@@ -468,6 +472,33 @@ def test_int_bitwise_ok() -> None:
     check_states(f, CONFIRMED)
 
 
+@pytest.mark.parametrize("op", [operator.and_, operator.or_, operator.xor])
+@pytest.mark.parametrize("a,b", [(5, 3), (0, 255), (-3, 6), (-8, -1), (7, -5)])
+def test_int_bitwise_with_bitvectors(op, a, b) -> None:
+    with standalone_statespace as space:
+        space.options = DEFAULT_OPTIONS.overlay(bounded_int_bitvectors=True)
+        with NoTracing():
+            x = SymbolicBoundedInt("x", int, -8, 255)
+            y = SymbolicBoundedInt("y", int, -8, 7)
+        ret = op(x, y)
+        with NoTracing():
+            assert isinstance(ret, SymbolicInt)  # (not realized)
+        space.add(x == a)
+        space.add(y == min(b, 7))
+        assert realize(ret) == op(a, min(b, 7))
+
+
+def test_bytes_bitwise_with_bitvectors_fail() -> None:
+    def f(b: bytes) -> int:
+        """
+        pre: len(b) == 2
+        post: _ != 0x5A
+        """
+        return b[0] ^ b[1]
+
+    check_states(f, POST_FAIL, AnalysisOptionSet(bounded_int_bitvectors=True))
+
+
 @pytest.mark.demo
 def test_int___truediv___method() -> None:
     def f(a: int, b: int) -> float:
@@ -1463,6 +1494,47 @@ def test_str_deep_realize():
     assert realized[0] is realized[1][0]
 
 
+def test_str_realize_uses_one_node_for_all_characters() -> None:
+    with standalone_statespace as space:
+        s = proxy_for_type(str, "s")
+        space.add(len(s) == 50)
+        with NoTracing():
+            nodes_before = len(space.choices_made)
+            realized = realize(s)
+            # One node for the length, and one for all of the characters:
+            assert len(space.choices_made) - nodes_before == 2
+    assert type(realized) is str
+    assert len(realized) == 50
+
+
+def test_seq_based_str_fail() -> None:
+    def f(s: str) -> str:
+        """
+        pre: len(s) < 8
+        post: _ != "b"
+        """
+        if "=" in s and s < "z":
+            return s.partition("=")[2]
+        return s[1:]
+
+    check_states(f, POST_FAIL, AnalysisOptionSet(seq_based_strings=True))
+
+
+def test_seq_based_str_realize() -> None:
+    with standalone_statespace as space:
+        space.options = DEFAULT_OPTIONS.overlay(seq_based_strings=True)
+        s = proxy_for_type(str, "s")
+        with NoTracing():
+            assert isinstance(s, SeqBasedSymbolicStr)
+        space.add(s.startswith("\\u{41}"))
+        space.add(s[-1] == "\U0001f600")
+        space.add(len(s) == 7)
+        realized = realize(s)
+    assert realized.startswith("\\u{41}")
+    assert realized[-1] == "\U0001f600"
+    assert len(realized) == 7
+
+
 def test_str_strip():
     with standalone_statespace:
         with NoTracing():
@@ -2022,6 +2094,52 @@ def test_list_count_ok() -> None:
     check_states(f, CONFIRMED)
 
 
+def test_list_count_with_state_merging() -> None:
+    def f(ls: List[int]) -> int:
+        """
+        pre: len(ls) <= 4
+        post: _ != 3
+        """
+        return ls.count(7)
+
+    check_states(f, POST_FAIL, AnalysisOptionSet(state_merging=True))
+
+
+def test_list_index_with_state_merging() -> None:
+    def f(ls: List[int], n: int) -> int:
+        """
+        pre: len(ls) == 3
+        post: _ != 2
+        """
+        return ls.index(n)
+
+    check_states(f, POST_FAIL, AnalysisOptionSet(state_merging=True))
+
+
+def test_list_eq_with_state_merging() -> None:
+    def f(ls: List[int]) -> bool:
+        """
+        post: _ == (ls[:2] == [1, 2] and len(ls) == 2)
+        """
+        return ls == [1, 2]
+
+    check_states(f, CONFIRMED, AnalysisOptionSet(state_merging=True))
+
+
+def test_bounded_int_tuple_contains_with_state_merging() -> None:
+    with standalone_statespace as space:
+        space.options = DEFAULT_OPTIONS.overlay(state_merging=True)
+        with NoTracing():
+            ints = SymbolicBoundedIntTuple([(0, 255)], "ints")
+            space.add(ints._len.var == 3)
+        has_zero = ints.__contains__(0)
+        with NoTracing():
+            assert isinstance(has_zero, SymbolicBool)
+            assert space.is_possible(has_zero.var)
+            assert space.is_possible(z3.Not(has_zero.var))
+        assert ints.count(0) <= 3
+
+
 @pytest.mark.smoke
 def test_list___setitem___ok() -> None:
     def f(ls: List[int]) -> None:
@@ -2171,6 +2289,26 @@ def test_dict___bool___ok() -> None:
     check_states(f, CONFIRMED)
 
 
+def test_dict_consistency_check_waits_for_observation(space) -> None:
+    d = proxy_for_type(Dict[int, int], "d")
+    (_, _, is_observed) = space._deferred_assumptions[-1]
+    assert not is_observed()
+    with ResumedTracing():
+        len(d)
+    assert is_observed()
+
+
+def test_unobserved_dict_is_consistent_when_realized_after_detach(space) -> None:
+    d = proxy_for_type(Dict[int, int], "d")
+    with ResumedTracing():
+        space.detach_path()
+    assert space._skipped_assumptions
+    realized = space.extra(LazyCreationRepr).deep_realize(d)
+    assert not space._skipped_assumptions
+    assert type(realized) is dict
+    assert not space.is_possible(d._inner._len() != len(realized))
+
+
 def test_dict___iter___fail() -> None:
     def f(a: Dict[int, str]) -> List[int]:
         """
@@ -2194,6 +2332,67 @@ def test_dict___iter___ok() -> None:
     check_states(f, CONFIRMED)
 
 
+def test_dict___iter___finds_specific_keys() -> None:
+    def f(a: Dict[int, int]) -> List[int]:
+        """
+        post: _ != [2, 7]
+        """
+        return sorted(a)
+
+    check_states(f, POST_FAIL)
+
+
+def test_dict___iter___with_early_break() -> None:
+    def f(a: Dict[int, int]) -> int:
+        """
+        post: _ != 4
+        """
+        for k in a:
+            if k > 0:
+                return k
+        return 0
+
+    check_states(f, POST_FAIL)
+
+
+def test_dict___iter___repeats_the_same_keys(space) -> None:
+    d = proxy_for_type(Dict[int, int], "d")
+    space.add(d._inner.var[1] == 2)
+    with ResumedTracing():
+        for _ in d:
+            break
+    num_decisions = len(space.choices_made)
+    with ResumedTracing():
+        first, second = [k for k in d], [k for k in d]
+    assert len(space.choices_made) == num_decisions
+    assert len(first) == 2
+    assert [k.var for k in first] == [k.var for k in second]
+
+
+def test_dict___iter___on_shallow_copy(space) -> None:
+    d = proxy_for_type(Dict[int, int], "d")
+    space.add(d._inner.var[1] == 2)
+    with ResumedTracing():
+        keys = [k for k in d]
+    num_decisions = len(space.choices_made)
+    dcopy = copy.copy(d._inner)
+    with ResumedTracing():
+        copy_keys = [k for k in dcopy]
+    assert len(space.choices_made) == num_decisions
+    assert [k.var for k in copy_keys] == [k.var for k in keys]
+
+
+def test_dict___iter___empty(space) -> None:
+    d = proxy_for_type(Dict[int, int], "d")
+    space.add(d._inner.var[1] == 0)
+    with ResumedTracing():
+        assert [k for k in d] == []
+    num_decisions = len(space.choices_made)
+    with ResumedTracing():
+        assert [k for k in d] == []
+    assert len(space.choices_made) == num_decisions
+
+
 def test_dict___or___method():
     with standalone_statespace as space:
         d = proxy_for_type(Dict[int, int], "d")
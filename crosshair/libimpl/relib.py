@@ -2,7 +2,6 @@ import operator
 import re
 import sys
 from array import array
-from unicodedata import category
 
 if sys.version_info < (3, 11):
     import sre_parse as re_parser
@@ -86,16 +85,12 @@ _CASEABLE_CHARS = None
 def caseable_chars():
     global _CASEABLE_CHARS
     if _CASEABLE_CHARS is None:
-        codepoints = []
-        for i in range(sys.maxunicode + 1):
-            ch = chr(i)
-            # Exclude the (large) "Other Letter" group that doesn't caseswap:
-            if category(ch) in ("Lo"):
-                assert ch.casefold() == ch
-            else:
-                codepoints.append(ch)
-
-        _CASEABLE_CHARS = "".join(codepoints)
+        # Exclude the (large) "Other Letter" group that doesn't caseswap:
+        caseable = get_unicode_categories()["Lo"].invert()
+        _CASEABLE_CHARS = "".join(
+            "".join(map(chr, range(minimum, maximum)))
+            for minimum, maximum in caseable.all_bounds()
+        )
     return _CASEABLE_CHARS
 
 
@@ -33,10 +33,11 @@ from crosshair.core_and_libs import (
     AnalysisMessage,
     MessageType,
     analyze_any,
-    installed_plugins,
+    plugin_entries,
     run_checkables,
 )
 from crosshair.diff_behavior import ExceptionEquivalenceType, diff_behavior
+from crosshair.disk_cache import CACHE_DIR_ENV_VAR, set_cache_dir
 from crosshair.fnutil import (
     FUNCTIONINFO_DESCRIPTOR_TYPES,
     FunctionInfo,
@@ -48,6 +49,7 @@ from crosshair.options import (
     AnalysisKind,
     AnalysisOptions,
     AnalysisOptionSet,
+    PathingOracleKind,
     option_set_from_dict,
 )
 from crosshair.path_cover import (
@@ -392,6 +394,106 @@ def command_line_parser() -> argparse.ArgumentParser:
             metavar="FLOAT",
             help="Maximum seconds to spend checking execution paths for one condition",
         )
+        subparser.add_argument(
+            "--pathing_oracle",
+            type=PathingOracleKind,
+            choices=PathingOracleKind.__members__.values(),
+            metavar="ORACLE",
+            help=textwrap.dedent(
+                """\
+            Strategy for choosing which branch to explore at each decision.
+                coverage : [default] Bias for code locations that have been
+                           visited rarely.
+                bandit   : Treat each branch as a multi-armed bandit, preferring
+                           branches that recently led to new coverage,
+                           exceptions, or postcondition failures.
+            """
+            ),
+        )
+        subparser.add_argument(
+            "--unsat_core_pruning",
+            action="store_true",
+            default=None,
+            help=textwrap.dedent(
+                """\
+            When a branch is found to be infeasible, remember the (minimal) set
+            of path constraints that made it so, and skip the solver on later
+            paths that share those constraints.
+            """
+            ),
+        )
+        subparser.add_argument(
+            "--state_merging",
+            action="store_true",
+            default=None,
+            help=textwrap.dedent(
+                """\
+            Where CrossHair's own implementations scan symbolic containers
+            (e.g. `list.count`, `list.index`, `in`, and `==`), combine the
+            per-item outcomes into one symbolic value instead of forking a
+            new path for each item.
+            """
+            ),
+        )
+        subparser.add_argument(
+            "--model_guided_fanout",
+            action="store_true",
+            default=None,
+            help=textwrap.dedent(
+                """\
+            Make many-way decisions (like choosing among subclasses) with a
+            single solver query, rather than a binary search of two-way forks.
+            """
+            ),
+        )
+        subparser.add_argument(
+            "--adaptive_timeouts",
+            action="store_true",
+            default=None,
+            help=textwrap.dedent(
+                """\
+            Derive path and solver timeouts from the costs of previously
+            explored paths, instead of using fixed values.
+            The derived timeouts never exceed the configured ones.
+            Paths that reach new depths are given extra time, up to that limit.
+            """
+            ),
+        )
+        subparser.add_argument(
+            "--bounded_int_bitvectors",
+            action="store_true",
+            default=None,
+            help=textwrap.dedent(
+                """\
+            Solve bitwise operations (`&`, `|`, `^`) over integers with known
+            bounds (like bytes and string codepoints) as fixed-width
+            bit-vectors, rather than realizing them.
+            """
+            ),
+        )
+        subparser.add_argument(
+            "--seq_based_strings",
+            action="store_true",
+            default=None,
+            help=textwrap.dedent(
+                """\
+            Model symbolic strings with the solver's native string theory,
+            rather than as sequences of symbolic codepoints.
+            Operations that the theory lacks still use codepoints.
+            """
+            ),
+        )
+        subparser.add_argument(
+            "--lazy_arguments",
+            action="store_true",
+            default=None,
+            help=textwrap.dedent(
+                """\
+            Create the symbolic value for each argument only when it is first used.
+            Arguments that a path never touches then add nothing to the solver.
+            """
+            ),
+        )
     lsp_server_parser = subparsers.add_parser(
         "server",
         help="Start a server, speaking the Language Server Protocol",
@@ -423,6 +525,31 @@ def command_line_parser() -> argparse.ArgumentParser:
             """
             ),
         )
+        subparser.add_argument(
+            "--combined_postconditions",
+            action="store_true",
+            default=None,
+            help=textwrap.dedent(
+                """\
+            Check all postconditions of a function in a single exploration,
+            rather than exploring the function once per postcondition.
+            Postconditions that fail are reported and dropped, and the
+            remaining ones are re-checked.
+            """
+            ),
+        )
+        subparser.add_argument(
+            "--cache_dir",
+            type=str,
+            metavar="DIR",
+            help=textwrap.dedent(
+                f"""\
+            Directory for caching information derived from source files (like
+            parsed contracts), so that later runs can reuse it.
+            (overrides the {CACHE_DIR_ENV_VAR} environment variable)
+            """
+            ),
+        )
     return parser
 
 
@@ -893,9 +1020,11 @@ def unwalled_main(cmd_args: Union[List[str], argparse.Namespace]) -> int:
         parser.print_help(sys.stderr)
         return 2
     set_debug(args.verbose)
+    if getattr(args, "cache_dir", None) is not None:
+        set_cache_dir(args.cache_dir)
     if in_debug():
         debug(env_info())
-        debug("Installed plugins:", installed_plugins)
+        debug("Installed plugins:", [entry.name for entry in plugin_entries()])
     options = option_set_from_dict(args.__dict__)
     # fall back to current directory to look up modules
     path_additions = [""] if sys.path and sys.path[0] != "" else []
@@ -8,6 +8,7 @@ from os.path import join, split
 
 import pytest
 
+from crosshair.disk_cache import CACHE_DIR_ENV_VAR, set_cache_dir
 from crosshair.fnutil import NotFound
 from crosshair.main import (
     DEFAULT_OPTIONS,
@@ -223,6 +224,20 @@ def test_check_failure_via_main(root):
         sys.stdout = sys.__stdout__
 
 
+def test_check_with_cache_dir_via_main(root, monkeypatch):
+    simplefs(root, SIMPLE_FOO)
+    cache_dir = root / "cache"
+    monkeypatch.delenv(CACHE_DIR_ENV_VAR, raising=False)
+    try:
+        sys.stdout = io.StringIO()
+        args = ["check", "--cache_dir", str(cache_dir), str(root / "foo.py")]
+        assert unwalled_main(args) == 1
+    finally:
+        sys.stdout = sys.__stdout__
+        set_cache_dir(None)
+    assert (cache_dir / "docsections").is_dir()
+
+
 def test_check_ok_via_main(root):
     # contract is assert-based, but we do not analyze that type.
     simplefs(root, ASSERT_BASED_FOO)
@@ -17,6 +17,14 @@ class AnalysisKind(enum.Enum):
         return f"AnalysisKind.{self.name}"
 
 
+class PathingOracleKind(enum.Enum):
+    coverage = "coverage"
+    bandit = "bandit"
+
+    def __repr__(self):
+        return f"PathingOracleKind.{self.name}"
+
+
 def _parse_analysis_kind(argstr: str) -> Sequence[AnalysisKind]:
     try:
         return [AnalysisKind[part.strip()] for part in argstr.split(",")]
@@ -52,6 +60,15 @@ class AnalysisOptionSet:
     report_verbose: Optional[bool] = None
     timeout: Optional[float] = None
     max_uninteresting_iterations: Optional[int] = None
+    pathing_oracle: Optional[PathingOracleKind] = None
+    unsat_core_pruning: Optional[bool] = None
+    state_merging: Optional[bool] = None
+    model_guided_fanout: Optional[bool] = None
+    adaptive_timeouts: Optional[bool] = None
+    bounded_int_bitvectors: Optional[bool] = None
+    seq_based_strings: Optional[bool] = None
+    lazy_arguments: Optional[bool] = None
+    combined_postconditions: Optional[bool] = None
 
     # TODO: move stats out of options
     stats: Optional[collections.Counter] = None
@@ -66,6 +83,15 @@ class AnalysisOptionSet:
             "per_condition_timeout",
             "per_path_timeout",
             "max_uninteresting_iterations",
+            "pathing_oracle",
+            "unsat_core_pruning",
+            "state_merging",
+            "model_guided_fanout",
+            "adaptive_timeouts",
+            "bounded_int_bitvectors",
+            "seq_based_strings",
+            "lazy_arguments",
+            "combined_postconditions",
         }
     )
 
@@ -104,6 +130,15 @@ def option_set_from_dict(source: Mapping[str, object]) -> AnalysisOptionSet:
         "per_path_timeout",
         "per_condition_timeout",
         "max_uninteresting_iterations",
+        "pathing_oracle",
+        "unsat_core_pruning",
+        "state_merging",
+        "model_guided_fanout",
+        "adaptive_timeouts",
+        "bounded_int_bitvectors",
+        "seq_based_strings",
+        "lazy_arguments",
+        "combined_postconditions",
         "report_all",
         "report_verbose",
     ):
@@ -127,6 +162,15 @@ class AnalysisOptions:
     timeout: float
     per_path_timeout: float
     max_uninteresting_iterations: int
+    pathing_oracle: PathingOracleKind
+    unsat_core_pruning: bool
+    state_merging: bool
+    model_guided_fanout: bool
+    adaptive_timeouts: bool
+    bounded_int_bitvectors: bool
+    seq_based_strings: bool
+    lazy_arguments: bool
+    combined_postconditions: bool
 
     # Transient members (not user-configurable):
     deadline: float = float("NaN")
@@ -215,4 +259,13 @@ DEFAULT_OPTIONS = AnalysisOptions(
     timeout=float("inf"),
     per_path_timeout=float("NaN"),
     max_uninteresting_iterations=sys.maxsize,
+    pathing_oracle=PathingOracleKind.coverage,
+    unsat_core_pruning=False,
+    state_merging=False,
+    model_guided_fanout=False,
+    adaptive_timeouts=False,
+    bounded_int_bitvectors=False,
+    seq_based_strings=False,
+    lazy_arguments=False,
+    combined_postconditions=False,
 )
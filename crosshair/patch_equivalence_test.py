@@ -9,7 +9,7 @@ from typing import Callable, List, Mapping, Optional, Sequence, Tuple
 import pytest  # type: ignore
 
 from crosshair.core import _PATCH_REGISTRATIONS
-from crosshair.core_and_libs import standalone_statespace
+from crosshair.core_and_libs import ensure_registrations, standalone_statespace
 from crosshair.test_util import ExecutionResult, summarize_execution
 from crosshair.util import ch_stack, debug
 
@@ -49,6 +49,7 @@ untested_patches = {
     itertools.groupby,  # the return value has nested iterators that break comparisons
 }
 
+ensure_registrations()  # (registrations are otherwise made on first use)
 comparisons: List[Tuple[Callable, Callable]] = []
 for native_fn, patched_fn in _PATCH_REGISTRATIONS.items():
     if native_fn in untested_patches:
@@ -61,7 +61,7 @@ def path_cover(
         # Usually we don't want to run decorator code. (and we certainly don't want
         # to measure coverage on the decorator rather than the real body) Unwrap:
         fn = fn.__wrapped__  # type: ignore
-    search_root = RootNode()
+    search_root = RootNode(options)
 
     paths: List[PathSummary] = []
     coverage: CoverageTracingModule = CoverageTracingModule(fn)
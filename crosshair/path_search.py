@@ -80,7 +80,7 @@ def path_search(
         optimize_fn = shrinkscore
 
     fn, sig = ctxfn.callable()
-    search_root = RootNode()
+    search_root = RootNode(options)
 
     best_input: Optional[str] = None
     best_score: Optional[int] = None
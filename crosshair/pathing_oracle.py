@@ -1,12 +1,15 @@
 import math
 from collections import defaultdict
-from typing import Counter, Dict, List, Optional, Sequence, Tuple
+from typing import Counter, Dict, List, Optional, Sequence, Set, Tuple
 
 from z3 import ExprRef  # type: ignore
 
+from crosshair.options import PathingOracleKind
 from crosshair.statespace import (
     AbstractPathingOracle,
+    CallAnalysis,
     DetachedPathNode,
+    MessageType,
     ModelValueNode,
     NodeLike,
     RootNode,
@@ -114,7 +117,11 @@ class CoveragePathingOracle(AbstractPathingOracle):
         id_id[myid] = myid
         return myid
 
-    def post_path_hook(self, path: Sequence[SearchTreeNode]) -> None:
+    def post_path_hook(
+        self,
+        path: Sequence[SearchTreeNode],
+        analysis: Optional[CallAnalysis] = None,
+    ) -> None:
         leading_locs = []
         leading_conditions: List[int] = []
         for step, node in enumerate(path[:-1]):
@@ -216,6 +223,116 @@ class PreferNegativeOracle(AbstractPathingOracle):
         return 0.25
 
 
+class BanditArm:
+    __slots__ = ["pulls", "rewards"]
+    pulls: int
+    rewards: int
+
+    def __init__(self):
+        self.pulls = 0
+        self.rewards = 0
+
+
+class BanditPathingOracle(AbstractPathingOracle):
+    """
+    Treats each branch as a two-armed bandit, using Thompson sampling.
+
+    Each code location has one arm per branch polarity.
+    When a path completes, every arm pulled along that path is rewarded if the
+    path was interesting: it reached a new code location, or it produced a
+    message (an exception or postcondition failure) that we hadn't seen before.
+
+    When deciding, we draw from each arm's Beta posterior and take the arm with
+    the larger draw.
+    Branches that we have no statistics for fall back to the engine's
+    suggested probability.
+    """
+
+    def __init__(self):
+        self.visits = Counter[CodeLoc]()
+        self.iters_since_discovery = 0
+        self.arms: Dict[Tuple[CodeLoc, bool], BanditArm] = {}
+        self.known_messages: Set[Tuple[MessageType, str, int]] = set()
+
+    def post_path_hook(
+        self,
+        path: Sequence[SearchTreeNode],
+        analysis: Optional[CallAnalysis] = None,
+    ) -> None:
+        locs = []
+        pulled: Dict[Tuple[CodeLoc, bool], None] = {}
+        for step, node in enumerate(path[:-1]):
+            if not isinstance(node, WorstResultNode):
+                continue
+            key = node.stacktail
+            locs.append(key)
+            next_node = path[step + 1]
+            if isinstance(next_node, DetachedPathNode):
+                break
+            if isinstance(node, ModelValueNode) or node.forced_path is not None:
+                continue
+            if next_node is node.positive:
+                pulled[(key, True)] = None
+            elif next_node is node.negative:
+                pulled[(key, False)] = None
+            else:
+                raise CrossHairInternal(
+                    f"{type(path[step])} was followed by {type(path[step+1])}"
+                )
+
+        visits = self.visits
+        prev_len = len(visits)
+        visits += Counter(locs)
+        interesting = len(visits) > prev_len
+        if analysis is not None:
+            known_messages = self.known_messages
+            for message in analysis.messages:
+                signature = (message.state, message.filename, message.line)
+                if signature not in known_messages:
+                    known_messages.add(signature)
+                    interesting = True
+        if interesting:
+            self.iters_since_discovery = 0
+        else:
+            self.iters_since_discovery += 1
+
+        arms = self.arms
+        for arm_key in pulled:
+            arm = arms.get(arm_key)
+            if arm is None:
+                arm = arms[arm_key] = BanditArm()
+            arm.pulls += 1
+            if interesting:
+                arm.rewards += 1
+
+    def decide(
+        self,
+        root: RootNode,
+        node: "WorstResultNode",
+        engine_probability: Optional[float],
+    ) -> float:
+        if engine_probability in (0.0, 1.0):
+            return engine_probability
+        arms = self.arms
+        key = node.stacktail
+        pos_arm = arms.get((key, True))
+        neg_arm = arms.get((key, False))
+        if pos_arm is None and neg_arm is None:
+            return 0.25 if engine_probability is None else engine_probability
+        rand = root._random
+        pos_draw = (
+            rand.betavariate(1 + pos_arm.rewards, 1 + pos_arm.pulls - pos_arm.rewards)
+            if pos_arm
+            else rand.random()
+        )
+        neg_draw = (
+            rand.betavariate(1 + neg_arm.rewards, 1 + neg_arm.pulls - neg_arm.rewards)
+            if neg_arm
+            else rand.random()
+        )
+        return 1.0 if pos_draw > neg_draw else 0.0
+
+
 class ConstrainedOracle(AbstractPathingOracle):
     """
     A pathing oracle that prefers to take a path that satisfies
@@ -234,8 +351,12 @@ class ConstrainedOracle(AbstractPathingOracle):
         self.exprs = []
         self.inner_oracle.pre_path_hook(space)
 
-    def post_path_hook(self, path: Sequence["SearchTreeNode"]) -> None:
-        self.inner_oracle.post_path_hook(path)
+    def post_path_hook(
+        self,
+        path: Sequence["SearchTreeNode"],
+        analysis: Optional[CallAnalysis] = None,
+    ) -> None:
+        self.inner_oracle.post_path_hook(path, analysis)
 
     def decide(
         self, root, node: "WorstResultNode", engine_probability: Optional[float]
@@ -261,11 +382,21 @@ class RotatingOracle(AbstractPathingOracle):
         for oracle in oracles:
             oracle.pre_path_hook(space)
 
-    def post_path_hook(self, path: Sequence["SearchTreeNode"]) -> None:
+    def post_path_hook(
+        self,
+        path: Sequence["SearchTreeNode"],
+        analysis: Optional[CallAnalysis] = None,
+    ) -> None:
         for oracle in self.oracles:
-            oracle.post_path_hook(path)
+            oracle.post_path_hook(path, analysis)
 
     def decide(
         self, root, node: "WorstResultNode", engine_probability: Optional[float]
     ) -> float:
         return self.oracles[self.index].decide(root, node, engine_probability)
+
+
+def make_pathing_oracle(kind: PathingOracleKind) -> AbstractPathingOracle:
+    if kind == PathingOracleKind.bandit:
+        return BanditPathingOracle()
+    return CoveragePathingOracle()
@@ -2,8 +2,24 @@ import random
 
 import z3  # type: ignore
 
-from crosshair.pathing_oracle import ConstrainedOracle, PreferNegativeOracle
-from crosshair.statespace import RootNode, SimpleStateSpace, WorstResultNode
+from crosshair.options import AnalysisOptionSet, PathingOracleKind
+from crosshair.pathing_oracle import (
+    BanditArm,
+    BanditPathingOracle,
+    ConstrainedOracle,
+    CoveragePathingOracle,
+    PreferNegativeOracle,
+)
+from crosshair.statespace import (
+    AnalysisMessage,
+    CallAnalysis,
+    MessageType,
+    ModelAssignmentNode,
+    RootNode,
+    SimpleStateSpace,
+    WorstResultNode,
+)
+from crosshair.test_util import check_states
 
 
 def test_constrained_oracle():
@@ -19,3 +35,79 @@ def test_constrained_oracle():
     assert (
         oracle.decide(root, WorstResultNode(rand, x == 7, space.solver), None) == 0.25
     )
+
+
+def test_bandit_oracle_decide():
+    oracle = BanditPathingOracle()
+    x = z3.Int("x")
+    root = RootNode()
+    space = SimpleStateSpace()
+    node = WorstResultNode(random.Random(), x < 7, space.solver)
+    node.stacktail = ("somefile.py:42",)
+    # Without statistics, we defer to the engine:
+    assert oracle.decide(root, node, None) == 0.25
+    assert oracle.decide(root, node, 0.6) == 0.6
+    assert oracle.decide(root, node, 0.0) == 0.0
+    rewarding_arm, unrewarding_arm = BanditArm(), BanditArm()
+    rewarding_arm.pulls = rewarding_arm.rewards = 50
+    unrewarding_arm.pulls = 50
+    oracle.arms[(node.stacktail, False)] = rewarding_arm
+    oracle.arms[(node.stacktail, True)] = unrewarding_arm
+    assert oracle.decide(root, node, None) == 0.0
+
+
+def _rewarded_decisions(rewarded_branch: bool) -> int:
+    oracle = BanditPathingOracle()
+    x = z3.Int("x")
+    root = RootNode()
+    root._random = random.Random(42)
+    space = SimpleStateSpace()
+    node = WorstResultNode(random.Random(), x < 7, space.solver)
+    node.stacktail = ("somefile.py:42",)
+    for line in range(20):
+        took_branch = bool(line % 2)
+        next_node = node.positive if took_branch else node.negative
+        messages = []
+        if took_branch == rewarded_branch:
+            # Each rewarded path finds a new failure:
+            messages.append(
+                AnalysisMessage(MessageType.EXEC_ERR, "", "somefile.py", line, 0, "")
+            )
+        oracle.post_path_hook([node, next_node], CallAnalysis(messages=messages))
+    return sum(oracle.decide(root, node, None) == 1.0 for _ in range(100))
+
+
+def test_bandit_oracle_steers_toward_rewarded_branch():
+    # With the same engine input and seed, only the arm statistics differ:
+    assert _rewarded_decisions(rewarded_branch=True) > 90
+    assert _rewarded_decisions(rewarded_branch=False) < 10
+
+
+def test_bandit_oracle_finds_failure():
+    def f(x: int, y: int) -> int:
+        """post: _ != 15"""
+        if x > 10:
+            if y < 0:
+                return x - y
+        return 0
+
+    check_states(
+        f,
+        MessageType.POST_FAIL,
+        AnalysisOptionSet(pathing_oracle=PathingOracleKind.bandit),
+    )
+
+
+def test_batched_realizations_are_not_branch_positions():
+    coverage_oracle, bandit_oracle = CoveragePathingOracle(), BanditPathingOracle()
+    space = SimpleStateSpace()
+    x, y = z3.Ints("x y")
+    space.smt_fork(x > 0)
+    space.find_model_values([x, y])
+    space.smt_fork(y > 0)
+    assert isinstance(space.choices_made[1], ModelAssignmentNode)
+    for oracle in (coverage_oracle, bandit_oracle):
+        oracle.post_path_hook(space.choices_made, CallAnalysis())
+    fork_position = space.choices_made[0].stacktail
+    assert list(coverage_oracle.summarized_positions) == [fork_position]
+    assert {position for (position, _) in bandit_oracle.arms} == {fork_position}
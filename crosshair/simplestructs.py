@@ -10,6 +10,7 @@ from typing import (
     Any,
     Callable,
     Iterable,
+    List,
     Mapping,
     MutableMapping,
     MutableSequence,
@@ -30,6 +31,15 @@ from crosshair.util import (
     name_of_type,
 )
 
+# Values of these (exact) types can be looked up by hash without changing the
+# semantics of a linear search:
+_CONCRETE_KEY_TYPES = frozenset([type(None), bool, int, float, str, bytes])
+
+
+def _is_concrete_key(value: object) -> bool:
+    with NoTracing():
+        return type(value) in _CONCRETE_KEY_TYPES
+
 
 class MapBase(collections.abc.MutableMapping):
     def __eq__(self, other):
@@ -91,7 +101,8 @@ _MISSING = object()
 class SimpleDict(MapBase):
     """
     A pure Python implementation of a dictionary.
-    Intentionally does no hashing (linear searches).
+    Intentionally does not hash symbolic keys (linear searches).
+    Concrete keys in concrete contents are indexed in a real dictionary.
 
     #inv: set(self.keys()) == set(dict(self.items()).keys())
 
@@ -118,15 +129,56 @@ class SimpleDict(MapBase):
         ``contents`` is assumed to not have duplicate keys.
         """
         self.contents_ = contents
+        # Lazily built (when contents_ is a concrete list); the positions of
+        # concrete keys, and the positions of all other keys:
+        self._index: Optional[Tuple[dict, List[int]]] = None
 
-    def __getitem__(self, key, default=_MISSING):
-        if not is_hashable(key):
-            raise TypeError("unhashable type")
-        for k, v in self.contents_:
+    def _get_index(self) -> Optional[Tuple[dict, List[int]]]:
+        with NoTracing():
+            if self._index is None and type(self.contents_) is list:
+                concrete_positions = {}
+                other_positions = []
+                for i, (k, _) in enumerate(self.contents_):
+                    if type(k) in _CONCRETE_KEY_TYPES:
+                        concrete_positions[k] = i
+                    else:
+                        other_positions.append(i)
+                self._index = (concrete_positions, other_positions)
+            return self._index
+
+    def _find(self, key) -> int:
+        """Get the position of `key` in contents_, or -1 if it is not present."""
+        index = self._get_index()
+        if index is None:
+            candidates: Iterable[int] = range(len(self.contents_))
+        else:
+            concrete_positions, other_positions = index
+            if _is_concrete_key(key):
+                # Identical in meaning to a linear search, as long as our (unique)
+                # symbolic keys do not equal the concrete key we find.
+                # (the lookup is not traced, because dict.get is itself patched)
+                with NoTracing():
+                    found = concrete_positions.get(key, -1)
+                if found != -1:
+                    return found
+            else:
+                other_positions = range(len(self.contents_))  # type: ignore
+            candidates = other_positions
+        contents = self.contents_
+        for i in candidates:
+            k = contents[i][0]
             # Note that the identity check below is not just an optimization;
             # it is required to implement the semantics of NaN dict keys
             if k is key or k == key:
-                return v
+                return i
+        return -1
+
+    def __getitem__(self, key, default=_MISSING):
+        if not is_hashable(key):
+            raise TypeError("unhashable type")
+        i = self._find(key)
+        if i != -1:
+            return self.contents_[i][1]
         if default is _MISSING:
             raise KeyError
         return default
@@ -134,20 +186,26 @@ class SimpleDict(MapBase):
     def __setitem__(self, key, value):
         if not is_hashable(key):
             raise TypeError("unhashable type")
-        for i, (k, v) in enumerate(self.contents_):
-            if k == key:
-                self.contents_[i] = (k, value)
-                return
+        i = self._find(key)
+        if i != -1:
+            self.contents_[i] = (self.contents_[i][0], value)
+            return
         self.contents_.append((key, value))
+        index = self._index
+        if index is not None:
+            if _is_concrete_key(key):
+                index[0][key] = len(self.contents_) - 1
+            else:
+                index[1].append(len(self.contents_) - 1)
 
     def __delitem__(self, key):
         if not is_hashable(key):
             raise TypeError("unhashable type")
-        for i, (k, v) in enumerate(self.contents_):
-            if k == key:
-                del self.contents_[i]
-                return
-        raise KeyError
+        i = self._find(key)
+        if i == -1:
+            raise KeyError
+        del self.contents_[i]
+        self._index = None
 
     def __iter__(self):
         return (k for (k, v) in self.contents_)
@@ -165,6 +223,7 @@ class SimpleDict(MapBase):
         if not self.contents_:
             raise KeyError
         (k, v) = self.contents_.pop()
+        self._index = None
         return (k, v)
 
     def copy(self):
@@ -179,7 +238,8 @@ class ShellMutableMap(MapBase, collections.abc.MutableMapping):
     def __init__(self, inner: Mapping):
         self._mutations: MutableMapping = SimpleDict([])
         self._inner = inner
-        self._len = inner.__len__()
+        # (computed on demand, so that creating a shell does not read the inner map)
+        self._len: Optional[int] = None
 
     def __getitem__(self, key):
         ret = self._mutations.get(key, _NOT_FOUND)
@@ -234,14 +294,16 @@ class ShellMutableMap(MapBase, collections.abc.MutableMapping):
         return True
 
     def __bool__(self):
-        return bool(self._len > 0)
+        return bool(self.__len__() > 0)
 
     def __len__(self):
+        if self._len is None:
+            self._len = self._inner.__len__()
         return self._len
 
     def __setitem__(self, key, val):
         if key not in self:
-            self._len += 1
+            self._len = self.__len__() + 1
         self._mutations[key] = val
 
     def __delitem__(self, key):
@@ -252,7 +314,7 @@ class ShellMutableMap(MapBase, collections.abc.MutableMapping):
             if key not in self._inner:
                 raise KeyError
         self._mutations[key] = _DELETED
-        self._len -= 1
+        self._len = self.__len__() - 1
 
     def _lastitem(self):
         raise KeyError
@@ -260,7 +322,7 @@ class ShellMutableMap(MapBase, collections.abc.MutableMapping):
     def pop(self, key, default=_MISSING):
         # CPython checks the empty case before attempting to hash the key.
         # So this must happen before the hash-ability check:
-        if self._len > 0:
+        if self.__len__() > 0:
             try:
                 value = self[key]
             except KeyError:
@@ -462,9 +524,20 @@ class SeqBase(CrossHairValue):
 
 @dataclasses.dataclass(eq=False)
 class SequenceConcatenation(collections.abc.Sequence, SeqBase):
+    """
+    A node in a rope of sequences.
+
+    Use `concatenate_sequences` to build these; it keeps the tree balanced, so that
+    indexing stays logarithmic in the number of concatenated pieces.
+    """
+
     _first: Sequence
     _second: Sequence
     _len: Optional[int] = None
+    _depth: int = dataclasses.field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        self._depth = 1 + max(_rope_depth(self._first), _rope_depth(self._second))
 
     def __ch_pytype__(self):
         return tuple
@@ -546,6 +619,8 @@ class SliceView(collections.abc.Sequence, SeqBase):
 
     @staticmethod
     def slice(seq: Sequence, start: int, stop: int) -> Sequence:
+        with NoTracing():
+            nested_view = seq if isinstance(seq, SliceView) else None
         seqlen = seq.__len__()
         left_at_end = start <= 0
         right_at_end = stop >= seqlen
@@ -557,6 +632,10 @@ class SliceView(collections.abc.Sequence, SeqBase):
             stop = seqlen
         if stop <= start:
             stop = start
+        if nested_view is not None:
+            # Views of views just view the original.
+            offset = nested_view.start
+            return SliceView(nested_view.seq, offset + start, offset + stop)
         return SliceView(seq, start, stop)
 
     def __getitem__(self, key):
@@ -585,20 +664,55 @@ class SliceView(collections.abc.Sequence, SeqBase):
             yield self.seq[i]
 
 
+def _rope_depth(seq: Sequence) -> int:
+    return seq._depth if type(seq) is SequenceConcatenation else 0
+
+
+def _rope_node(a: Sequence, b: Sequence) -> SequenceConcatenation:
+    # Make a node out of two balanced ropes whose depths differ by at most 2,
+    # using (AVL-style) rotations to restore balance.
+    depth_a, depth_b = _rope_depth(a), _rope_depth(b)
+    if depth_a > depth_b + 1:
+        a1, a2 = a._first, a._second  # type: ignore
+        if _rope_depth(a1) >= _rope_depth(a2):
+            return SequenceConcatenation(a1, SequenceConcatenation(a2, b))
+        return SequenceConcatenation(
+            SequenceConcatenation(a1, a2._first), SequenceConcatenation(a2._second, b)
+        )
+    if depth_b > depth_a + 1:
+        b1, b2 = b._first, b._second  # type: ignore
+        if _rope_depth(b2) >= _rope_depth(b1):
+            return SequenceConcatenation(SequenceConcatenation(a, b1), b2)
+        return SequenceConcatenation(
+            SequenceConcatenation(a, b1._first), SequenceConcatenation(b1._second, b2)
+        )
+    return SequenceConcatenation(a, b)
+
+
+def _rope_join(a: Sequence, b: Sequence) -> SequenceConcatenation:
+    # Descend the spine of the deeper rope until the depths are comparable.
+    depth_a, depth_b = _rope_depth(a), _rope_depth(b)
+    if depth_a > depth_b + 1:
+        return _rope_node(a._first, _rope_join(a._second, b))  # type: ignore
+    if depth_b > depth_a + 1:
+        return _rope_node(_rope_join(a, b._first), b._second)  # type: ignore
+    return SequenceConcatenation(a, b)
+
+
 def concatenate_sequences(a: Sequence, b: Sequence) -> Sequence:
     with NoTracing():
         if isinstance(a, list):
             if isinstance(b, list):
                 return a + b
             elif isinstance(b, SequenceConcatenation) and isinstance(b._first, list):
-                return SequenceConcatenation(a + b._first, b._second)
+                return _rope_join(a + b._first, b._second)
         elif (
             isinstance(a, SequenceConcatenation)
             and isinstance(b, list)
             and isinstance(a._second, list)
         ):
-            return SequenceConcatenation(a._first, a._second + b)
-        return SequenceConcatenation(a, b)
+            return _rope_join(a._first, a._second + b)
+        return _rope_join(a, b)
 
 
 def sequence_evaluation(seq: Sequence):
@@ -712,6 +826,9 @@ class ShellMutableSequence(collections.abc.MutableSequence, SeqBase):
     def index(self, *a) -> int:
         return self.inner.index(*a)
 
+    def count(self, value) -> int:
+        return self.inner.count(value)
+
     def sort(self, key=None, reverse=False):
         self.inner = sorted(self.inner, key=key, reverse=reverse)
 
@@ -900,6 +1017,27 @@ class LinearSet(FrozenSetBase):
 
     def __init__(self, items: Iterable):
         self._items = items
+        # Lazily built (for concrete item collections); the concrete items as a
+        # real set, and all other items:
+        self._partition: Optional[Tuple[frozenset, list]] = None
+
+    def _get_partition(self) -> Optional[Tuple[frozenset, list]]:
+        with NoTracing():
+            if self._partition is None and type(self._items) in (
+                list,
+                tuple,
+                set,
+                frozenset,
+            ):
+                concrete_items = []
+                other_items = []
+                for item in self._items:
+                    if type(item) in _CONCRETE_KEY_TYPES:
+                        concrete_items.append(item)
+                    else:
+                        other_items.append(item)
+                self._partition = (frozenset(concrete_items), other_items)
+            return self._partition
 
     @staticmethod
     def check_unique_and_create(seq):
@@ -916,10 +1054,17 @@ class LinearSet(FrozenSetBase):
     def __contains__(self, x):
         if not is_hashable(x):
             raise TypeError
-        for item in self._items:
-            if x == item:
+        partition = self._get_partition()
+        if partition is None:
+            candidates = self._items
+        elif _is_concrete_key(x):
+            concrete_items, candidates = partition
+            if x in concrete_items:
                 return True
-        return False
+        else:
+            candidates = self._items
+        # (any() over symbolic comparisons makes a single decision)
+        return any(x == item for item in candidates)
 
     def __iter__(self):
         for item in self._items:
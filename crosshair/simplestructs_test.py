@@ -1,11 +1,13 @@
 import copy
 import sys
+from typing import Sequence
 
 import pytest
 
-from crosshair.core import deep_realize, realize
+from crosshair.core import deep_realize, proxy_for_type, realize
 from crosshair.simplestructs import (
     LazySetCombination,
+    LinearSet,
     SequenceConcatenation,
     ShellMutableMap,
     ShellMutableSequence,
@@ -13,10 +15,12 @@ from crosshair.simplestructs import (
     SimpleDict,
     SingletonSet,
     SliceView,
+    concatenate_sequences,
     cut_slice,
     operator,
 )
 from crosshair.test_util import summarize_execution
+from crosshair.tracers import ResumedTracing
 
 
 def test_ShellMutableMap() -> None:
@@ -49,6 +53,38 @@ def test_ShellMutableMap_poo() -> None:
     assert 0 == m.setdefault(2.0, {True: "0"})
 
 
+def test_SimpleDict_index_stays_consistent() -> None:
+    d = SimpleDict([(1, "a"), ((2, 3), "b"), ("c", "c")])
+    assert d[True] == "a"
+    assert d[(2, 3)] == "b"
+    d["x"] = "x"
+    d[(4,)] = "y"
+    del d[1]
+    assert d.get(1) is None
+    assert d["c"] == "c"
+    d[1.0] = "z"
+    assert d.popitem() == (1.0, "z")
+    assert d == {(2, 3): "b", "c": "c", "x": "x", (4,): "y"}
+
+
+def test_SimpleDict_index_lookup_while_tracing(space) -> None:
+    d = SimpleDict([(None, "a"), (b"b", "b")])
+    with ResumedTracing():
+        assert d[None] == "a"
+        assert d.get(b"b") == "b"
+        assert d.get(b"c") is None
+
+
+def test_LinearSet_symbolic_membership_is_one_decision(space) -> None:
+    x = proxy_for_type(int, "x")
+    space.add(x.var > 100)
+    items = LinearSet(list(range(50)))
+    with ResumedTracing():
+        assert x not in items
+        assert 5 in items
+    assert len(space.choices_made) <= 2
+
+
 def test_SequenceConcatenation_comparison() -> None:
     compound = SequenceConcatenation((11, 22), (33, 44))
     assert compound == (11, 22, 33, 44)
@@ -56,6 +92,26 @@ def test_SequenceConcatenation_comparison() -> None:
     assert compound >= (11, 22, 33)  # type: ignore
 
 
+def test_concatenate_sequences_stays_balanced() -> None:
+    base = tuple(range(100))
+    rope: Sequence = []
+    for i in range(0, 100, 2):
+        rope = concatenate_sequences(rope, SliceView(base, i, i + 2))
+    for i in range(98, -2, -2):
+        rope = concatenate_sequences(SliceView(base, i, i + 2), rope)
+    assert isinstance(rope, SequenceConcatenation)
+    assert rope._depth <= 8
+    assert list(rope) == list(base) * 2
+    assert [rope[i] for i in range(200)] == list(base) * 2
+
+
+def test_SliceView_of_SliceView_is_flat() -> None:
+    view = SliceView.slice(SliceView.slice((0, 1, 2, 3, 4, 5), 1, 5), 1, 3)
+    assert isinstance(view, SliceView)
+    assert view.seq == (0, 1, 2, 3, 4, 5)
+    assert list(view) == [2, 3]
+
+
 def test_SliceView_comparison() -> None:
     sliced = SliceView((00, 11, 22, 33, 44, 55), 1, 5)
     assert sliced == (11, 22, 33, 44)
@@ -3,10 +3,11 @@ import builtins
 import copy
 import enum
 import functools
+import math
 import random
 import re
 import threading
-from collections import Counter, defaultdict
+from collections import Counter, defaultdict, deque
 from dataclasses import dataclass
 from sys import _getframe
 from time import monotonic
@@ -15,7 +16,11 @@ from types import FrameType
 from typing import (
     Any,
     Callable,
+    Deque,
     Dict,
+    FrozenSet,
+    Hashable,
+    Iterable,
     List,
     NewType,
     NoReturn,
@@ -31,6 +36,7 @@ import z3  # type: ignore
 
 from crosshair import dynamic_typing
 from crosshair.condition_parser import ConditionExpr
+from crosshair.options import DEFAULT_OPTIONS, AnalysisOptions
 from crosshair.smtlib import parse_smtlib_literal
 from crosshair.tracers import NoTracing, ResumedTracing, is_tracing
 from crosshair.util import (
@@ -46,7 +52,14 @@ from crosshair.util import (
     in_debug,
     name_of_type,
 )
-from crosshair.z3util import z3Aassert, z3Not, z3Or, z3PopNot
+from crosshair.z3util import (
+    z3_string_value_to_python,
+    z3Aassert,
+    z3And,
+    z3Not,
+    z3Or,
+    z3PopNot,
+)
 
 
 @functools.total_ordering
@@ -157,6 +170,8 @@ def model_value_to_python(value: z3.ExprRef) -> object:
             # Force irrational values to be rational:
             value = value.approx(precision=20)
         return float(value.as_fraction())
+    elif z3.is_string_value(value):
+        return z3_string_value_to_python(value)
     elif z3.is_seq(value):
         ret = []
         while value.num_args() == 2:
@@ -225,7 +240,11 @@ class AbstractPathingOracle:
     def pre_path_hook(self, space: "StateSpace") -> None:
         pass
 
-    def post_path_hook(self, path: Sequence["SearchTreeNode"]) -> None:
+    def post_path_hook(
+        self,
+        path: Sequence["SearchTreeNode"],
+        analysis: Optional[CallAnalysis] = None,
+    ) -> None:
         pass
 
     def decide(
@@ -377,6 +396,193 @@ def node_status(node: Optional[NodeLike]) -> Optional[VerificationStatus]:
         return None
 
 
+class ConflictStore:
+    """
+    Remembers sets of path constraints that are jointly unsatisfiable.
+
+    Cores are keyed by one of their member constraints (the branch condition that
+    was found to be infeasible) and are shared by every path under a RootNode.
+    Expressions are identified by their z3 AST id; we hold references to them so
+    that the ids stay valid.
+    """
+
+    def __init__(self):
+        self.cores: Dict[int, List[FrozenSet[int]]] = defaultdict(list)
+        self.exprs: Dict[int, z3.ExprRef] = {}
+        self.num_pruned = 0
+
+    def refutes(self, expr: z3.ExprRef, asserted: Dict[int, z3.ExprRef]) -> bool:
+        cores = self.cores.get(expr.get_id())
+        if cores:
+            asserted_ids = asserted.keys()
+            for rest in cores:
+                if asserted_ids >= rest:
+                    return True
+        return False
+
+    def learn(self, expr: z3.ExprRef, core: Sequence[z3.ExprRef]) -> None:
+        exprs = self.exprs
+        exprs[expr.get_id()] = expr
+        for member in core:
+            exprs[member.get_id()] = member
+        debug("Learned unsat core of size", len(core) + 1, "for", expr)
+        self.cores[expr.get_id()].append(frozenset(m.get_id() for m in core))
+
+
+class PathConflicts:
+    """
+    Tracks the constraints asserted on one path, consulting a `ConflictStore`.
+
+    Tracked constraints are asserted with marker literals, so that an unsat check
+    on the path's own solver also tells us which constraints were responsible.
+    """
+
+    def __init__(self, store: ConflictStore, solver: z3.Solver):
+        self.store = store
+        self.solver = solver
+        self.asserted: Dict[int, z3.ExprRef] = {}
+        self.markers: Dict[int, z3.ExprRef] = {}
+        solver.set("unsat_core", True)
+
+    def track(self, expr: z3.ExprRef) -> None:
+        """Assert `expr` on the solver, remembering it for later unsat cores."""
+        marker = z3.Bool(f"_crosshair_tracked_{len(self.markers)}")
+        self.solver.assert_and_track(expr, marker)
+        self.markers[marker.get_id()] = expr
+        self.asserted[expr.get_id()] = expr
+
+    def is_sat(self, expr: z3.ExprRef) -> bool:
+        store = self.store
+        if store.refutes(expr, self.asserted):
+            store.num_pruned += 1
+            debug("Pruned with a previously learned unsat core:", expr)
+            return False
+        solver = self.solver
+        if solver_is_sat(solver, expr):
+            return True
+        core_ids = {member.get_id() for member in solver.unsat_core()}
+        if expr.get_id() in core_ids:
+            markers = self.markers
+            store.learn(expr, [markers[i] for i in core_ids if i in markers])
+        # (otherwise, the path was already infeasible without `expr`)
+        return False
+
+
+_MISSING = object()
+
+
+class ExprCache:
+    """
+    Hash-conses SMT expressions for all of the paths under a `RootNode`.
+
+    z3 shares structurally identical ASTs, but it hands out a new python wrapper
+    each time one is built. We keep one wrapper per AST, so that replayed paths
+    present the very same objects; comparing them (or looking them up in
+    dictionaries) then succeeds on identity, without asking z3.
+
+    Expressions that are rebuilt identically on every path can also be memoized
+    under a key that determines them structurally, which skips construction.
+
+    Both tables are least-recently-used caches of at most `max_size` entries, so
+    that expressions which never recur (like uniquely named variables) are
+    eventually dropped.
+    """
+
+    max_size = 50_000
+
+    def __init__(self) -> None:
+        # Holding the wrappers keeps the ASTs (and therefore their ids) alive.
+        # (dicts preserve insertion order; the first entry is the least recent)
+        self._by_ast_id: Dict[int, z3.ExprRef] = {}
+        self._by_key: Dict[Hashable, Any] = {}
+
+    def _store(self, table: Dict[Any, Any], key: Hashable, value: Any) -> None:
+        table[key] = value
+        if len(table) > self.max_size:
+            del table[next(iter(table))]
+
+    def intern(self, expr: z3.ExprRef) -> z3.ExprRef:
+        by_ast_id = self._by_ast_id
+        ast_id = expr.get_id()
+        interned = by_ast_id.pop(ast_id, None)
+        if interned is None:
+            interned = expr
+        self._store(by_ast_id, ast_id, interned)
+        return interned
+
+    def memo(self, key: Hashable, build: Callable[[], _T]) -> _T:
+        by_key = self._by_key
+        value = by_key.pop(key, _MISSING)
+        if value is _MISSING:
+            value = build()
+            if isinstance(value, z3.ExprRef):
+                value = self.intern(value)  # type: ignore
+        self._store(by_key, key, value)
+        return value
+
+
+def _percentile(samples: Iterable[float], fraction: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+class PathCostTracker:
+    """
+    Derives path and solver timeouts from the costs observed so far.
+
+    One instance tracks the paths of a single `RootNode` (and therefore a single
+    checkable). Until we've seen a handful of paths, the statically configured
+    timeouts apply. Afterwards, the path timeout is a multiple of the 95th
+    percentile path duration, and the solver timeout is a multiple of the 99th
+    percentile query duration.
+    Only the most recent `window` samples are considered, and the derived
+    timeouts never exceed the configured ones.
+    """
+
+    min_samples = 8
+    headroom = 4.0
+    min_query_timeout = 0.25
+    window = 256
+
+    def __init__(self):
+        self.path_durations: Deque[float] = deque(maxlen=self.window)
+        self.query_durations: Deque[float] = deque(maxlen=self.window)
+        self.max_depth = 0
+
+    def record_path(self, duration: float, query_durations: List[float]) -> None:
+        self.path_durations.append(duration)
+        self.query_durations.extend(query_durations)
+
+    def path_timeout(self, static_timeout: float) -> float:
+        path_durations = self.path_durations
+        if len(path_durations) < self.min_samples or not math.isfinite(static_timeout):
+            return static_timeout
+        adaptive = _percentile(path_durations, 0.95) * self.headroom
+        # Shrink the configured timeout, but not by too much:
+        return min(max(adaptive, static_timeout / 10), static_timeout)
+
+    def query_timeout(self, path_timeout: float) -> float:
+        query_durations = self.query_durations
+        if len(query_durations) < self.min_samples:
+            return path_timeout / 2
+        adaptive = _percentile(query_durations, 0.99) * self.headroom
+        return min(max(adaptive, self.min_query_timeout), path_timeout / 2)
+
+    def deadline_extension(self, depth: int) -> float:
+        """
+        Grant extra time to a path that has gone deeper than any path before it.
+
+        Returns the number of seconds to extend the deadline by.
+        (callers still cap the deadline at the configured path timeout)
+        """
+        if depth <= self.max_depth:
+            return 0.0
+        self.max_depth = depth
+        if len(self.path_durations) < self.min_samples:
+            return 0.0
+        return _percentile(self.path_durations, 0.5) * self.headroom
+
+
 class SearchLeaf(SearchTreeNode):
     def __init__(self, result: CallAnalysis):
         self.result = result
@@ -424,14 +630,24 @@ class BranchCounter:
 
 
 class RootNode(SinglePathNode):
-    def __init__(self):
+    def __init__(self, options: AnalysisOptions = DEFAULT_OPTIONS):
         super().__init__(True)
         self._open_coverage: Dict[Tuple[str, ...], BranchCounter] = defaultdict(
             BranchCounter
         )
-        from crosshair.pathing_oracle import CoveragePathingOracle  # circular import
+        from crosshair.pathing_oracle import make_pathing_oracle  # circular import
 
-        self.pathing_oracle: AbstractPathingOracle = CoveragePathingOracle()
+        self.options = options
+        self.pathing_oracle: AbstractPathingOracle = make_pathing_oracle(
+            options.pathing_oracle
+        )
+        self.conflict_store: Optional[ConflictStore] = (
+            ConflictStore() if options.unsat_core_pruning else None
+        )
+        self.path_costs: Optional[PathCostTracker] = (
+            PathCostTracker() if options.adaptive_timeouts else None
+        )
+        self.expr_cache = ExprCache()
         self.iteration = 0
 
 
@@ -585,13 +801,24 @@ class WorstResultNode(RandomizedBinaryPathNode):
     expr: Optional[z3.ExprRef] = None
     normalized_expr: Tuple[bool, z3.ExprRef]
 
-    def __init__(self, rand: random.Random, expr: z3.ExprRef, solver: z3.Solver):
+    def __init__(
+        self,
+        rand: random.Random,
+        expr: z3.ExprRef,
+        solver: z3.Solver,
+        conflicts: Optional[PathConflicts] = None,
+    ):
         super().__init__(rand)
         is_positive, root_expr = z3PopNot(expr)
         self.normalized_expr = (is_positive, root_expr)
         notexpr = z3Not(expr) if is_positive else root_expr
-        if solver_is_sat(solver, notexpr):
-            if not solver_is_sat(solver, expr):
+        is_sat = (
+            conflicts.is_sat
+            if conflicts is not None
+            else functools.partial(solver_is_sat, solver)
+        )
+        if is_sat(notexpr):
+            if not is_sat(expr):
                 self.forced_path = False
         else:
             # We run into soundness issues on occasion:
@@ -653,8 +880,119 @@ class WorstResultNode(RandomizedBinaryPathNode):
         )
 
 
+class FanoutStem(NodeStem):
+    def __init__(self, parent: "FanoutNode", index: int):
+        super().__init__(parent, "children")
+        self.index = index
+
+    def grow(self, node: SearchTreeNode):
+        self.parent.children[self.index] = node  # type: ignore
+
+    def __repr__(self) -> str:
+        return f"FanoutStem({self.index})"
+
+
+class FanoutNode(SearchTreeNode):
+    """
+    Choose one of several mutually exclusive, exhaustive SMT expressions.
+
+    This is an n-ary alternative to a binary search of `WorstResultNode` forks.
+    The first choice costs a single solver check: we try a (weighted) random
+    option, and if it is infeasible, we read a feasible option from the model.
+    The feasibility of other options is only checked when we try to explore them.
+    """
+
+    def __init__(
+        self, rand: random.Random, exprs: Sequence[z3.ExprRef], weights: Sequence[float]
+    ):
+        self._random = rand
+        self.exprs = exprs
+        self.weights = weights
+        self.children: List[NodeLike] = [FanoutStem(self, i) for i in range(len(exprs))]
+        # None means we haven't checked feasibility yet:
+        self.feasible: List[Optional[bool]] = [None] * len(exprs)
+        self._stats = StateSpaceCounter()
+
+    def __repr__(self):
+        return f"FanoutNode({len(self.exprs)} options)"
+
+    def _pick(self) -> int:
+        candidates = [
+            idx
+            for idx, child in enumerate(self.children)
+            if self.feasible[idx] is not False and not child.is_exhausted()
+        ]
+        if not candidates:
+            raise CrossHairInternal("No feasible fanout options remain")
+        weights = [self.weights[idx] for idx in candidates]
+        return self._random.choices(candidates, weights=weights)[0]
+
+    def choose_option(self, space: "StateSpace") -> Tuple[int, NodeLike]:
+        solver = space.solver
+        feasible = self.feasible
+        while True:
+            idx = self._pick()
+            if feasible[idx] is True or solver_is_sat(solver, self.exprs[idx]):
+                feasible[idx] = True
+                return (idx, self._resolve_if_last(solver, idx))
+            feasible[idx] = False
+            if not solver_is_sat(solver):
+                raise CrossHairInternal("Solver unexpectedly unsat during fanout")
+            model = solver.model()
+            for option_idx, expr in enumerate(self.exprs):
+                if feasible[option_idx] is not False and z3.is_true(
+                    model.evaluate(expr, model_completion=True)
+                ):
+                    feasible[option_idx] = True
+                    if not self.children[option_idx].is_exhausted():
+                        return (option_idx, self._resolve_if_last(solver, option_idx))
+
+    def _resolve_if_last(self, solver: z3.Solver, idx: int) -> NodeLike:
+        # Before descending into the last known-feasible option, check the
+        # unknown ones, so that we can tell when this node is exhausted.
+        feasible = self.feasible
+        others_remain = any(
+            feasible[i] is True and not child.is_exhausted()
+            for i, child in enumerate(self.children)
+            if i != idx
+        )
+        if not others_remain:
+            for i, expr in enumerate(self.exprs):
+                if feasible[i] is None:
+                    feasible[i] = solver_is_sat(solver, expr)
+        return self.children[idx]
+
+    def choose(
+        self, space: "StateSpace", probability_true: Optional[float] = None
+    ) -> Tuple[bool, float, NodeLike]:
+        raise CrossHairInternal("FanoutNode choices are made with choose_option()")
+
+    def compute_result(self, leaf_analysis: CallAnalysis) -> Tuple[CallAnalysis, bool]:
+        live_children = [
+            child
+            for idx, child in enumerate(self.children)
+            if self.feasible[idx] is not False
+        ]
+        exhausted = all(child.is_exhausted() for child in live_children)
+        for child in live_children:
+            if node_status(child) == VerificationStatus.REFUTED:
+                self._stats = child.stats()
+                return (child.get_result(), exhausted)
+        self._stats = StateSpaceCounter(
+            sum((c.stats() for c in live_children), Counter())
+        )
+        merged: Tuple[CallAnalysis, bool] = (CallAnalysis(), True)
+        for child in live_children:
+            merged = merge_node_results(merged[0], merged[1], child)
+        return merged
+
+    def stats(self) -> StateSpaceCounter:
+        return self._stats
+
+
 class ModelValueNode(WorstResultNode):
     condition_value: object = None
+    _stats_keys: Tuple[str, ...]
 
     def __init__(self, rand: random.Random, expr: z3.ExprRef, solver: z3.Solver):
         if not solver_is_sat(solver):
@@ -662,18 +1000,41 @@ class ModelValueNode(WorstResultNode):
             raise CrossHairInternal("Unexpected unsat from solver")
 
         self.condition_value = solver.model().evaluate(expr, model_completion=True)
-        self._stats_key = f"realize_{expr}" if z3.is_const(expr) else None
+        self._stats_keys = (f"realize_{expr}",) if z3.is_const(expr) else ()
         WorstResultNode.__init__(self, rand, expr == self.condition_value, solver)
 
     def compute_result(self, leaf_analysis: CallAnalysis) -> Tuple[CallAnalysis, bool]:
-        stats_key = self._stats_key
-        old_realizations = self._stats[stats_key]
+        stats = self._stats
+        stats_keys = self._stats_keys
+        old_realizations = [stats[key] for key in stats_keys]
         analysis, is_exhausted = super().compute_result(leaf_analysis)
-        if stats_key:
-            self._stats[stats_key] = old_realizations + 1
+        for key, old_count in zip(stats_keys, old_realizations):
+            stats[key] = old_count + 1
         return (analysis, is_exhausted)
 
 
+class ModelAssignmentNode(ModelValueNode):
+    """Like `ModelValueNode`, but assigns values to several expressions at once."""
+
+    def __init__(
+        self, rand: random.Random, exprs: Sequence[z3.ExprRef], solver: z3.Solver
+    ):
+        if not solver_is_sat(solver):
+            debug("Solver unexpectedly unsat; solver state:", solver.sexpr())
+            raise CrossHairInternal("Unexpected unsat from solver")
+        model = solver.model()
+        self.condition_values = [
+            model.evaluate(expr, model_completion=True) for expr in exprs
+        ]
+        self._stats_keys = tuple(
+            f"realize_{expr}" for expr in exprs if z3.is_const(expr)
+        )
+        assignment = z3.And(
+            *[expr == value for expr, value in zip(exprs, self.condition_values)]
+        )
+        WorstResultNode.__init__(self, rand, assignment, solver)
+
+
 def debug_path_tree(node, highlights, prefix="") -> List[str]:
     highlighted = node in highlights
     highlighted |= node in highlights
@@ -708,10 +1069,19 @@ def debug_path_tree(node, highlights, prefix="") -> List[str]:
             return [f"{prefix} -> {str(node)} {node.stats()}"]
 
 
-def make_default_solver() -> z3.Solver:
-    """Create a new solver with default settings."""
-    smt_tactic = z3.Tactic("smt")
-    solver = smt_tactic.solver()
+def make_default_solver(string_theory: bool = False) -> z3.Solver:
+    """
+    Create a new solver with default settings.
+
+    When `string_theory` is set, we use z3's general-purpose solver instead of
+    the "smt" tactic, because the latter can report unsat for satisfiable
+    string constraints.
+    """
+    if string_theory:
+        solver = z3.Solver()
+    else:
+        smt_tactic = z3.Tactic("smt")
+        solver = smt_tactic.solver()
     solver.set("mbqi", True)
     # turn off every randomization thing we can think of:
     solver.set("random-seed", 42)
@@ -723,7 +1093,12 @@ class StateSpace:
     """Holds various information about the SMT solver's current state."""
 
     _search_position: NodeLike
-    _deferred_assumptions: List[Tuple[str, Callable[[], bool]]]
+    _deferred_assumptions: List[
+        Tuple[str, Callable[[], bool], Optional[Callable[[], bool]]]
+    ]
+    _skipped_assumptions: List[
+        Tuple[str, Callable[[], bool], Optional[Callable[[], bool]]]
+    ]
     _extras: Dict[Type, object]
 
     def __init__(
@@ -732,7 +1107,17 @@ class StateSpace:
         model_check_timeout: float,
         search_root: RootNode,
     ):
-        self.solver = make_default_solver()
+        self.start_time = monotonic()
+        path_costs = search_root.path_costs
+        self._query_durations: Optional[List[float]] = None
+        self._deadline_extended = False
+        self._max_deadline = execution_deadline
+        if path_costs is not None:
+            path_timeout = path_costs.path_timeout(execution_deadline - self.start_time)
+            execution_deadline = self.start_time + path_timeout
+            model_check_timeout = path_costs.query_timeout(path_timeout)
+            self._query_durations = []
+        self.solver = make_default_solver(search_root.options.seq_based_strings)
         if model_check_timeout < 1 << 63:
             self.smt_timeout: Optional[int] = int(model_check_timeout * 1000 + 1)
             self.solver.set(timeout=self.smt_timeout)
@@ -749,9 +1134,16 @@ class StateSpace:
 
         self.execution_deadline = execution_deadline
         self._root = search_root
+        self._expr_cache = search_root.expr_cache
+        self.options = search_root.options
+        conflict_store = search_root.conflict_store
+        self._conflicts: Optional[PathConflicts] = None
+        if conflict_store is not None:
+            self._conflicts = PathConflicts(conflict_store, self.solver)
         self._random = search_root._random
         _, _, self._search_position = search_root.choose(self)
         self._deferred_assumptions = []
+        self._skipped_assumptions = []
         assert search_root.iteration is not None
         search_root.iteration += 1
         search_root.pathing_oracle.pre_path_hook(self)
@@ -770,16 +1162,33 @@ class StateSpace:
                     name_of_type(type(expr)),
                 )
             # debug('Committed to ', expr)
+            expr = self._expr_cache.intern(expr)
             already_known = self._exprs_known.get(expr)
             if already_known is None:
-                self.solver.add(expr)
+                self._assert(expr)
                 self._exprs_known[expr] = True
             elif already_known is not True:
                 raise CrossHairInternal
 
+    def _assert(self, expr: z3.ExprRef) -> None:
+        conflicts = self._conflicts
+        if conflicts is None:
+            z3Aassert(self.solver, expr)
+        else:
+            conflicts.track(expr)
+
     def rand(self) -> random.Random:
         return self._random
 
+    def smt_memo(self, key: Hashable, build: Callable[[], _T]) -> _T:
+        """
+        Build a z3 object once for all of the paths in this search tree.
+
+        The `key` must determine the result structurally (e.g. by including the
+        variable names and bounds that go into it).
+        """
+        return self._expr_cache.memo(key, build)
+
     def extra(self, typ: Type[_T]) -> _T:
         """Get an object whose lifetime is tied to that of the SMT solver."""
         value = self._extras.get(typ)
@@ -800,6 +1209,15 @@ class StateSpace:
         self._search_position.grow(node)
         node.iteration = self._root.iteration
         self._search_position = node
+        path_costs = self._root.path_costs
+        if path_costs is not None and not self._deadline_extended:
+            extension = path_costs.deadline_extension(len(self.choices_made) + 1)
+            if extension:
+                debug("Extending deadline by", extension, "for a new, deep node")
+                self._deadline_extended = True
+                self.execution_deadline = min(
+                    self.execution_deadline + extension, self._max_deadline
+                )
         return node
 
     def fork_parallel(self, false_probability: float, desc: str = "") -> bool:
@@ -825,7 +1243,14 @@ class StateSpace:
             if hasattr(expr, "var"):
                 expr = expr.var
             debug("is possible?", expr)
-        return solver_is_sat(self.solver, expr)
+        query_start = monotonic()
+        ret = solver_is_sat(self.solver, expr)
+        self._record_query(query_start)
+        return ret
+
+    def _record_query(self, query_start: float) -> None:
+        if self._query_durations is not None:
+            self._query_durations.append(monotonic() - query_start)
 
     def mark_all_parent_frames(self):
         frames: Set[FrameType] = set()
@@ -859,6 +1284,7 @@ class StateSpace:
     def choose_possible(
         self, expr: z3.ExprRef, probability_true: Optional[float] = None
     ) -> bool:
+        expr = self._expr_cache.intern(expr)
         known_result = self._exprs_known.get(expr)
         if isinstance(known_result, bool):
             return known_result
@@ -878,7 +1304,9 @@ class StateSpace:
                 # But also see https://github.com/HypothesisWorks/hypothesis/pull/4034#issuecomment-2606415404
                 # or (node.stacktail != stacktail and "Stack trace changed")
                 or (
-                    (hasattr(node, "expr") and (not z3.eq(node.expr, expr)))
+                    hasattr(node, "expr")
+                    and node.expr is not expr
+                    and not z3.eq(node.expr, expr)
                     and "SMT expression changed"
                 )
             )
@@ -890,13 +1318,19 @@ class StateSpace:
             # We only allow time outs at stems - that's because we don't want
             # to think about how mutating an existing path branch would work:
             self.check_timeout()
-            node = self.grow_into(WorstResultNode(self._random, expr, self.solver))
+            query_start = monotonic()
+            node = self.grow_into(
+                WorstResultNode(self._random, expr, self.solver, self._conflicts)
+            )
+            self._record_query(query_start)
             node.stacktail = stacktail
 
         self._search_position = node
+        query_start = monotonic()
         choose_true, chosen_probability, stem = node.choose(
             self, probability_true=probability_true
         )
+        self._record_query(query_start)
 
         branch_counter = self._root._open_coverage[stacktail]
         if choose_true:
@@ -912,7 +1346,7 @@ class StateSpace:
                 f"SMT chose: {chosen_expr} (chance: {chosen_probability}) at",
                 ch_stack(),
             )
-        z3Aassert(self.solver, chosen_expr)
+        self._assert(chosen_expr)
         self._exprs_known[expr] = choose_true
         return choose_true
 
@@ -951,29 +1385,38 @@ class StateSpace:
         else:
             raise exc
 
-    def find_model_value(self, expr: z3.ExprRef) -> Any:
+    def find_model_value(self, expr: z3.ExprRef, probability_true: float = 1.0) -> Any:
+        """
+        Realize an expression, taking its value from a model.
+
+        With a `probability_true` below 1.0, the search may instead exclude the
+        model's value and look for another one, which spreads the search over
+        several values (e.g. for container lengths).
+        """
         with NoTracing():
             while True:
                 if isinstance(self._search_position, NodeStem):
+                    query_start = monotonic()
                     self._search_position = self.grow_into(
                         ModelValueNode(self._random, expr, self.solver)
                     )
+                    self._record_query(query_start)
                 node = self._search_position
                 if isinstance(node, SearchLeaf):
                     raise CrossHairInternal(
                         f"Cannot use symbolics; path is already terminated"
                     )
-                if not isinstance(node, ModelValueNode):
+                if type(node) is not ModelValueNode:
                     debug(" *** Begin Not Deterministic Debug *** ")
                     debug(f"Model value node expected; found {type(node)} instead.")
                     debug("  Traceback: ", ch_stack())
                     debug(" *** End Not Deterministic Debug *** ")
                     raise NotDeterministic
-                (chosen, _, next_node) = node.choose(self, probability_true=1.0)
+                (chosen, _, next_node) = node.choose(self, probability_true)
                 self.choices_made.append(node)
                 self._search_position = next_node
                 if chosen:
-                    self.solver.add(expr == node.condition_value)
+                    self._assert(expr == node.condition_value)
                     ret = model_value_to_python(node.condition_value)
                     if (
                         in_debug()
@@ -985,7 +1428,46 @@ class StateSpace:
                         debug("Realized at", ch_stack())
                     return ret
                 else:
-                    self.solver.add(expr != node.condition_value)
+                    self._assert(expr != node.condition_value)
+
+    def find_model_values(self, exprs: Sequence[z3.ExprRef]) -> List[Any]:
+        """
+        Realize several expressions, taking their values from a single model.
+
+        Unlike repeated calls to `find_model_value`, this costs one node in the
+        search tree (and a constant number of solver checks) for the batch.
+        """
+        if len(exprs) <= 1:
+            return [self.find_model_value(expr) for expr in exprs]
+        with NoTracing():
+            while True:
+                if isinstance(self._search_position, NodeStem):
+                    query_start = monotonic()
+                    self._search_position = self.grow_into(
+                        ModelAssignmentNode(self._random, exprs, self.solver)
+                    )
+                    self._record_query(query_start)
+                node = self._search_position
+                if isinstance(node, SearchLeaf):
+                    raise CrossHairInternal(
+                        f"Cannot use symbolics; path is already terminated"
+                    )
+                if not isinstance(node, ModelAssignmentNode) or len(
+                    node.condition_values
+                ) != len(exprs):
+                    self.raise_not_deterministic(
+                        node, "Wrong node type (expected ModelAssignmentNode)"
+                    )
+                (chosen, _, next_node) = node.choose(self, probability_true=1.0)
+                self.choices_made.append(node)
+                self._search_position = next_node
+                assignment = node.expr if chosen else z3Not(node.expr)
+                self._assert(assignment)
+                if chosen:
+                    ret = list(map(model_value_to_python, node.condition_values))
+                    if in_debug() and not self.is_detached:
+                        debug("SMT realized", len(exprs), "symbolics at", ch_stack())
+                    return ret
 
     def find_model_value_for_function(self, expr: z3.ExprRef) -> object:
         if not solver_is_sat(self.solver):
@@ -1066,7 +1548,13 @@ class StateSpace:
         weights: Optional[Sequence[float]] = None,
         none_of_the_above_weight: float = 0.0,
     ):
-        """Performs a weighted binary search over the given SMT expressions."""
+        """
+        Choose one of the given (mutually exclusive and exhaustive) SMT expressions.
+
+        By default, this performs a weighted binary search over the expressions.
+        With the `model_guided_fanout` option, it instead makes a single n-ary
+        choice. (see `FanoutNode`)
+        """
         exprs = [e for (e, _) in exprs_and_results]
         final_weights = [1.0] * len(exprs) if weights is None else weights
         if CROSSHAIR_EXTRA_ASSERTS:
@@ -1083,6 +1571,10 @@ class StateSpace:
                     "smt_fanout options are not exhaustive: " + repr(exprs)
                 )
 
+        if self.options.model_guided_fanout:
+            choice = self._choose_fanout_option(exprs, final_weights)
+            return exprs_and_results[choice][1]
+
         def attempt(start: int, end: int):
             size = end - start
             if size == 1:
@@ -1102,6 +1594,26 @@ class StateSpace:
 
         return attempt(0, len(exprs))
 
+    def _choose_fanout_option(
+        self, exprs: Sequence[z3.ExprRef], weights: Sequence[float]
+    ) -> int:
+        node = self._search_position
+        if isinstance(node, NodeStem):
+            self.check_timeout()
+            node = self.grow_into(FanoutNode(self._random, exprs, weights))
+            node.stacktail = self.gen_stack_descriptions()
+        elif not isinstance(node, FanoutNode) or len(node.exprs) != len(exprs):
+            self.raise_not_deterministic(node, "Wrong node type (expected FanoutNode)")
+        assert isinstance(node, FanoutNode)
+        choice, next_node = node.choose_option(self)
+        self.choices_made.append(node)
+        self._search_position = next_node
+        chosen_expr = exprs[choice]
+        if in_debug():
+            debug(f"SMT fanout chose: {chosen_expr} at", ch_stack())
+        self._assert(chosen_expr)
+        return choice
+
     @assert_tracing(False)
     def smt_fork(
         self,
@@ -1113,8 +1625,20 @@ class StateSpace:
             expr = z3.Bool((desc or "fork") + self.uniq())
         return self.choose_possible(expr, probability_true)
 
-    def defer_assumption(self, description: str, checker: Callable[[], bool]) -> None:
-        self._deferred_assumptions.append((description, checker))
+    def defer_assumption(
+        self,
+        description: str,
+        checker: Callable[[], bool],
+        is_observed: Optional[Callable[[], bool]] = None,
+    ) -> None:
+        """
+        Register a check to run when the path is detached.
+
+        If given, `is_observed` is called at that time; when it returns False, the
+        checked object was never read by user code, and the check is skipped.
+        (until `check_skipped_assumptions` is called)
+        """
+        self._deferred_assumptions.append((description, checker, is_observed))
 
     def extend_timeouts(
         self, constant_factor: float = 0.0, smt_multiple: Optional[float] = None
@@ -1128,7 +1652,8 @@ class StateSpace:
         """
         Mark the current path exhausted.
 
-        Also verifies all deferred assumptions.
+        Also verifies all deferred assumptions. Those that produce symbolic results
+        are verified together, with a single solver query.
         After detaching, the space may continue to be used (for example, to print
         realized symbolics).
         """
@@ -1140,11 +1665,7 @@ class StateSpace:
             # Give ourselves a time extension for deferred assumptions and
             # (likely) counterexample generation to follow.
             self.extend_timeouts(constant_factor=4.0, smt_multiple=2.0)
-            for description, checker in self._deferred_assumptions:
-                with ResumedTracing():
-                    check_ret = checker()
-                if not prefer_true(check_ret):
-                    raise IgnoreAttempt("deferred assumption failed: " + description)
+            self._check_assumptions(self._deferred_assumptions, skip_unobserved=True)
             self.is_detached = True
             if not isinstance(self._search_position, NodeStem):
                 self.raise_not_deterministic(
@@ -1158,6 +1679,49 @@ class StateSpace:
             self._search_position = node.child
             debug("Detached from search tree")
 
+    def check_skipped_assumptions(self) -> None:
+        """
+        Verify the deferred assumptions that `detach_path` skipped as unobserved.
+
+        Call this before realizing values after the path is detached (for example,
+        to report a counterexample), because realization observes them.
+        """
+        assert not is_tracing()
+        skipped, self._skipped_assumptions = self._skipped_assumptions, []
+        self._check_assumptions(skipped, skip_unobserved=False)
+
+    def _check_assumptions(
+        self,
+        assumptions: List[Tuple[str, Callable[[], bool], Optional[Callable[[], bool]]]],
+        skip_unobserved: bool,
+    ) -> None:
+        symbolic_descriptions: List[str] = []
+        symbolic_checks: List[z3.ExprRef] = []
+        deferred = self._deferred_assumptions
+        num_deferred = len(deferred)
+        pending = list(assumptions)
+        for assumption in pending:
+            description, checker, is_observed = assumption
+            if skip_unobserved and is_observed is not None and not is_observed():
+                self._skipped_assumptions.append(assumption)
+                continue
+            with ResumedTracing():
+                check_ret = checker()
+            # Checks may defer more assumptions (e.g. by short-circuiting a call):
+            pending.extend(deferred[num_deferred:])
+            num_deferred = len(deferred)
+            if hasattr(check_ret, "var") and z3.is_bool(check_ret.var):
+                symbolic_descriptions.append(description)
+                symbolic_checks.append(check_ret.var)
+            elif not prefer_true(check_ret):
+                raise IgnoreAttempt("deferred assumption failed: " + description)
+        if symbolic_checks and not self.choose_possible(
+            z3And(*symbolic_checks), probability_true=1.0
+        ):
+            raise IgnoreAttempt(
+                "deferred assumption failed: " + ", ".join(symbolic_descriptions)
+            )
+
     def cap_result_at_unknown(self):
         # TODO: this doesn't seem to work as intended.
         # If any execution path is confirmed, the end result is sometimes confirmed as well.
@@ -1173,7 +1737,11 @@ class StateSpace:
             assert isinstance(self._search_position, SearchTreeNode)
             self._search_position.exhausted = True
             self._search_position.result = analysis
-        self._root.pathing_oracle.post_path_hook(self.choices_made)
+        self._root.pathing_oracle.post_path_hook(self.choices_made, analysis)
+        path_costs = self._root.path_costs
+        if path_costs is not None and self._query_durations is not None:
+            path_costs.record_path(monotonic() - self.start_time, self._query_durations)
+            self._query_durations = None
         if not self.choices_made:
             return (analysis, True)
         for node in reversed(self.choices_made):
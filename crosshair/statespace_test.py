@@ -3,18 +3,29 @@ import time
 import pytest
 import z3  # type: ignore
 
+from crosshair import type_repo
 from crosshair.core import Patched, proxy_for_type
+from crosshair.options import DEFAULT_OPTIONS, AnalysisOptionSet
 from crosshair.statespace import (
+    CallAnalysis,
+    ConflictStore,
+    ExprCache,
     HeapRef,
+    MessageType,
+    PathConflicts,
+    PathCostTracker,
     RootNode,
     SimpleStateSpace,
     SnapshotRef,
     StateSpace,
     StateSpaceContext,
+    VerificationStatus,
+    make_default_solver,
     model_value_to_python,
 )
-from crosshair.tracers import COMPOSITE_TRACER
-from crosshair.util import UnknownSatisfiability
+from crosshair.test_util import check_states
+from crosshair.tracers import COMPOSITE_TRACER, ResumedTracing
+from crosshair.util import IgnoreAttempt, UnknownSatisfiability
 
 _HEAD_SNAPSHOT = SnapshotRef(-1)
 
@@ -92,6 +103,18 @@ def test_model_value_to_python_ArithRef():
     model_value_to_python(rt2)
 
 
+def test_find_model_values() -> None:
+    space = SimpleStateSpace()
+    x, y = z3.Int("x"), z3.Int("y")
+    space.add(x + y == 10)
+    space.add(x > 7)
+    xval, yval = space.find_model_values([x, y])
+    assert xval + yval == 10
+    assert xval > 7
+    assert len(space.choices_made) == 1
+    assert not space.is_possible(x != xval)
+
+
 def test_smt_fanout(space: SimpleStateSpace):
     option1 = z3.Bool("option1")
     option2 = z3.Bool("option2")
@@ -106,3 +129,198 @@ def test_smt_fanout(space: SimpleStateSpace):
     else:
         assert not space.is_possible(option1)
         assert space.is_possible(option2)
+
+
+def test_unsat_core_pruning() -> None:
+    store = ConflictStore()
+    x, y = z3.Ints("x y")
+
+    def new_path(*constraints) -> PathConflicts:
+        conflicts = PathConflicts(store, make_default_solver())
+        for constraint in constraints:
+            conflicts.track(constraint)
+        return conflicts
+
+    assert not new_path(y > 0, x > 5).is_sat(x < 3)
+    assert store.num_pruned == 0
+    # A different path that shares the relevant constraint doesn't need the solver:
+    other_path = new_path(y < 0, x > 5)
+    assert not other_path.is_sat(x < 3)
+    assert store.num_pruned == 1
+    assert other_path.is_sat(x > 7)
+    # But paths without that constraint are unaffected:
+    assert new_path(y < 0, x > 1).is_sat(x < 3)
+    assert store.num_pruned == 1
+
+
+def test_unsat_core_pruning_in_analysis() -> None:
+    def f(x: int, y: int) -> int:
+        """
+        pre: x > 5
+        post: _ != 4
+        """
+        if y > 0:
+            if x < 3:
+                return 0
+        if y < 10:
+            if x < 3:
+                return 1
+        return x + y
+
+    check_states(f, MessageType.POST_FAIL, AnalysisOptionSet(unsat_core_pruning=True))
+
+
+def test_model_guided_fanout_explores_every_option() -> None:
+    root = RootNode(DEFAULT_OPTIONS.overlay(model_guided_fanout=True))
+    x = z3.Int("x")
+    options = [(x < 1, "lt"), (x == 1, "eq"), (x > 1, "gt")]
+    seen = []
+    for _ in range(10):
+        space = StateSpace(time.monotonic() + 1000, 1000, root)
+        space.add(x != 1)
+        seen.append(space.smt_fanout(options, desc="x"))
+        _, exhausted = space.bubble_status(CallAnalysis(VerificationStatus.CONFIRMED))
+        if exhausted:
+            break
+    assert sorted(seen) == ["gt", "lt"]
+    assert root.child.get_result().verification_status == VerificationStatus.CONFIRMED
+
+
+def test_model_guided_fanout_in_analysis() -> None:
+    class Animal:
+        def sound(self) -> str:
+            return "..."
+
+    class Cat(Animal):
+        def sound(self) -> str:
+            return "meow"
+
+    class Dog(Animal):
+        def sound(self) -> str:
+            return "woof"
+
+    def f(a: Animal) -> str:
+        """post: _ != 'woof'"""
+        return a.sound()
+
+    for cls in (Animal, Cat, Dog):
+        type_repo._add_class(cls)
+    check_states(f, MessageType.POST_FAIL, AnalysisOptionSet(model_guided_fanout=True))
+
+
+def test_expr_cache_interns_structurally_equal_expressions() -> None:
+    cache = ExprCache()
+    first = cache.intern(z3.Int("x") + 1)
+    assert cache.intern(z3.Int("x") + 1) is first
+    assert cache.intern(z3.Int("x") + 2) is not first
+    builds = []
+    assert cache.memo("k", lambda: builds.append(1) or z3.Int("x") + 1) is first
+    assert cache.memo("k", lambda: builds.append(1) or z3.Int("y")) is first
+    assert builds == [1]
+
+
+def test_expr_cache_drops_least_recently_used_entries(monkeypatch) -> None:
+    monkeypatch.setattr(ExprCache, "max_size", 2)
+    cache = ExprCache()
+    x, y, z = cache.intern(z3.Int("x")), cache.intern(z3.Int("y")), z3.Int("z")
+    assert cache.intern(z3.Int("x")) is x  # (now more recent than y)
+    cache.intern(z)
+    assert cache.intern(z3.Int("x")) is x
+    assert cache.intern(z3.Int("y")) is not y
+    assert len(cache._by_ast_id) == 2
+
+
+def test_replayed_paths_share_expressions() -> None:
+    root = RootNode()
+    exprs = []
+    for _ in range(2):
+        space = StateSpace(time.monotonic() + 60_000, 60_000, root)
+        expr = z3.Int("x") > 5  # (a fresh wrapper on each path)
+        space.choose_possible(expr)
+        exprs.append(root.expr_cache.intern(expr))
+        space.bubble_status(CallAnalysis())
+    assert exprs[0] is exprs[1]
+    assert root.child.expr is exprs[0]
+
+
+def test_detach_path_skips_unobserved_assumptions(space: StateSpace) -> None:
+    checked = []
+    space.defer_assumption(
+        "unobserved", lambda: checked.append(1) or True, lambda: False
+    )
+    with ResumedTracing():
+        space.detach_path()
+    assert checked == []
+    # ... until something is about to be realized after all:
+    space.check_skipped_assumptions()
+    assert checked == [1]
+    space.check_skipped_assumptions()
+    assert checked == [1]
+
+
+def test_detach_path_checks_assumptions_deferred_by_checks(space: StateSpace) -> None:
+    def checker():
+        # (like a check that short-circuits a call)
+        space.defer_assumption("nested", lambda: False)
+        return True
+
+    space.defer_assumption("outer", checker)
+    with pytest.raises(IgnoreAttempt, match="nested"):
+        with ResumedTracing():
+            space.detach_path()
+
+
+def test_detach_path_checks_symbolic_assumptions_together(space: StateSpace) -> None:
+    x = proxy_for_type(int, "x")
+    space.defer_assumption("x is positive", lambda: x > 0)
+    space.defer_assumption("x is negative", lambda: x < 0)
+    with pytest.raises(IgnoreAttempt, match="x is positive, x is negative"):
+        with ResumedTracing():
+            space.detach_path()
+
+
+def test_path_cost_tracker_timeouts() -> None:
+    tracker = PathCostTracker()
+    # Not enough samples yet; use the configured timeouts:
+    assert tracker.path_timeout(10.0) == 10.0
+    assert tracker.query_timeout(10.0) == 5.0
+    for _ in range(20):
+        tracker.record_path(0.5, [0.1, 0.1])
+    assert tracker.path_timeout(10.0) == 2.0
+    assert tracker.path_timeout(1.0) == 1.0  # (never above the configured timeout)
+    assert tracker.path_timeout(0.1) == 0.1
+    assert tracker.path_timeout(float("inf")) == float("inf")
+    assert tracker.query_timeout(2.0) == 0.4
+    assert tracker.query_timeout(0.2) == 0.1
+
+
+def test_path_cost_tracker_uses_recent_paths() -> None:
+    tracker = PathCostTracker()
+    for _ in range(tracker.window):
+        tracker.record_path(5.0, [1.0])
+    for _ in range(tracker.window):
+        tracker.record_path(0.5, [0.1])
+    assert len(tracker.path_durations) == tracker.window
+    assert tracker.path_timeout(10.0) == 2.0
+    assert tracker.query_timeout(2.0) == 0.4
+
+
+def test_path_cost_tracker_extends_deep_paths() -> None:
+    tracker = PathCostTracker()
+    for _ in range(20):
+        tracker.record_path(0.5, [])
+    assert tracker.deadline_extension(3) == 2.0
+    assert tracker.deadline_extension(3) == 0.0
+    assert tracker.deadline_extension(2) == 0.0
+    assert tracker.deadline_extension(4) == 2.0
+
+
+def test_adaptive_timeouts_in_analysis() -> None:
+    def f(x: int, y: int) -> int:
+        """post: _ != 42"""
+        if x > 10:
+            if y > x:
+                return y - x
+        return 0
+
+    check_states(f, MessageType.POST_FAIL, AnalysisOptionSet(adaptive_timeouts=True))
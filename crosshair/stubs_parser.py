@@ -14,6 +14,7 @@ from typing import __all__ as typing_all  # type: ignore
 from typeshed_client import get_stub_ast  # type: ignore
 from typeshed_client import get_search_context, get_stub_file
 
+from crosshair.disk_cache import source_derived_cache
 from crosshair.fnutil import resolve_signature
 from crosshair.util import debug
 
@@ -50,97 +51,195 @@ def signature_from_stubs(fn: Callable) -> Tuple[List[Signature], bool]:
 
     # Use the `qualname` to find the function inside its module.
     path_in_module: List[str] = fn.__qualname__.split(".")
-    # Find the stub_file and corresponding AST using `typeshed_client`.
-    search_path = [Path(path) for path in sys.path if path]
-    search_context = get_search_context(search_path=search_path)
-    stub_file = get_stub_file(module_name, search_context=search_context)
-    module = get_stub_ast(module_name, search_context=search_context)
-    if not stub_file or not module or not isinstance(module, ast.Module):
+    index = _stub_index(module_name)
+    if index is None:
         debug("No stub found for module", module_name)
         return [], True
     glo = globals().copy()
-    return _sig_from_ast(module.body, path_in_module, stub_file.read_text(), glo)
-
-
-def _get_source_segment(source: str, node: ast.AST) -> Optional[str]:
-    """Get source code segment of the *source* that generated *node*."""
-    if sys.version_info >= (3, 8):
-        return ast.get_source_segment(source, node)
-    raise NotImplementedError("ast.get_source_segment not available for python < 3.8.")
+    return _sig_from_index(index, path_in_module, glo)
+
+
+# Stub indices are the parts of a stub's AST that we need to find signatures.
+# They are plain (JSON-compatible) data, so that they can be cached on disk.
+# Each scope (module, class, etc) in the stub is indexed like this:
+#   "setup": the imports and TypeVar assignments in the scope, as lists:
+#       ["import", [[name, asname], ...]]
+#       ["from", module, [[name, asname], ...]]
+#       ["typevar", assignment_text]
+#   "defs": function name -> list of {"text": function text, "classmethod": bool}
+#   "scopes": name -> list of indices for nested classes and functions
+#   "ifs": list of {"test": condition text, "body": index, "orelse": index}
+StubIndex = Dict[str, Any]
+
+_STUB_INDEX_DISK_CACHE = source_derived_cache("stubindex")
+# (search path, module name) -> stub file:
+_STUB_FILES: Dict[Tuple[Tuple[str, ...], str], Optional[Path]] = {}
+# (stub file, modification time) -> index:
+_STUB_INDICES: Dict[Tuple[str, int], Optional[StubIndex]] = {}
+_SEARCH_CONTEXTS: Dict[Tuple[str, ...], Any] = {}
+
+
+def _stub_index(module_name: str) -> Optional[StubIndex]:
+    search_path = tuple(path for path in sys.path if path)
+    search_context = _SEARCH_CONTEXTS.get(search_path)
+    if search_context is None:
+        search_context = get_search_context(
+            search_path=[Path(path) for path in search_path]
+        )
+        _SEARCH_CONTEXTS[search_path] = search_context
+    file_key = (search_path, module_name)
+    if file_key in _STUB_FILES:
+        stub_file = _STUB_FILES[file_key]
+    else:
+        stub_file = get_stub_file(module_name, search_context=search_context)
+        _STUB_FILES[file_key] = stub_file
+    if not stub_file:
+        return None
+    try:
+        index_key = (str(stub_file), stub_file.stat().st_mtime_ns)
+    except OSError:
+        return None
+    if index_key in _STUB_INDICES:
+        return _STUB_INDICES[index_key]
+    index: Optional[StubIndex] = None
+    cached = _STUB_INDEX_DISK_CACHE.get(str(stub_file), module_name)
+    if isinstance(cached, dict):
+        index = cached
+    else:
+        module = get_stub_ast(module_name, search_context=search_context)
+        if module and isinstance(module, ast.Module):
+            index = _index_stmts(module.body, _StubSource(stub_file.read_text()))
+            _STUB_INDEX_DISK_CACHE.put(str(stub_file), module_name, index)
+    _STUB_INDICES[index_key] = index
+    return index
+
+
+class _StubSource:
+    """Extract the source text for stub nodes (faster than ast.get_source_segment)."""
+
+    def __init__(self, stub_text: str):
+        self.lines = [line.encode() for line in stub_text.splitlines(keepends=True)]
+
+    def segment(self, node: ast.AST) -> Optional[str]:
+        lineno = getattr(node, "lineno", None)
+        end_lineno = getattr(node, "end_lineno", None)
+        col_offset = getattr(node, "col_offset", None)
+        end_col_offset = getattr(node, "end_col_offset", None)
+        if None in (lineno, end_lineno, col_offset, end_col_offset):
+            return None
+        lines = self.lines[lineno - 1 : end_lineno]
+        if len(lines) == 1:
+            return lines[0][col_offset:end_col_offset].decode()
+        first, last = lines[0][col_offset:], lines[-1][:end_col_offset]
+        return b"".join([first, *lines[1:-1], last]).decode()
+
+
+def _index_stmts(stmts: List[ast.stmt], source: _StubSource) -> StubIndex:
+    setup: List[Any] = []
+    defs: Dict[str, List[Dict[str, Any]]] = {}
+    scopes: Dict[str, List[StubIndex]] = {}
+    ifs: List[Dict[str, Any]] = []
+    for node in stmts:
+        if isinstance(node, ast.Import):
+            setup.append(["import", [[n.name, n.asname] for n in node.names]])
+        elif isinstance(node, ast.ImportFrom):
+            names = [[n.name, n.asname] for n in node.names]
+            setup.append(["from", node.module, names])
+        elif isinstance(node, ast.Assign):
+            value_text = source.segment(node.value)
+            if value_text and "TypeVar" in value_text:
+                assign_text = source.segment(node)
+                if assign_text:
+                    setup.append(["typevar", assign_text])
+        elif isinstance(node, ast.If):
+            test_text = source.segment(node.test)
+            # Some function depends on the execution environment
+            if test_text and "sys." in test_text:
+                ifs.append(
+                    {
+                        "test": test_text,
+                        "body": _index_stmts(node.body, source),
+                        "orelse": _index_stmts(node.orelse, source),
+                    }
+                )
+        if isinstance(node, ast.FunctionDef):
+            defs.setdefault(node.name, []).append(
+                {
+                    "text": source.segment(node),
+                    "classmethod": any(
+                        isinstance(decorator, ast.Name)
+                        and decorator.id == "classmethod"
+                        for decorator in node.decorator_list
+                    ),
+                }
+            )
+        if isinstance(node, (ast.ClassDef, ast.FunctionDef)):
+            scopes.setdefault(node.name, []).append(_index_stmts(node.body, source))
+    return {"setup": setup, "defs": defs, "scopes": scopes, "ifs": ifs}
+
+
+def _run_index_setup(setup: List[Any], glo: Dict[str, Any]) -> None:
+    for step in setup:
+        if step[0] == "import":
+            names = [ast.alias(name=name, asname=asname) for name, asname in step[1]]
+            _exec_import(ast.Import(names=names), glo)
+        elif step[0] == "from":
+            names = [ast.alias(name=name, asname=asname) for name, asname in step[2]]
+            _exec_import(ast.ImportFrom(module=step[1], names=names, level=0), glo)
+        else:
+            try:
+                exec(step[1], glo)
+            except Exception:
+                debug("Not able to evaluate TypeVar assignment:", step[1])
 
 
-def _sig_from_ast(
-    stmts: List[ast.stmt],
+def _sig_from_index(
+    index: StubIndex,
     next_steps: List[str],
-    stub_text: str,
     glo: Dict[str, Any],
 ) -> Tuple[List[Signature], bool]:
-    """Lookup in the given ast for a function signature, following `next_steps` path."""
+    """Lookup in the given stub index for a function signature, following `next_steps` path."""
     if len(next_steps) == 0:
         return [], True
 
-    # First walk through the nodes to execute imports and assignments
-    for node in stmts:
-        # If we encounter an import statement, add it to the namespace
-        if isinstance(node, (ast.Import, ast.ImportFrom)):
-            _exec_import(node, glo)
-
-        # If we encounter the definition of a `TypeVar`, add it to the namespace
-        elif isinstance(node, ast.Assign):
-            value_text = _get_source_segment(stub_text, node.value)
-            if value_text and "TypeVar" in value_text:
-                assign_text = _get_source_segment(stub_text, node)
-                if assign_text:
-                    try:
-                        exec(assign_text, glo)
-                    except Exception:
-                        debug("Not able to evaluate TypeVar assignment:", assign_text)
+    # First execute imports and assignments
+    _run_index_setup(index["setup"], glo)
 
-    # Walk through the nodes to find the next node
+    # Find the next node
     next_node_name = next_steps[0]
     sigs = []
     is_valid = True
-    for node in stmts:
+    if len(next_steps) == 1:
         # Only one step remaining => look for the function itself
-        if (
-            len(next_steps) == 1
-            and isinstance(node, ast.FunctionDef)
-            and node.name == next_node_name
-        ):
-            sig, valid = _sig_from_functiondef(node, stub_text, glo)
+        for fn_def in index["defs"].get(next_node_name, ()):
+            sig, valid = _sig_from_function_text(
+                next_node_name, fn_def["text"], fn_def["classmethod"], glo
+            )
             if sig:
                 sigs.append(sig)
             is_valid = is_valid and valid
-
+    else:
         # More than one step remaining => look for the next step
-        elif (
-            isinstance(node, (ast.Module, ast.ClassDef, ast.FunctionDef))
-            and node.name == next_node_name
-        ):
-            new_sigs, valid = _sig_from_ast(node.body, next_steps[1:], stub_text, glo)
+        for scope in index["scopes"].get(next_node_name, ()):
+            new_sigs, valid = _sig_from_index(scope, next_steps[1:], glo)
             sigs.extend(new_sigs)
             is_valid = is_valid and valid
 
     # Additionally, we might need to look for the next node into if statements
-    for node in stmts:
-        if isinstance(node, (ast.If)):
-            assign_text = _get_source_segment(stub_text, node.test)
-            # Some function depends on the execution environment
-            if assign_text and "sys." in assign_text:
-                condition = None
-                try:
-                    condition = eval(assign_text, glo)
-                except Exception:
-                    debug("Not able to evaluate condition:", assign_text)
-                if condition is not None:
-                    new_sigs, valid = _sig_from_ast(
-                        node.body if condition else node.orelse,
-                        next_steps,
-                        stub_text,
-                        glo,
-                    )
-                    sigs.extend(new_sigs)
-                    is_valid = is_valid and valid
+    for if_index in index["ifs"]:
+        condition = None
+        try:
+            condition = eval(if_index["test"], glo)
+        except Exception:
+            debug("Not able to evaluate condition:", if_index["test"])
+        if condition is not None:
+            new_sigs, valid = _sig_from_index(
+                if_index["body"] if condition else if_index["orelse"],
+                next_steps,
+                glo,
+            )
+            sigs.extend(new_sigs)
+            is_valid = is_valid and valid
 
     return sigs, is_valid
 
@@ -194,42 +293,42 @@ _REPLACE_TYPESHED: Dict[str, Tuple[str, str]] = {
 }
 
 
-def _sig_from_functiondef(
-    fn_def: ast.FunctionDef, stub_text: str, glo: Dict[str, Any]
+def _sig_from_function_text(
+    fn_name: str,
+    function_text: Optional[str],
+    is_classmethod: bool,
+    glo: Dict[str, Any],
 ) -> Tuple[Optional[Signature], bool]:
-    """Given an ast FunctionDef, return the corresponding signature."""
-    # Get the source text for the function stub and parse the signature from it.
-    function_text = _get_source_segment(stub_text, fn_def)
+    """Given the source text of a function stub, return the corresponding signature."""
     if function_text:
         exec(function_text, glo)
-        sig_or_error = resolve_signature(glo[fn_def.name])
+        sig_or_error = resolve_signature(glo[fn_name])
         if isinstance(sig_or_error, str):
             try:
-                sig_or_error = signature(glo[fn_def.name])
+                sig_or_error = signature(glo[fn_name])
             except Exception:
                 debug("Not able to perform function evaluation:", function_text)
                 return None, False
         parsed_sig, valid = _parse_sig(sig_or_error, glo)
         # If the function is @classmethod, remove cls from the signature.
-        for decorator in fn_def.decorator_list:
-            if isinstance(decorator, ast.Name) and decorator.id == "classmethod":
-                oldparams = list(parsed_sig.parameters.values())
-                newparams = oldparams[1:]
-                slf = "Self"
-                if (
-                    slf in glo
-                    and oldparams[0].annotation == Type[glo[slf]]
-                    and parsed_sig.return_annotation == glo[slf]
-                ):
-                    # We don't support return type "Self" in classmethods.
-                    return (
-                        parsed_sig.replace(
-                            parameters=newparams,
-                            return_annotation=Parameter.empty,
-                        ),
-                        False,
-                    )
-                return parsed_sig.replace(parameters=newparams), valid
+        if is_classmethod:
+            oldparams = list(parsed_sig.parameters.values())
+            newparams = oldparams[1:]
+            slf = "Self"
+            if (
+                slf in glo
+                and oldparams[0].annotation == Type[glo[slf]]
+                and parsed_sig.return_annotation == glo[slf]
+            ):
+                # We don't support return type "Self" in classmethods.
+                return (
+                    parsed_sig.replace(
+                        parameters=newparams,
+                        return_annotation=Parameter.empty,
+                    ),
+                    False,
+                )
+            return parsed_sig.replace(parameters=newparams), valid
         return parsed_sig, valid
     return None, False
 
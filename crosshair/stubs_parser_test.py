@@ -1,10 +1,14 @@
+import os
 import re
 import sys
 from random import Random
 
+from crosshair import stubs_parser
+from crosshair.disk_cache import SourceDerivedCache
 from crosshair.stubs_parser import (
     _rewrite_with_typing_types,
     _rewrite_with_union,
+    _stub_index,
     signature_from_stubs,
 )
 
@@ -41,3 +45,46 @@ def test_signature_from_stubs():
         assert valid and expect_re.match(str(s[0]))
     else:
         assert not s
+
+
+def test_stub_index_is_cached_on_disk(tmp_path, monkeypatch):
+    if sys.version_info < (3, 8):
+        return
+    cache = SourceDerivedCache("stubindex", str(tmp_path))
+    monkeypatch.setattr(stubs_parser, "_STUB_INDEX_DISK_CACHE", cache)
+    monkeypatch.setattr(stubs_parser, "_STUB_FILES", {})
+    monkeypatch.setattr(stubs_parser, "_STUB_INDICES", {})
+    expected, valid = signature_from_stubs(Random.randint)
+    assert valid and expected
+    assert list(tmp_path.glob("stubindex/*/*.json"))
+
+    # A new process would only read the index from the disk:
+    monkeypatch.setattr(stubs_parser, "_STUB_FILES", {})
+    monkeypatch.setattr(stubs_parser, "_STUB_INDICES", {})
+    monkeypatch.setattr(
+        stubs_parser,
+        "_STUB_INDEX_DISK_CACHE",
+        SourceDerivedCache("stubindex", str(tmp_path)),
+    )
+    monkeypatch.setattr(stubs_parser, "get_stub_ast", None)
+    s, valid = signature_from_stubs(Random.randint)
+    assert valid and list(map(str, s)) == list(map(str, expected))
+
+
+def test_stub_index_follows_search_path_and_stub_changes(tmp_path, monkeypatch):
+    if sys.version_info < (3, 8):
+        return
+    module_name = "crosshair_stub_index_test_module"
+    assert _stub_index(module_name) is None
+    (tmp_path / f"{module_name}-stubs").mkdir()
+    stub_file = tmp_path / f"{module_name}-stubs" / "__init__.pyi"
+    stub_file.write_text("def first(x: int) -> int: ...\n")
+    monkeypatch.syspath_prepend(str(tmp_path))
+    index = _stub_index(module_name)
+    assert index is not None and list(index["defs"]) == ["first"]
+
+    stub_file.write_text("def second(x: int) -> int: ...\n")
+    mtime_ns = stub_file.stat().st_mtime_ns + 1_000_000_000
+    os.utime(stub_file, ns=(mtime_ns, mtime_ns))
+    index = _stub_index(module_name)
+    assert index is not None and list(index["defs"]) == ["second"]
@@ -331,6 +331,13 @@ class PatchingModule(TracingModule):
             assert self.overrides[orig] is the_override
             self.overrides[orig] = self.nextfn.pop((the_override.__code__, orig))
 
+    def replace(self, orig: Callable, old_override: Callable, new_override: Callable):
+        """Swap an override that is currently applied for another."""
+        assert self.overrides[orig] is old_override
+        prev_override = self.nextfn.pop((old_override.__code__, orig))
+        self.nextfn[(new_override.__code__, orig)] = prev_override
+        self.overrides[orig] = new_override
+
     def __repr__(self):
         return f"PatchingModule({list(self.overrides.keys())})"
 
@@ -1,15 +1,14 @@
-import collections
-import inspect
+import abc
+import itertools
 import sys
-from typing import Dict, List, Optional, Type
+from typing import Dict, FrozenSet, Iterable, List, Optional, Set, Tuple, Type
+from weakref import WeakKeyDictionary
 
 import z3  # type: ignore
 
 from crosshair.tracers import NoTracing
 from crosshair.util import CrossHairInternal, CrossHairValue, is_hashable
-from crosshair.z3util import z3Eq, z3Not
-
-_MAP: Optional[Dict[type, List[type]]] = None
+from crosshair.z3util import z3Eq
 
 _IGNORED_MODULE_ROOTS = {
     # CrossHair will get confused if we try to proxy our own types:
@@ -24,16 +23,15 @@ _IGNORED_MODULE_ROOTS = {
     "numpy",  # importing numpy/testing/_private/utils.py attempts a subprocess call
 }
 
+# Classes that are included regardless of where they are defined:
+_ADDED_CLASSES: List[type] = []
+
 
 def _add_class(cls: type) -> None:
     """Add a class just for testing purposes."""
-    global _MAP
-    get_subclass_map()  # ensure we're initialized
-    assert _MAP is not None
-    for base in cls.__bases__:
-        subs = _MAP[base]
-        if cls not in subs:
-            subs.append(cls)
+    if cls not in _ADDED_CLASSES:
+        _ADDED_CLASSES.append(cls)
+    rebuild_subclass_map()
 
 
 _UNSAFE_MEMBERS = frozenset(
@@ -47,34 +45,87 @@ def _class_known_to_be_copyable(cls: type) -> bool:
     return True
 
 
+def _module_class_ids(module_name: str) -> FrozenSet[int]:
+    module = sys.modules.get(module_name)
+    if module is None:
+        return frozenset()
+    try:
+        members = list(vars(module).values())
+    except TypeError:
+        return frozenset()
+    return frozenset(id(v) for v in members if isinstance(v, type))
+
+
+def _is_indexed(cls: type, module_class_ids: Dict[str, FrozenSet[int]]) -> bool:
+    """
+    Determine whether a class should be offered as a subclass.
+
+    We consider classes that can be found in the namespace of their (loaded) module.
+    """
+    if cls in _ADDED_CLASSES:
+        return True
+    module_name = getattr(cls, "__module__", None)
+    if not isinstance(module_name, str):
+        return False
+    if module_name.split(".", 1)[0] in _IGNORED_MODULE_ROOTS:
+        return False
+    # Many builtin types are only exposed in the `types` module:
+    namespaces = ("builtins", "types") if module_name == "builtins" else (module_name,)
+    for namespace in namespaces:
+        class_ids = module_class_ids.get(namespace)
+        if class_ids is None:
+            class_ids = _module_class_ids(namespace)
+            module_class_ids[namespace] = class_ids
+        if id(cls) in class_ids:
+            return _class_known_to_be_copyable(cls) and is_hashable(cls)
+    return False
+
+
+class _SubclassMap(Dict[type, List[type]]):
+    """
+    Map parent classes to their direct children, computed on demand.
+
+    Children are found with ``__subclasses__()``, so they are current as of the
+    first lookup for a given parent. Lookups are discarded when more modules are
+    imported.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.module_count = len(sys.modules)
+        self.module_class_ids: Dict[str, FrozenSet[int]] = {}
+
+    def __missing__(self, base: type) -> List[type]:
+        if _is_indexed(base, self.module_class_ids):
+            try:
+                candidates = type.__subclasses__(base)
+            except TypeError:
+                candidates = []
+            children = [
+                cls for cls in candidates if _is_indexed(cls, self.module_class_ids)
+            ]
+        else:
+            children = []
+        for cls in _ADDED_CLASSES:
+            if base in cls.__bases__ and cls not in children:
+                children.append(cls)
+        self[base] = children
+        return children
+
+
+_MAP: Optional[_SubclassMap] = None
+
+
 def get_subclass_map() -> Dict[type, List[type]]:
     """
-    Crawl all types presently in memory and makes a map from parent to child classes.
+    Get a map from parent to child classes, for the types presently in memory.
 
     Only direct children are included.
     TODO: Does not yet handle "protocol" subclassing (eg "Iterator", "Mapping", etc).
     """
     global _MAP
-    if _MAP is None:
-        classes = set()
-        for module_name, module in list(sys.modules.items()):
-            if module_name.split(".", 1)[0] in _IGNORED_MODULE_ROOTS:
-                continue
-            if module is None:
-                continue
-            try:
-                module_classes = inspect.getmembers(module, inspect.isclass)
-            except ImportError:
-                continue
-            for _, cls in module_classes:
-                if _class_known_to_be_copyable(cls) and is_hashable(cls):
-                    classes.add(cls)
-        subclass = collections.defaultdict(list)
-        for cls in classes:
-            for base in cls.__bases__:
-                if base in classes:
-                    subclass[base].append(cls)
-        _MAP = subclass
+    if _MAP is None or _MAP.module_count != len(sys.modules):
+        _MAP = _SubclassMap()
     return _MAP
 
 
@@ -108,18 +159,101 @@ SMT_SUBTYPE_FN = z3.Function(
 )
 
 
+# Distinct python types get distinct ids, which is cheaper to assert than pairwise
+# inequalities:
+SMT_TYPE_ID_FN = z3.Function("pytype_sort_id", PYTYPE_SORT, z3.IntSort())
+
+# The SMT encoding of the class hierarchy is shared by all solvers.
+# (weakly keyed, so that we don't keep classes alive)
+# type -> (constant, id axiom); see _smt_type():
+_SMT_TYPES: "WeakKeyDictionary[Type, Tuple[z3.ExprRef, z3.ExprRef]]" = (
+    WeakKeyDictionary()
+)
+_SMT_TYPE_IDS = itertools.count()
+# subtype -> (supertype -> axiom); see _smt_subtype_axiom():
+_SMT_TYPE_AXIOMS: "WeakKeyDictionary[Type, WeakKeyDictionary]" = WeakKeyDictionary()
+# Registering a virtual subclass (ABC.register) changes the token and
+# invalidates the axioms:
+_SMT_TYPE_AXIOMS_TOKEN = abc.get_cache_token()
+
+
+def _smt_type(typ: Type) -> Tuple[z3.ExprRef, z3.ExprRef]:
+    """Get the constant for a type, and the axiom that distinguishes it from others."""
+    entry = _SMT_TYPES.get(typ)
+    if entry is None:
+        expr = z3.Const(f"typrepo_{typ.__qualname__}_{id(typ):x}", PYTYPE_SORT)
+        entry = (expr, z3Eq(SMT_TYPE_ID_FN(expr), z3.IntVal(next(_SMT_TYPE_IDS))))
+        _SMT_TYPES[typ] = entry
+    return entry
+
+
+def _smt_subtype_axiom(typ1: Type, typ2: Type) -> z3.ExprRef:
+    """Get the fact that says whether `typ1` is a subclass of `typ2`."""
+    global _SMT_TYPE_AXIOMS_TOKEN
+    cache_token = abc.get_cache_token()
+    if cache_token != _SMT_TYPE_AXIOMS_TOKEN:
+        _SMT_TYPE_AXIOMS.clear()
+        _SMT_TYPE_AXIOMS_TOKEN = cache_token
+    axioms_by_type = _SMT_TYPE_AXIOMS.get(typ1)
+    if axioms_by_type is None:
+        axioms_by_type = WeakKeyDictionary()
+        _SMT_TYPE_AXIOMS[typ1] = axioms_by_type
+    axiom = axioms_by_type.get(typ2)
+    if axiom is None:
+        subtype_expr = SMT_SUBTYPE_FN(_smt_type(typ1)[0], _smt_type(typ2)[0])
+        axiom = z3Eq(subtype_expr, _pyissubclass(typ1, typ2))
+        axioms_by_type[typ2] = axiom
+    return axiom
+
+
 class SymbolicTypeRepository:
+    """
+    Asserts the class hierarchy facts that a path needs, as it needs them.
+
+    Subclass facts are only relevant to the subclass queries that the path makes.
+    So, we record each query by the types its arguments may be (None for
+    symbolic types, which may be any type that the path has seen), and assert the
+    matching facts for the types we know about now, or learn about later.
+    """
+
     pytype_to_smt: Dict[Type, z3.ExprRef]
 
     def __init__(self, solver: z3.Solver):
         self.pytype_to_smt = {}
         self.solver = solver
+        # SMT constant id -> type
+        self._pytype_by_smt_id: Dict[int, Type] = {}
+        # (subtype, supertype) pairs, from queries and facts, respectively:
+        self._queries: Set[Tuple[Optional[Type], Optional[Type]]] = set()
+        self._facts: Set[Tuple[Type, Type]] = set()
+
+    def _add_facts(self, subtypes: Iterable[Type], supertypes: Iterable[Type]) -> None:
+        facts, stmts = self._facts, []
+        for typ1 in subtypes:
+            for typ2 in supertypes:
+                if (typ1, typ2) not in facts:
+                    facts.add((typ1, typ2))
+                    stmts.append(_smt_subtype_axiom(typ1, typ2))
+        if stmts:
+            self.solver.add(stmts)
+
+    def _query(self, typ1: z3.ExprRef, typ2: z3.ExprRef) -> z3.ExprRef:
+        pytype1 = self._pytype_by_smt_id.get(typ1.get_id())
+        pytype2 = self._pytype_by_smt_id.get(typ2.get_id())
+        if (pytype1, pytype2) not in self._queries:
+            self._queries.add((pytype1, pytype2))
+            known = self.pytype_to_smt.keys()
+            self._add_facts(
+                known if pytype1 is None else (pytype1,),
+                known if pytype2 is None else (pytype2,),
+            )
+        return SMT_SUBTYPE_FN(typ1, typ2)
 
     def smt_can_subclass(self, typ1: z3.ExprRef, typ2: z3.ExprRef) -> z3.ExprRef:
-        return SMT_SUBTYPE_FN(typ1, typ2) != MAYBE_SORT.exception
+        return self._query(typ1, typ2) != MAYBE_SORT.exception
 
     def smt_issubclass(self, typ1: z3.ExprRef, typ2: z3.ExprRef) -> z3.ExprRef:
-        return SMT_SUBTYPE_FN(typ1, typ2) == MAYBE_SORT.yes
+        return self._query(typ1, typ2) == MAYBE_SORT.yes
 
     def get_type(self, typ: Type) -> z3.ExprRef:
         with NoTracing():
@@ -129,23 +263,14 @@ class SymbolicTypeRepository:
                 )
         pytype_to_smt = self.pytype_to_smt
         if typ not in pytype_to_smt:
-            stmts = []
-            expr = z3.Const(f"typrepo_{typ.__qualname__}_{id(typ):x}", PYTYPE_SORT)
-            for other_pytype, other_expr in pytype_to_smt.items():
-                stmts.append(z3Not(z3Eq(other_expr, expr)))
-                stmts.append(
-                    z3Eq(
-                        SMT_SUBTYPE_FN(expr, other_expr),
-                        _pyissubclass(typ, other_pytype),
-                    )
-                )
-                stmts.append(
-                    z3Eq(
-                        SMT_SUBTYPE_FN(other_expr, expr),
-                        _pyissubclass(other_pytype, typ),
-                    )
-                )
-            stmts.append(z3Eq(SMT_SUBTYPE_FN(expr, expr), _pyissubclass(typ, typ)))
-            self.solver.add(stmts)
+            expr, id_axiom = _smt_type(typ)
+            self.solver.add(id_axiom)
             pytype_to_smt[typ] = expr
+            self._pytype_by_smt_id[expr.get_id()] = typ
+            known = pytype_to_smt.keys()
+            for pytype1, pytype2 in self._queries:
+                if pytype1 is None:
+                    self._add_facts((typ,), known if pytype2 is None else (pytype2,))
+                if pytype2 is None:
+                    self._add_facts(known if pytype1 is None else (pytype1,), (typ,))
         return pytype_to_smt[typ]
@@ -0,0 +1,135 @@
+import collections.abc
+import gc
+import importlib
+import sys
+import weakref
+from abc import ABC
+
+import z3  # type: ignore
+
+from crosshair import type_repo
+from crosshair.type_repo import SymbolicTypeRepository, get_subclass_map
+
+
+def test_subclass_map_picks_up_newly_imported_modules(tmp_path, monkeypatch):
+    (tmp_path / "_type_repo_example.py").write_text(
+        "import collections.abc\n"
+        "class MyMapping(collections.abc.Mapping):\n"
+        "    pass\n"
+    )
+    get_subclass_map()[collections.abc.Mapping]  # (populate before importing)
+    monkeypatch.syspath_prepend(str(tmp_path))
+    try:
+        module = importlib.import_module("_type_repo_example")
+        subclasses = get_subclass_map()[collections.abc.Mapping]
+        assert module.MyMapping in subclasses
+    finally:
+        sys.modules.pop("_type_repo_example", None)
+
+
+def test_subclass_map_only_includes_classes_visible_in_their_module():
+    class Hidden(ValueError):
+        pass
+
+    subclasses = get_subclass_map()[ValueError]
+    assert UnicodeError in subclasses
+    assert Hidden not in subclasses
+
+
+def test_type_hierarchy_encoding_is_shared_across_solvers(monkeypatch):
+    class Animal:
+        pass
+
+    class Cat(Animal):
+        pass
+
+    calls = []
+    original_pyissubclass = type_repo._pyissubclass
+
+    def counting_pyissubclass(typ1, typ2):
+        calls.append((typ1, typ2))
+        return original_pyissubclass(typ1, typ2)
+
+    monkeypatch.setattr(type_repo, "_pyissubclass", counting_pyissubclass)
+    exprs = []
+    for _ in range(3):
+        solver = z3.Solver()
+        repo = SymbolicTypeRepository(solver)
+        animal, cat = repo.get_type(Animal), repo.get_type(Cat)
+        exprs.append(animal)
+        solver.add(repo.smt_issubclass(cat, animal))
+        assert solver.check() == z3.sat
+        solver.add(repo.smt_issubclass(animal, cat))
+        assert solver.check() == z3.unsat
+    assert len(calls) == 2  # (Cat, Animal) and (Animal, Cat)
+    assert all(expr.eq(exprs[0]) for expr in exprs)
+
+
+def test_type_hierarchy_facts_are_only_asserted_for_queries():
+    class Animal:
+        pass
+
+    class Cat(Animal):
+        pass
+
+    class Dog(Animal):
+        pass
+
+    solver = z3.Solver()
+    repo = SymbolicTypeRepository(solver)
+    var = z3.Const("var", type_repo.PYTYPE_SORT)
+    solver.add(repo.smt_issubclass(var, repo.get_type(Animal)))
+    cat, dog = repo.get_type(Cat), repo.get_type(Dog)
+    # Only facts about being an Animal (and no Cat-vs-Dog facts):
+    assert repo._facts == {(Animal, Animal), (Cat, Animal), (Dog, Animal)}
+    assert solver.check(var == cat) == z3.sat
+    assert solver.check(z3.Or(var == cat, var == dog)) == z3.sat
+
+    # Comparing two symbolic types requires facts for every pair:
+    other_var = z3.Const("other_var", type_repo.PYTYPE_SORT)
+    solver.add(repo.smt_issubclass(var, other_var))
+    solver.add(other_var == cat)
+    assert solver.check(var == dog) == z3.unsat
+    assert solver.check(var == cat) == z3.sat
+
+    class Kitten(Cat):
+        pass
+
+    class Rock:
+        pass
+
+    # (facts for types seen after the queries are asserted too)
+    assert solver.check(var == repo.get_type(Kitten)) == z3.sat
+    assert solver.check(var == repo.get_type(Rock)) == z3.unsat
+    assert solver.check(var == cat, var == dog) == z3.unsat
+
+
+def test_type_hierarchy_encoding_does_not_keep_classes_alive():
+    class Temporary:
+        pass
+
+    SymbolicTypeRepository(z3.Solver()).get_type(Temporary)
+    temporary_ref = weakref.ref(Temporary)
+    del Temporary
+    gc.collect()
+    assert temporary_ref() is None
+
+
+def test_type_hierarchy_encoding_follows_abc_registration():
+    class Interface(ABC):
+        pass
+
+    class Implementation:
+        pass
+
+    def is_subclass_possible() -> bool:
+        solver = z3.Solver()
+        repo = SymbolicTypeRepository(solver)
+        interface = repo.get_type(Interface)
+        implementation = repo.get_type(Implementation)
+        solver.add(repo.smt_issubclass(implementation, interface))
+        return solver.check() == z3.sat
+
+    assert not is_subclass_possible()
+    Interface.register(Implementation)
+    assert is_subclass_possible()
@@ -1,17 +1,50 @@
-from ast import literal_eval
 from sys import maxunicode
-from unicodedata import unidata_version
+from unicodedata import category, unidata_version
 
 from crosshair.unicode_categories import (
-    _PRECOMPUTED_CATEGORY_RANGES,
+    _TABLES_FILENAME,
     CharMask,
     compute_categories,
+    get_unicode_categories,
+    read_unicode_tables,
+    write_unicode_tables,
 )
 
 
 def test_categories_cached_correctly():
-    precomputed_str = _PRECOMPUTED_CATEGORY_RANGES[unidata_version]
-    assert compute_categories() == literal_eval(precomputed_str)
+    assert unidata_version in read_unicode_tables(_TABLES_FILENAME)
+    computed = {
+        cat: CharMask(list(ranges)) for cat, ranges in compute_categories().items()
+    }
+    assert get_unicode_categories() == computed
+
+
+def test_cached_categories_match_unicodedata():
+    cats = get_unicode_categories()
+    for cp in range(maxunicode + 1):
+        assert cats[category(chr(cp))].covers(cp)
+    # Every codepoint is in one category, so the categories cannot overlap:
+    total = sum(
+        maximum - minimum
+        for cat, mask in cats.items()
+        if cat != "word"
+        for minimum, maximum in mask.all_bounds()
+    )
+    assert total == maxunicode + 1
+
+
+def test_unicode_tables_round_trip(tmp_path):
+    filename = str(tmp_path / "tables.bin")
+    tables = {
+        "1.0": {"Lu": [65, 91], "Ll": [97, 123, 181, 182]},
+        "2.0": {"Zs": [32, 33]},
+    }
+    write_unicode_tables(filename, tables)
+    read_back = read_unicode_tables(filename)
+    assert {
+        version: {name: list(ints) for name, ints in version_tables.items()}
+        for version, version_tables in read_back.items()
+    } == tables
 
 
 def test_transformation_assumptions():
@@ -21,7 +54,15 @@ def test_transformation_assumptions():
         assert len(ch.lower()) <= 2
         assert len(ch.upper()) <= 3
         assert len(ch.title()) <= 3
+        if category(ch) == "Lo":  # (regexes assume these do not caseswap)
+            assert ch.casefold() == ch
 
 
 def test_union():
     assert CharMask([(10, 20)]).union(CharMask([(13, 18)])) == CharMask([(10, 20)])
+
+
+def test_covers():
+    mask = CharMask([3, (10, 20)])
+    assert [cp for cp in range(25) if mask.covers(cp)] == [3, *range(10, 20)]
+    assert not CharMask([]).covers(0)
@@ -1,25 +1,68 @@
+import ctypes
+
 import z3  # type: ignore
 from z3 import (
+    ArithRef,
     BoolRef,
     BoolSort,
     ExprRef,
+    FPRef,
     IntNumRef,
     IntSort,
+    Z3_get_string_contents,
+    Z3_get_string_length,
+    Z3_mk_add,
     Z3_mk_and,
+    Z3_mk_distinct,
+    Z3_mk_div,
     Z3_mk_eq,
+    Z3_mk_fpa_add,
+    Z3_mk_fpa_div,
+    Z3_mk_fpa_eq,
+    Z3_mk_fpa_geq,
+    Z3_mk_fpa_gt,
+    Z3_mk_fpa_leq,
+    Z3_mk_fpa_lt,
+    Z3_mk_fpa_mul,
+    Z3_mk_fpa_neg,
+    Z3_mk_fpa_sub,
     Z3_mk_ge,
     Z3_mk_gt,
+    Z3_mk_int2real,
+    Z3_mk_ite,
+    Z3_mk_le,
+    Z3_mk_lt,
+    Z3_mk_mod,
+    Z3_mk_mul,
     Z3_mk_not,
     Z3_mk_numeral,
     Z3_mk_or,
+    Z3_mk_power,
+    Z3_mk_real2int,
+    Z3_mk_select,
+    Z3_mk_store,
+    Z3_mk_sub,
+    Z3_mk_u32string,
+    Z3_mk_unary_minus,
     Z3_solver_assert,
 )
-from z3.z3 import _to_ast_array  # type: ignore
+from z3.z3 import Ast, _to_ast_array, _to_expr_ref  # type: ignore
 
 ctx = z3.main_ctx()
 ctx_ref = ctx.ref()
 bool_sort = BoolSort(ctx)
 int_sort_ast = IntSort(ctx).ast
+# The default rounding mode that z3's python operators use for floating point.
+# (we hold the wrapper so that the underlying AST stays referenced)
+rne = z3.RNE(ctx)
+rne_ast = rne.as_ast()
+
+
+def _ast_pair(a: ExprRef, b: ExprRef):
+    args = (Ast * 2)()
+    args[0] = a.as_ast()
+    args[1] = b.as_ast()
+    return args
 
 
 def z3Eq(a: ExprRef, b: ExprRef) -> BoolRef:
@@ -37,12 +80,158 @@ def z3Ge(a: IntNumRef, b: IntNumRef) -> BoolRef:
     return BoolRef(Z3_mk_ge(ctx_ref, a.as_ast(), b.as_ast()), ctx)
 
 
+def z3Ne(a: ExprRef, b: ExprRef) -> BoolRef:
+    # return a != b
+    return BoolRef(Z3_mk_distinct(ctx_ref, 2, _ast_pair(a, b)), ctx)
+
+
+def z3Lt(a: ArithRef, b: ArithRef) -> BoolRef:
+    # return a < b
+    return BoolRef(Z3_mk_lt(ctx_ref, a.as_ast(), b.as_ast()), ctx)
+
+
+def z3Le(a: ArithRef, b: ArithRef) -> BoolRef:
+    # return a <= b
+    return BoolRef(Z3_mk_le(ctx_ref, a.as_ast(), b.as_ast()), ctx)
+
+
+# Arithmetic operands must share a sort; these skip z3's implicit coercions.
+
+
+def z3Add(a: ArithRef, b: ArithRef) -> ArithRef:
+    # return a + b
+    return ArithRef(Z3_mk_add(ctx_ref, 2, _ast_pair(a, b)), ctx)
+
+
+def z3Sub(a: ArithRef, b: ArithRef) -> ArithRef:
+    # return a - b
+    return ArithRef(Z3_mk_sub(ctx_ref, 2, _ast_pair(a, b)), ctx)
+
+
+def z3Mul(a: ArithRef, b: ArithRef) -> ArithRef:
+    # return a * b
+    return ArithRef(Z3_mk_mul(ctx_ref, 2, _ast_pair(a, b)), ctx)
+
+
+def z3Div(a: ArithRef, b: ArithRef) -> ArithRef:
+    # return a / b  (integer division when both sides are integers)
+    return ArithRef(Z3_mk_div(ctx_ref, a.as_ast(), b.as_ast()), ctx)
+
+
+def z3Mod(a: ArithRef, b: ArithRef) -> ArithRef:
+    # return a % b
+    return ArithRef(Z3_mk_mod(ctx_ref, a.as_ast(), b.as_ast()), ctx)
+
+
+def z3Pow(a: ArithRef, b: ArithRef) -> ArithRef:
+    # return a ** b
+    return ArithRef(Z3_mk_power(ctx_ref, a.as_ast(), b.as_ast()), ctx)
+
+
+def z3Neg(a: ArithRef) -> ArithRef:
+    # return -a
+    return ArithRef(Z3_mk_unary_minus(ctx_ref, a.as_ast()), ctx)
+
+
+def z3ToInt(a: ArithRef) -> ArithRef:
+    # return z3.ToInt(a)
+    return ArithRef(Z3_mk_real2int(ctx_ref, a.as_ast()), ctx)
+
+
+def z3ToReal(a: ArithRef) -> ArithRef:
+    # return z3.ToReal(a)
+    return ArithRef(Z3_mk_int2real(ctx_ref, a.as_ast()), ctx)
+
+
+def z3If(cond: BoolRef, then: ExprRef, otherwise: ExprRef) -> ExprRef:
+    # return z3.If(cond, then, otherwise)  (both branches must share a sort)
+    return _to_expr_ref(
+        Z3_mk_ite(ctx_ref, cond.as_ast(), then.as_ast(), otherwise.as_ast()), ctx
+    )
+
+
+def z3Select(arr: z3.ArrayRef, idx: ExprRef) -> ExprRef:
+    # return z3.Select(arr, idx)
+    return _to_expr_ref(Z3_mk_select(ctx_ref, arr.as_ast(), idx.as_ast()), ctx)
+
+
+def z3Store(arr: z3.ArrayRef, idx: ExprRef, val: ExprRef) -> z3.ArrayRef:
+    # return z3.Store(arr, idx, val)
+    return z3.ArrayRef(
+        Z3_mk_store(ctx_ref, arr.as_ast(), idx.as_ast(), val.as_ast()), ctx
+    )
+
+
+def z3FpAdd(a: FPRef, b: FPRef) -> FPRef:
+    # return a + b
+    return FPRef(Z3_mk_fpa_add(ctx_ref, rne_ast, a.as_ast(), b.as_ast()), ctx)
+
+
+def z3FpSub(a: FPRef, b: FPRef) -> FPRef:
+    # return a - b
+    return FPRef(Z3_mk_fpa_sub(ctx_ref, rne_ast, a.as_ast(), b.as_ast()), ctx)
+
+
+def z3FpMul(a: FPRef, b: FPRef) -> FPRef:
+    # return a * b
+    return FPRef(Z3_mk_fpa_mul(ctx_ref, rne_ast, a.as_ast(), b.as_ast()), ctx)
+
+
+def z3FpDiv(a: FPRef, b: FPRef) -> FPRef:
+    # return a / b
+    return FPRef(Z3_mk_fpa_div(ctx_ref, rne_ast, a.as_ast(), b.as_ast()), ctx)
+
+
+def z3FpNeg(a: FPRef) -> FPRef:
+    # return -a
+    return FPRef(Z3_mk_fpa_neg(ctx_ref, a.as_ast()), ctx)
+
+
+def z3FpLt(a: FPRef, b: FPRef) -> BoolRef:
+    # return a < b
+    return BoolRef(Z3_mk_fpa_lt(ctx_ref, a.as_ast(), b.as_ast()), ctx)
+
+
+def z3FpLe(a: FPRef, b: FPRef) -> BoolRef:
+    # return a <= b
+    return BoolRef(Z3_mk_fpa_leq(ctx_ref, a.as_ast(), b.as_ast()), ctx)
+
+
+def z3FpGt(a: FPRef, b: FPRef) -> BoolRef:
+    # return a > b
+    return BoolRef(Z3_mk_fpa_gt(ctx_ref, a.as_ast(), b.as_ast()), ctx)
+
+
+def z3FpGe(a: FPRef, b: FPRef) -> BoolRef:
+    # return a >= b
+    return BoolRef(Z3_mk_fpa_geq(ctx_ref, a.as_ast(), b.as_ast()), ctx)
+
+
+def z3FpEq(a: FPRef, b: FPRef) -> BoolRef:
+    # return fpEQ(a, b)
+    return BoolRef(Z3_mk_fpa_eq(ctx_ref, a.as_ast(), b.as_ast()), ctx)
+
+
 def z3IntVal(x: int) -> z3.IntNumRef:
     # return z3.IntVal(x)
     # Use __index__ to get a regular integer for int subtypes (e.g. enums)
     return IntNumRef(Z3_mk_numeral(ctx_ref, x.__index__().__str__(), int_sort_ast), ctx)
 
 
+def z3StringVal(x: str) -> z3.SeqRef:
+    # Unlike z3.StringVal, this does not interpret escape sequences like "\u{..}".
+    codes = (ctypes.c_uint * len(x))(*map(ord, x))
+    return z3.SeqRef(Z3_mk_u32string(ctx_ref, len(x), codes), ctx)
+
+
+def z3_string_value_to_python(value: z3.SeqRef) -> str:
+    # Unlike value.as_string(), this does not produce escape sequences.
+    length = Z3_get_string_length(ctx_ref, value.as_ast())
+    codes = (ctypes.c_uint * length)()
+    Z3_get_string_contents(ctx_ref, value.as_ast(), length, codes)
+    return "".join(map(chr, codes))
+
+
 def z3Or(*exprs):
     # return z3.Or(*exprs)
     (args, sz) = _to_ast_array(exprs)
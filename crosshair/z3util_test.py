@@ -1,6 +1,28 @@
+import operator
 from enum import IntEnum
 
-from crosshair.z3util import z3IntVal
+import pytest
+import z3  # type: ignore
+
+from crosshair.z3util import (
+    z3_string_value_to_python,
+    z3Add,
+    z3Div,
+    z3FpAdd,
+    z3FpDiv,
+    z3FpLe,
+    z3FpLt,
+    z3IntVal,
+    z3Le,
+    z3Lt,
+    z3Mod,
+    z3Mul,
+    z3Ne,
+    z3Select,
+    z3Store,
+    z3StringVal,
+    z3Sub,
+)
 
 
 class IntSubClass(IntEnum):
@@ -9,3 +31,47 @@ class IntSubClass(IntEnum):
 
 def test_intval_on_int_enum():
     z3IntVal(IntSubClass.FIRST)
+
+
+def test_stringval_roundtrip():
+    for text in ("", "plain", "back\\slash \\u{41}", "\U0001f600\x00￿"):
+        assert z3_string_value_to_python(z3StringVal(text)) == text
+
+
+@pytest.mark.parametrize(
+    "direct,op",
+    [
+        (z3Add, operator.add),
+        (z3Sub, operator.sub),
+        (z3Mul, operator.mul),
+        (z3Div, operator.truediv),
+        (z3Mod, operator.mod),
+        (z3Lt, operator.lt),
+        (z3Le, operator.le),
+        (z3Ne, operator.ne),
+    ],
+)
+def test_direct_int_ops_match_z3_operators(direct, op):
+    x, y = z3.Ints("x y")
+    assert direct(x, y).eq(op(x, y))
+
+
+@pytest.mark.parametrize(
+    "direct,op",
+    [
+        (z3FpAdd, operator.add),
+        (z3FpDiv, operator.truediv),
+        (z3FpLt, operator.lt),
+        (z3FpLe, operator.le),
+    ],
+)
+def test_direct_fp_ops_match_z3_operators(direct, op):
+    x, y = z3.FPs("x y", z3.Float64())
+    assert direct(x, y).eq(op(x, y))
+
+
+def test_direct_array_ops_match_z3_functions():
+    arr = z3.Array("arr", z3.IntSort(), z3.BoolSort())
+    idx = z3.Int("idx")
+    assert z3Select(arr, idx).eq(z3.Select(arr, idx))
+    assert z3Store(arr, idx, z3.BoolVal(True)).eq(z3.Store(arr, idx, True))
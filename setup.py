@@ -23,7 +23,7 @@ setup(
             sources=["crosshair/_tracers.c"],
         ),
     ],
-    package_data={"crosshair": ["*.h", "py.typed"]},
+    package_data={"crosshair": ["*.h", "py.typed", "unicode_categories.bin"]},
     packages=find_packages(),
     scripts=[],
     entry_points={